@@ -1,103 +1,257 @@
 import os
+import sys
 import json
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any
-from crewai import Agent, Task, Crew, Process
-from langchain_groq import ChatGroq
-from langchain.tools import tool
-
-class TiffySearchTool:
-    @tool("tiffy_search")
-    def search(query: str) -> str:
-        """Searches for hackathons, ideathons, and internships using Tiffy API."""
-        return json.dumps([
-            {
-                "type": "IDEATHON",
-                "title": "National Innovation Ideathon",
-                "organizer": "TechNext",
-                "eligibility": "Open for beginners",
-                "deadline": "2026-03-10",
-                "apply_link": "https://technext.com/ideathon"
-            },
-            {
-                "type": "HACKATHON",
-                "title": "Elite Global Hack",
-                "organizer": "GDG",
-                "eligibility": "CGPA > 7.5 required",
-                "deadline": "2026-04-20",
-                "apply_link": "https://gdg.community/elite"
-            }
-        ])
-
-class SeleniumScraperTool:
-    @tool("selenium_scraper")
-    def scrape(url: str) -> str:
-        """Scrapes detailed event information from a specific URL using Selenium."""
-        return f"Verified details from {url}: Title, Organizer, Eligibility, Deadline, Application Link."
+
+# crewai / langchain take seconds to import; they are only loaded when a crew
+# is actually built, so importing this module stays cheap.
+
+def tiffy_search(query: str) -> str:
+    """Searches for hackathons, ideathons, and internships using Tiffy API."""
+    from catalog import get_catalog
+    catalog = get_catalog()
+    # Cached per query; the answer comes from the local catalog store
+    catalog.search(query)
+    return json.dumps(catalog.opportunities(query, limit=50))
+
+def selenium_scrape(url: str) -> str:
+    """Scrapes detailed event information from a specific URL using Selenium."""
+    from catalog import get_catalog
+    return json.dumps(get_catalog().scrape(url))
+
+# LLM explanations are memoized per (normalized profile, decision) (LRU)
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "4096"))
+# Upper bound on crews running at once in one process (arun)
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "8"))
+TOP_K_RECOMMENDATIONS = int(os.getenv("TOP_K_RECOMMENDATIONS", "5"))
+
+def normalize_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Canonical form of a student profile: lower-cased keys, numbers rounded,
+    so equal profiles produce the same cache key however they were built.
+    """
+    normalized = {}
+    for key, value in profile.items():
+        key = str(key).strip().lower()
+        if isinstance(value, bool) or value is None:
+            normalized[key] = value
+        elif isinstance(value, (int, float)):
+            value = round(float(value), 2)
+            normalized[key] = int(value) if value.is_integer() else value
+        elif isinstance(value, str):
+            normalized[key] = value.strip()
+        else:
+            normalized[key] = value
+    return normalized
+
+def profile_key(profile: Dict[str, Any]) -> str:
+    return json.dumps(normalize_profile(profile), sort_keys=True, default=str)
+
+DEFAULT_QUERY = "hackathons ideathons internships jobs"
+
+def get_opportunities() -> List[Dict[str, Any]]:
+    """Opportunities the rule engine ranks: everything in the local catalog store."""
+    from catalog import get_catalog
+    catalog = get_catalog()
+    catalog.search(DEFAULT_QUERY)
+    return catalog.opportunities()
 
 class AscendraSystem:
+    """
+    Recommendation pipeline.
+
+    Level, eligibility and ranking are decided by the deterministic rule engine
+    (eligibility.py), so the hard rules always hold and cost milliseconds. The LLM
+    crew only writes the explanation for a decision it cannot change. The crew is
+    built once per instance and reused; explanations are memoized.
+    """
+
     def __init__(self, api_key: str):
-        self.llm = ChatGroq(api_key=api_key, model_name="llama3-70b-8192")
-
-    def run(self, profile: Dict[str, Any]) -> str:
-        # AGENT 1
-        analyzer = Agent(
-            role='Profile Analyzer Agent',
-            goal='Classify candidate level and detect eligibility constraints based on CGPA and competency.',
-            backstory='Expert in academic vetting. Rules: CGPA < 7.5 blocks elite hackathons. High competency allows hackathons.',
-            llm=self.llm,
-            verbose=False,
-            allow_delegation=False
-        )
-
-        # AGENT 2
-        scraper = Agent(
-            role='Opportunity Scraper Agent',
-            goal='Fetch real-world opportunities using Tiffy API and Selenium without hallucinations.',
-            backstory='Meticulous digital scout. Scrapes title, organizer, eligibility, deadline, and links.',
-            llm=self.llm,
-            tools=[TiffySearchTool.search, SeleniumScraperTool.scrape],
-            verbose=False,
-            allow_delegation=False
-        )
-
-        # AGENT 3
-        recommender = Agent(
-            role='Hackathon & Job Recommendation Agent',
-            goal='Rank and filter opportunities based on strict logic rules.',
-            backstory='Master decision engine. Rules: CGPA < 7.5 -> NO GDG; BEGINNER + competency < 60 -> IDEATHONS ONLY; INTERMEDIATE -> Local; ADVANCED -> Jobs.',
-            llm=self.llm,
-            verbose=False,
-            allow_delegation=False
-        )
-
-        # TASKS
-        t1 = Task(
-            description=f"Analyze student profile: {json.dumps(profile)}. Classify level and set eligibility flags.",
-            expected_output="STRICT JSON: {'level': '...', 'eligibility': {'gdg_allowed': bool, 'hackathon_allowed': bool}, 'recommended_focus': [...]}]",
-            agent=analyzer
-        )
-
-        t2 = Task(
-            description="Find opportunities matching the analyzer's focus. Query Tiffy and scrape with Selenium.",
-            expected_output="STRICT JSON: {'opportunities': [{'type': '...', 'title': '...', 'eligibility': '...', 'deadline': '...', 'apply_link': '...'}]}",
-            agent=scraper,
-            context=[t1]
-        )
-
-        t3 = Task(
-            description="Generate final recommendations. Apply hard rules: CGPA < 7.5 eliminates GDG. Filter by level/competency match.",
-            expected_output="STRICT JSON: {'final_recommendations': [{'category': '...', 'reason': '...', 'opportunity': {...}}], 'rejected_categories': [...]}",
-            agent=recommender,
-            context=[t1, t2]
-        )
-
-        crew = Crew(
-            agents=[analyzer, scraper, recommender],
-            tasks=[t1, t2, t3],
-            process=Process.sequential
-        )
-
-        return crew.kickoff()
+        self.api_key = api_key
+        self._llm = None
+        self._explain_crew = None
+        self._outcome_crew = None
+        self._build_lock = threading.Lock()
+        self._explanation_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._run_semaphore = None
+        self.explanation_hits = 0
+        self.explanation_misses = 0
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from langchain_groq import ChatGroq
+            self._llm = ChatGroq(api_key=self.api_key, model_name="llama3-70b-8192")
+        return self._llm
+
+    def _build(self):
+        """Builds the agent / task / crew graph once."""
+        with self._build_lock:
+            if self._explain_crew is not None:
+                return
+            from crewai import Agent, Task, Crew, Process
+
+            recommender = Agent(
+                role='Hackathon & Job Recommendation Agent',
+                goal='Explain to a student why each opportunity was recommended or ruled out.',
+                backstory='Friendly career mentor. The decisions come from a rule engine and are final: never add, remove or reorder opportunities.',
+                llm=self.llm,
+                verbose=False,
+                allow_delegation=False
+            )
+
+            # {profile} / {decision} are filled in from kickoff inputs. Task strings must not
+            # contain any other braces: crewai interpolates them like a format string.
+            explain = Task(
+                description="Student profile: {profile}. Final decision from the rule engine: {decision}. "
+                            "Explain each recommendation and each rejected category in one sentence, referring to the student's data.",
+                expected_output="STRICT JSON object with the keys: summary (string), explanations (list of objects "
+                                "with title and reason) and rejected (list of objects with category and reason).",
+                agent=recommender
+            )
+
+            # Batch mode: the rule outcome shared by a cohort class, without any student's ranking
+            explain_outcome = Task(
+                description="Rule-engine outcome shared by a group of students: {outcome}. "
+                            "Explain in one sentence why students with this outcome are at this level, and in one "
+                            "sentence each why every rejected category is ruled out. Do not mention specific opportunities.",
+                expected_output="STRICT JSON object with the keys: summary (string) and rejected "
+                                "(list of objects with category and reason).",
+                agent=recommender
+            )
+
+            self._explain_crew = Crew(
+                agents=[recommender],
+                tasks=[explain],
+                process=Process.sequential
+            )
+            self._outcome_crew = Crew(
+                agents=[recommender],
+                tasks=[explain_outcome],
+                process=Process.sequential
+            )
+
+    def decide(self, profiles: List[Dict[str, Any]], opportunities: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Rule-engine decisions for many profiles at once (no LLM involved)."""
+        from eligibility import recommend
+        if opportunities is None:
+            opportunities = get_opportunities()
+        return recommend(profiles, opportunities, top_k=TOP_K_RECOMMENDATIONS)
+
+    def _memoized(self, cache_key: tuple, compute) -> str:
+        with self._cache_lock:
+            if cache_key in self._explanation_cache:
+                self._explanation_cache.move_to_end(cache_key)
+                self.explanation_hits += 1
+                return self._explanation_cache[cache_key]
+            self.explanation_misses += 1
+
+        result = compute()
+
+        with self._cache_lock:
+            self._explanation_cache[cache_key] = result
+            if len(self._explanation_cache) > EXPLANATION_CACHE_SIZE:
+                self._explanation_cache.popitem(last=False)
+        return result
+
+    def explain(self, profile: Dict[str, Any], decision: Dict[str, Any]) -> str:
+        """LLM explanation of a decision, served from the memo when it was explained before."""
+        key = profile_key(profile)
+        decision_json = json.dumps(decision, sort_keys=True, default=str)
+
+        def compute():
+            self._build()
+            # Crews interpolate inputs into their tasks in place, so each run works on a copy
+            return str(self._explain_crew.copy().kickoff(inputs={"profile": key, "decision": decision_json}))
+        return self._memoized((key, decision_json), compute)
+
+    def explain_outcome(self, outcome_key: str) -> str:
+        """
+        LLM explanation of a rule outcome (level, eligibility, rejected categories; see
+        cohort_key) shared by many students. It says nothing about their rankings.
+        """
+        def compute():
+            self._build()
+            return str(self._outcome_crew.copy().kickoff(inputs={"outcome": outcome_key}))
+        return self._memoized(("outcome", outcome_key), compute)
+
+    def run(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        decision = self.decide([profile])[0]
+        return {**decision, "explanation": self.explain(profile, decision)}
+
+    async def arun(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of run() for serving many students from one event loop.
+        Crew execution is blocking, so it runs in worker threads, at most
+        MAX_CONCURRENT_RUNS at a time.
+        """
+        if self._run_semaphore is None:
+            self._run_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+        async with self._run_semaphore:
+            return await asyncio.to_thread(self.run, profile)
+
+    async def arun_batch(self, profiles: List[Dict[str, Any]], opportunities: List[Dict[str, Any]] = None):
+        """
+        Recommendations for a whole cohort. Yields (index, result) per student as soon
+        as the student's cohort class is explained.
+
+        Students are grouped into equivalence classes (level + eligibility flags +
+        rejected categories); the LLM runs once per class instead of once per student.
+        Its answer explains the shared rule outcome only and is returned as
+        "outcome_explanation": rankings stay per student, from the rule engine, and are
+        not explained in batch mode (use run() / arun() for a per-student explanation).
+        If a class explanation fails, its students are still yielded with
+        "outcome_explanation": None.
+        """
+        if self._run_semaphore is None:
+            self._run_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+        if opportunities is None:
+            opportunities = await asyncio.to_thread(get_opportunities)
+        decisions = await asyncio.to_thread(self.decide, profiles, opportunities)
+
+        classes = {}
+        for index, decision in enumerate(decisions):
+            classes.setdefault(cohort_key(decision), []).append(index)
+        print(f"Batch: {len(profiles)} students in {len(classes)} cohort classes")
+
+        async def explain_class(key: str, indices: List[int]):
+            try:
+                async with self._run_semaphore:
+                    explanation = await asyncio.to_thread(self.explain_outcome, key)
+                return key, indices, explanation, None
+            except Exception as e:
+                print(f"Explaining cohort class {key} failed: {e}")
+                return key, indices, None, str(e)
+
+        tasks = [asyncio.create_task(explain_class(key, indices)) for key, indices in classes.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, indices, explanation, error = await next_done
+                cohort = hashlib.sha256(key.encode()).hexdigest()[:12]
+                for index in indices:
+                    result = {**decisions[index], "cohort": cohort, "outcome_explanation": explanation}
+                    if error:
+                        result["error"] = error
+                    yield index, result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+def cohort_key(decision: Dict[str, Any]) -> str:
+    """
+    Equivalence class of a rule-engine decision: students in one class share the same
+    rule outcome (not the same ranking), and so the same outcome explanation.
+    """
+    return json.dumps({
+        "level": decision["level"],
+        "eligibility": decision["eligibility"],
+        "rejected_categories": sorted(decision["rejected_categories"]),
+    }, sort_keys=True)
 
 if __name__ == "__main__":
     GROQ_API_KEY = os.getenv("GROQ_API_KEY", "your_groq_api_key")
@@ -111,4 +265,16 @@ if __name__ == "__main__":
         "internship_count": 0
     }
     ascendra = AscendraSystem(GROQ_API_KEY)
-    print(ascendra.run(student_profile))
\ No newline at end of file
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--batch":
+        # python agents.py --batch cohort.json  -> one NDJSON line per student, as they finish
+        with open(sys.argv[2]) as f:
+            cohort = json.load(f)
+
+        async def stream_batch():
+            async for index, result in ascendra.arun_batch(cohort):
+                print(json.dumps({"index": index, **result}), flush=True)
+
+        asyncio.run(stream_batch())
+    else:
+        print(json.dumps(ascendra.run(student_profile), indent=2))
\ No newline at end of file
@@ -0,0 +1,409 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional
+
+# Opportunity catalog.
+# Tiffy queries and scraped event pages are cached with a TTL (stale entries are
+# served immediately and refreshed in the background), scraping runs on a bounded
+# worker pool, and every opportunity found is kept in a local SQLite store. The
+# agents' tools and the rule engine read from the store, so recommendation latency
+# no longer depends on scraping and one crawl serves every student.
+
+CATALOG_DB_PATH = os.getenv("CATALOG_DB_PATH", "./opportunities.db")
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", str(6 * 60 * 60)))
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "4"))
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "20"))
+# "http" fetches pages directly; "selenium" renders them in headless Chrome first
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "http")
+
+OPPORTUNITY_FIELDS = ["type", "title", "organizer", "eligibility", "deadline", "apply_link"]
+
+
+def tiffy_fetch(query: str) -> List[Dict[str, Any]]:
+    """Searches for hackathons, ideathons, and internships using Tiffy API."""
+    return [
+        {
+            "type": "IDEATHON",
+            "title": "National Innovation Ideathon",
+            "organizer": "TechNext",
+            "eligibility": "Open for beginners",
+            "deadline": "2026-03-10",
+            "apply_link": "https://technext.com/ideathon"
+        },
+        {
+            "type": "HACKATHON",
+            "title": "Elite Global Hack",
+            "organizer": "GDG",
+            "eligibility": "CGPA > 7.5 required",
+            "deadline": "2026-04-20",
+            "apply_link": "https://gdg.community/elite"
+        }
+    ]
+
+
+class _OpportunityPageParser(HTMLParser):
+    """
+    Pulls opportunity fields out of an event page. Fields are read from elements
+    marked with data-field="..." or itemprop="...", falling back to the page's
+    <h1>/<title> for the title and the first "apply" link for apply_link.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.fields = {}
+        self.title = ""
+        self.h1 = ""
+        self.apply_link = None
+        self._stack = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        field = attrs.get("data-field") or attrs.get("itemprop")
+        if field not in OPPORTUNITY_FIELDS:
+            field = None
+        if tag == "a":
+            marker = f"{attrs.get('class', '')} {attrs.get('id', '')}".lower()
+            if field == "apply_link":
+                if attrs.get("href"):
+                    self.fields.setdefault("apply_link", attrs["href"])
+                field = None
+            elif self.apply_link is None and "apply" in marker:
+                self.apply_link = attrs.get("href")
+        if tag == "meta":
+            if field and attrs.get("content"):
+                self.fields.setdefault(field, attrs["content"].strip())
+            return
+        if tag in ("br", "img", "input", "link", "hr"):
+            return
+        self._stack.append((tag, field, []))
+
+    def handle_endtag(self, tag):
+        # Pop back to the matching tag (tolerates unclosed children)
+        while self._stack:
+            open_tag, field, parts = self._stack.pop()
+            text = " ".join("".join(parts).split())
+            if self._stack:
+                self._stack[-1][2].append("".join(parts))
+            if field and text:
+                self.fields.setdefault(field, text)
+            elif open_tag == "title" and not self.title:
+                self.title = text
+            elif open_tag == "h1" and not self.h1:
+                self.h1 = text
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._stack:
+            self._stack[-1][2].append(data)
+
+
+def parse_opportunity_page(html: str, url: str) -> Dict[str, Any]:
+    parser = _OpportunityPageParser()
+    parser.feed(html)
+    parser.close()
+    data = dict(parser.fields)
+    data.setdefault("title", parser.h1 or parser.title)
+    data.setdefault("apply_link", parser.apply_link or url)
+    if "type" in data:
+        data["type"] = data["type"].upper()
+    data["url"] = url
+    return data
+
+
+def http_fetch(url: str) -> str:
+    request = urllib.request.Request(url, headers={"User-Agent": "AscendraCatalog/1.0"})
+    with urllib.request.urlopen(request, timeout=SCRAPER_TIMEOUT) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset, errors="replace")
+
+
+_selenium_local = threading.local()
+
+
+def selenium_fetch(url: str) -> str:
+    """Renders the page in headless Chrome (one driver per worker thread, reused)."""
+    driver = getattr(_selenium_local, "driver", None)
+    if driver is None:
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(SCRAPER_TIMEOUT)
+        _selenium_local.driver = driver
+    driver.get(url)
+    return driver.page_source
+
+
+def default_fetcher() -> Callable[[str], str]:
+    return selenium_fetch if SCRAPER_BACKEND == "selenium" else http_fetch
+
+
+class TTLCache:
+    """
+    Thread-safe TTL cache with stale-while-revalidate: an expired entry is still
+    returned, and a single background refresh is scheduled for it.
+    """
+
+    def __init__(self, ttl: float, executor: ThreadPoolExecutor):
+        self.ttl = ttl
+        self.executor = executor
+        self._entries = {}
+        self._loading = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self.hits += 1
+                    return value
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self.executor.submit(self._refresh, key, loader)
+                return value
+            # Concurrent misses for the same key wait for a single load
+            pending = self._loading.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = self._loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return pending.result()
+        try:
+            value = loader()
+            self.set(key, value)
+            pending.set_result(value)
+            return value
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def _refresh(self, key: str, loader: Callable[[], Any]):
+        try:
+            self.set(key, loader())
+        except Exception as e:
+            print(f"Background refresh of {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+SEARCH_FIELDS = ["title", "organizer", "eligibility", "type"]
+SEARCH_TEXT_SQL = "lower(" + " || ' ' || ".join(SEARCH_FIELDS) + ")"
+# Generic words ("hackathons", "jobs") only narrow by type, not by text; filler words are ignored
+GENERIC_SEARCH_WORDS = {"HACKATHON", "IDEATHON", "INTERNSHIP", "JOB", "OPPORTUNITIE", "EVENT"}
+SEARCH_STOP_WORDS = {
+    "a", "an", "and", "any", "at", "best", "find", "for", "from", "in", "is", "me", "my", "near",
+    "new", "of", "on", "or", "show", "the", "to", "top", "upcoming", "with",
+}
+
+
+def search_terms(query: str) -> List[str]:
+    """The words of a free-form query that are matched against the catalog text."""
+    words = re.findall(r"\w+", query.lower())
+    return list(dict.fromkeys(
+        w for w in words if w not in SEARCH_STOP_WORDS and w.rstrip("s").upper() not in GENERIC_SEARCH_WORDS
+    ))
+
+
+class OpportunityStore:
+    """Local SQLite store of every opportunity seen, queried instead of scraping live."""
+
+    def __init__(self, path: str = CATALOG_DB_PATH):
+        self.path = path
+        # One shared connection; SQLite serializes writers anyway and reads are short
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS opportunities (
+                    id TEXT PRIMARY KEY,
+                    type TEXT,
+                    title TEXT,
+                    organizer TEXT,
+                    eligibility TEXT,
+                    deadline TEXT,
+                    apply_link TEXT,
+                    source TEXT,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_opportunities_type ON opportunities (type)")
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def opportunity_id(opp: Dict[str, Any]) -> str:
+        key = opp.get("apply_link") or opp.get("url") or f"{opp.get('title')}|{opp.get('organizer')}"
+        return hashlib.sha256(str(key).strip().lower().encode()).hexdigest()[:32]
+
+    def upsert(self, opportunities: List[Dict[str, Any]], source: str):
+        now = time.time()
+        rows = [
+            (self.opportunity_id(o), *(str(o.get(f) or "") for f in OPPORTUNITY_FIELDS), source, json.dumps(o), now)
+            for o in opportunities if o.get("title")
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO opportunities (id, type, title, organizer, eligibility, deadline, apply_link, source, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET type=excluded.type, title=excluded.title, organizer=excluded.organizer, "
+                "eligibility=excluded.eligibility, deadline=excluded.deadline, apply_link=excluded.apply_link, "
+                "source=excluded.source, data=excluded.data, updated_at=excluded.updated_at",
+                rows,
+            )
+
+    def search(self, query: str = "", types: Optional[List[str]] = None, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """
+        Opportunities matching any word of the query (in title / organizer / eligibility /
+        type), best first: ranked by how many query words they contain, then by deadline.
+        Words match whole words or word prefixes ("hack" matches "hackathon").
+        `limit=None` returns every match.
+        """
+        terms = search_terms(query)
+        sql = "SELECT data FROM opportunities WHERE 1=1"
+        params = []
+        if terms:
+            # Cheap candidate filter in SQL; whole-word ranking below
+            sql += " AND (" + " OR ".join([f"{SEARCH_TEXT_SQL} LIKE ?"] * len(terms)) + ")"
+            params.extend(f"%{term}%" for term in terms)
+        if types:
+            sql += f" AND type IN ({', '.join('?' * len(types))})"
+            params.extend(t.upper() for t in types)
+        sql += " ORDER BY deadline"
+        if not terms:
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            return [json.loads(row[0]) for row in self._query(sql, params)]
+
+        ranked = []
+        for (data,) in self._query(sql, params):
+            opp = json.loads(data)
+            words = set(re.findall(r"\w+", " ".join(str(opp.get(f) or "") for f in SEARCH_FIELDS).lower()))
+            matches = sum(any(word.startswith(term) for word in words) for term in terms)
+            if matches:
+                ranked.append((-matches, len(ranked), opp))
+        ranked.sort(key=lambda item: item[:2])
+        return [opp for _, _, opp in ranked[:limit]]
+
+    def all(self) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in self._query("SELECT data FROM opportunities")]
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM opportunities")[0][0]
+
+
+class OpportunityCatalog:
+    """
+    Query / URL cache in front of Tiffy and the scraper, a bounded pool of scraper
+    workers, and the local store everything ends up in.
+    """
+
+    def __init__(self, store: OpportunityStore = None, fetch_page: Callable[[str], str] = None,
+                 search_source: Callable[[str], List[Dict[str, Any]]] = tiffy_fetch,
+                 ttl: float = CATALOG_TTL, workers: int = SCRAPER_WORKERS):
+        self.store = store or OpportunityStore()
+        self.fetch_page = fetch_page or default_fetcher()
+        self.search_source = search_source
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper")
+        self.cache = TTLCache(ttl, self.pool)
+
+    def _load_query(self, query: str) -> List[Dict[str, Any]]:
+        results = self.search_source(query)
+        self.store.upsert(results, source="tiffy")
+        return results
+
+    def _load_page(self, url: str) -> Dict[str, Any]:
+        opportunity = parse_opportunity_page(self.fetch_page(url), url)
+        self.store.upsert([opportunity], source="scraper")
+        return opportunity
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Tiffy results for the query, cached per query."""
+        return self.cache.get(f"query:{query.strip().lower()}", lambda: self._load_query(query))
+
+    def scrape(self, url: str) -> Dict[str, Any]:
+        """Scraped details of one event page, cached per URL."""
+        return self.cache.get(f"url:{url}", lambda: self._load_page(url))
+
+    def crawl(self, urls: List[str]) -> Dict[str, Any]:
+        """
+        Scrapes many pages concurrently on the worker pool (bounded by SCRAPER_WORKERS).
+        Returns {"scraped": n, "failed": {url: error}}.
+        """
+        failed = {}
+        futures = {self.pool.submit(self.scrape, url): url for url in dict.fromkeys(urls)}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed[futures[future]] = str(e)
+        return {"scraped": len(futures) - len(failed), "failed": failed}
+
+    def opportunities(self, query: str = "", types: Optional[List[str]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        What the agents and the rule engine read: the local store, never a live scrape.
+        Without a limit every matching opportunity is returned (the rule engine ranks the full catalog).
+        """
+        return self.store.search(query, types=types, limit=limit)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> OpportunityCatalog:
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = OpportunityCatalog()
+    return _catalog
+
+
+if __name__ == "__main__":
+    # Crawl event pages into the local store, e.g. against the bundled fixtures:
+    #   python -m http.server 8765 --directory fixtures/opportunities
+    #   python catalog.py http://127.0.0.1:8765/devfest.html http://127.0.0.1:8765/ml-internship.html
+    import sys
+    catalog = get_catalog()
+    catalog.search("hackathons ideathons internships jobs")
+    started = time.perf_counter()
+    report = catalog.crawl(sys.argv[1:])
+    print(json.dumps(report, indent=2))
+    print(f"Crawled {len(sys.argv) - 1} URLs in {time.perf_counter() - started:.2f}s; {len(catalog.store)} opportunities stored")
+    catalog.close()
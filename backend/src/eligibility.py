@@ -0,0 +1,256 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Deterministic eligibility + ranking for opportunities.
+# The hard rules used to live only in the recommender agent's prompt; here they are
+# evaluated for every (student, opportunity) pair at once on NumPy arrays, so a whole
+# cohort against the full catalog is a handful of vector operations. The LLM is only
+# asked to explain the result afterwards.
+#
+# Rules (from the recommender prompt: CGPA < 7.5 -> NO GDG; BEGINNER + competency < 60
+# -> IDEATHONS ONLY; INTERMEDIATE -> Local; ADVANCED -> Jobs):
+#   - CGPA < 7.5 blocks GDG events and elite hackathons (and anything asking for a higher CGPA)
+#   - BEGINNER with competency < 60 gets ideathons only
+#   - BEGINNER and INTERMEDIATE get local events only
+#   - ADVANCED gets jobs; internships count as jobs
+# Levels are monotonic: a higher level never loses anything a lower level is offered,
+# so ADVANCED also keeps events, without the locality limit.
+
+MIN_ELITE_CGPA = 7.5
+BEGINNER_MIN_COMPETENCY = 60
+
+LEVELS = ["BEGINNER", "INTERMEDIATE", "ADVANCED"]
+BEGINNER, INTERMEDIATE, ADVANCED = range(3)
+
+TYPES = ["IDEATHON", "HACKATHON", "INTERNSHIP", "JOB"]
+IDEATHON, HACKATHON, INTERNSHIP, JOB = range(4)
+EVENT_TYPES = (IDEATHON, HACKATHON)
+
+# Which opportunity types each level may get (rows: level, cols: type)
+LEVEL_TYPE_ALLOWED = np.array([
+    # IDEATHON HACKATHON INTERNSHIP JOB
+    [True,     True,     False,     False],   # BEGINNER (hackathons need competency >= 60; events must be local)
+    [True,     True,     False,     False],   # INTERMEDIATE (events must be local)
+    [True,     True,     True,      True],    # ADVANCED
+])
+# Levels below this one only get local events
+MIN_NON_LOCAL_LEVEL = ADVANCED
+
+# How much each level prefers each type, used as a ranking tie-breaker
+LEVEL_TYPE_PREFERENCE = np.array([
+    [1.0, 0.6, 0.0, 0.0],
+    [0.6, 1.0, 0.0, 0.0],
+    [0.2, 0.6, 0.8, 1.0],
+])
+
+SKILL_FIELDS = ["frontend_skill_count", "backend_skill_count", "ml_ai_skill_count"]
+SKILL_KEYWORDS = [
+    re.compile(r"\b(?:frontend|front-end|react|web|ui|ux|javascript|design)\b"),
+    re.compile(r"\b(?:backend|back-end|api|cloud|devops|server|database|java)\b"),
+    re.compile(r"\b(?:ml|ai|machine learning|data|deep learning|nlp|vision)\b"),
+]
+
+# Score weights: skill fit, competency, type preference for the level
+W_SKILL, W_COMPETENCY, W_PREFERENCE = 0.5, 0.3, 0.2
+
+_LOCAL_RE = re.compile(r"\blocal\b")
+_CGPA_RE = re.compile(r"cgpa\s*(?:>=|>|of|above|min(?:imum)?)?\s*:?\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+@dataclass
+class ProfileArrays:
+    cgpa: np.ndarray            # (S,)
+    competency: np.ndarray      # (S,)
+    skills: np.ndarray          # (S, 3) frontend / backend / ml counts
+    projects: np.ndarray        # (S,)
+    internships: np.ndarray     # (S,)
+    level: np.ndarray           # (S,) index into LEVELS
+
+
+@dataclass
+class OpportunityArrays:
+    type: np.ndarray            # (O,) index into TYPES, -1 if unknown
+    gdg: np.ndarray             # (O,) bool
+    elite: np.ndarray           # (O,) bool
+    local: np.ndarray           # (O,) bool
+    min_cgpa: np.ndarray        # (O,) 0 when there is no requirement
+    focus: np.ndarray           # (O, 3) unit vector over frontend / backend / ml
+
+
+def classify_levels(competency: np.ndarray, projects: np.ndarray, internships: np.ndarray) -> np.ndarray:
+    """
+    BEGINNER / INTERMEDIATE / ADVANCED from competency and hands-on experience
+    (an internship counts as two projects).
+    """
+    experience = projects + 2 * internships
+    return np.select(
+        [(competency >= 80) & (experience >= 4), (competency >= BEGINNER_MIN_COMPETENCY) & (experience >= 2)],
+        [ADVANCED, INTERMEDIATE],
+        default=BEGINNER,
+    )
+
+
+def encode_profiles(profiles: List[Dict[str, Any]]) -> ProfileArrays:
+    """Profiles use the same fields as the agents.py example (cgpa, competency_score, skill counts, ...)."""
+    def column(field):
+        return np.array([float(p.get(field) or 0) for p in profiles], dtype=np.float64)
+
+    competency = column("competency_score")
+    projects = column("project_count")
+    internships = column("internship_count")
+    skills = np.stack([column(f) for f in SKILL_FIELDS], axis=1) if profiles else np.zeros((0, 3))
+    return ProfileArrays(
+        cgpa=column("cgpa"),
+        competency=competency,
+        skills=skills,
+        projects=projects,
+        internships=internships,
+        level=classify_levels(competency, projects, internships),
+    )
+
+
+def _opportunity_text(opp: Dict[str, Any]) -> str:
+    return " ".join(str(opp.get(k) or "") for k in ("title", "organizer", "eligibility", "location", "scope", "tags"))
+
+
+def encode_opportunities(opportunities: List[Dict[str, Any]]) -> OpportunityArrays:
+    """Turns catalog entries (type, title, organizer, eligibility, ...) into rule features."""
+    n = len(opportunities)
+    types = np.full(n, -1, dtype=np.int64)
+    gdg = np.zeros(n, dtype=bool)
+    elite = np.zeros(n, dtype=bool)
+    local = np.zeros(n, dtype=bool)
+    min_cgpa = np.zeros(n, dtype=np.float64)
+    focus = np.ones((n, 3), dtype=np.float64)
+
+    for i, opp in enumerate(opportunities):
+        kind = str(opp.get("type", "")).upper()
+        if kind in TYPES:
+            types[i] = TYPES.index(kind)
+        text = _opportunity_text(opp)
+        lowered = text.lower()
+        gdg[i] = "gdg" in lowered or "google developer" in lowered
+        elite[i] = bool(opp.get("elite")) or "elite" in lowered
+        local[i] = str(opp.get("scope", "")).upper() == "LOCAL" or _LOCAL_RE.search(lowered) is not None
+        match = _CGPA_RE.search(str(opp.get("eligibility") or ""))
+        if match:
+            min_cgpa[i] = float(match.group(1))
+        hits = [len(pattern.findall(lowered)) for pattern in SKILL_KEYWORDS]
+        if any(hits):
+            focus[i] = hits
+
+    focus /= np.linalg.norm(focus, axis=1, keepdims=True)
+    return OpportunityArrays(type=types, gdg=gdg, elite=elite, local=local, min_cgpa=min_cgpa, focus=focus)
+
+
+def _rule_mask(level: np.ndarray, low_beginner: np.ndarray, low_cgpa: np.ndarray, o: OpportunityArrays) -> np.ndarray:
+    """The categorical rules for a set of students, as a (len(level), O) boolean matrix."""
+    known = o.type >= 0
+    allowed = LEVEL_TYPE_ALLOWED[:, np.where(known, o.type, 0)][level] & known[None, :]
+
+    # BEGINNER with competency < 60: ideathons only
+    allowed &= ~low_beginner[:, None] | (o.type == IDEATHON)[None, :]
+
+    # BEGINNER / INTERMEDIATE: events must be local
+    is_event = np.isin(o.type, EVENT_TYPES)
+    allowed &= ~((level < MIN_NON_LOCAL_LEVEL)[:, None] & (is_event & ~o.local)[None, :])
+
+    # CGPA < 7.5: no GDG, no elite hackathons
+    restricted = o.gdg | (o.elite & (o.type == HACKATHON))
+    allowed &= ~(low_cgpa[:, None] & restricted[None, :])
+    return allowed
+
+
+def eligibility_mask(p: ProfileArrays, o: OpportunityArrays) -> np.ndarray:
+    """(S, O) boolean matrix: True where the hard rules allow the opportunity for the student."""
+    low_beginner = (p.level == BEGINNER) & (p.competency < BEGINNER_MIN_COMPETENCY)
+    low_cgpa = p.cgpa < MIN_ELITE_CGPA
+    # The categorical rules only depend on (level, low_beginner, low_cgpa): at most 12
+    # distinct rows, evaluated once each and broadcast back to the students
+    keys = p.level * 4 + low_beginner * 2 + low_cgpa
+    classes, inverse = np.unique(keys, return_inverse=True)
+    class_masks = _rule_mask(classes // 4, (classes // 2 % 2).astype(bool), (classes % 2).astype(bool), o)
+    # Explicit CGPA requirements always apply
+    return class_masks[inverse.reshape(-1)] & (p.cgpa[:, None] >= o.min_cgpa[None, :])
+
+
+def score_matrix(p: ProfileArrays, o: OpportunityArrays) -> np.ndarray:
+    """(S, O) float32 ranking scores in [0, 1]; -inf where the student is not eligible."""
+    norms = np.linalg.norm(p.skills, axis=1, keepdims=True)
+    skill_vectors = np.divide(p.skills, norms, out=np.full_like(p.skills, 1 / np.sqrt(3)), where=norms > 0)
+    scores = (W_SKILL * skill_vectors.astype(np.float32)) @ o.focus.T.astype(np.float32)
+    scores += (W_COMPETENCY * np.clip(p.competency / 100.0, 0.0, 1.0)).astype(np.float32)[:, None]
+    preference = (W_PREFERENCE * LEVEL_TYPE_PREFERENCE[:, np.where(o.type >= 0, o.type, 0)]).astype(np.float32)
+    scores += preference[p.level]
+    scores[~eligibility_mask(p, o)] = -np.inf
+    return scores
+
+
+def _rejected_categories(level: int, competency: float, cgpa: float) -> List[str]:
+    rejected = []
+    if cgpa < MIN_ELITE_CGPA:
+        rejected += ["GDG", "ELITE_HACKATHON"]
+    if level == BEGINNER and competency < BEGINNER_MIN_COMPETENCY:
+        rejected.append("HACKATHON")
+    if level < MIN_NON_LOCAL_LEVEL:
+        rejected += ["NON_LOCAL_EVENT", "INTERNSHIP", "JOB"]
+    return rejected
+
+
+def categories(o: OpportunityArrays) -> List[str]:
+    """Display category per opportunity (LOCAL_HACKATHON, JOB, ...)."""
+    names = []
+    for kind, local in zip(o.type.tolist(), o.local.tolist()):
+        name = TYPES[kind] if kind >= 0 else "OTHER"
+        names.append(f"LOCAL_{name}" if local and kind in EVENT_TYPES else name)
+    return names
+
+
+def rank(p: ProfileArrays, o: OpportunityArrays, top_k: int = 5) -> tuple:
+    """
+    Top-k eligible opportunities per student, best first.
+    Returns (indices, scores), both (S, k); ineligible slots have score -inf.
+    """
+    scores = score_matrix(p, o)
+    k = min(top_k, scores.shape[1])
+    if not k:
+        return np.zeros((len(scores), 0), dtype=np.int64), np.zeros((len(scores), 0), dtype=np.float32)
+    # Top-k per row without sorting the whole catalog, then order those k
+    top = np.argpartition(scores, -k, axis=1)[:, -k:]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def recommend(profiles: List[Dict[str, Any]], opportunities: List[Dict[str, Any]], top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Decides and ranks opportunities for every profile. Returns one result per profile:
+    {"level", "eligibility": {...}, "final_recommendations": [...], "rejected_categories": [...]}
+    Reasons are rule codes; human-readable explanations are left to the LLM.
+    """
+    p = encode_profiles(profiles)
+    o = encode_opportunities(opportunities)
+    top, top_scores = rank(p, o, top_k)
+    names = categories(o)
+
+    results = []
+    for level, cgpa, competency, row, row_scores in zip(
+        p.level.tolist(), p.cgpa.tolist(), p.competency.tolist(), top.tolist(), np.round(top_scores.astype(np.float64), 4).tolist()
+    ):
+        reason = f"{LEVELS[level].lower()}_eligible"
+        results.append({
+            "level": LEVELS[level],
+            "eligibility": {
+                "gdg_allowed": cgpa >= MIN_ELITE_CGPA,
+                "hackathon_allowed": not (level == BEGINNER and competency < BEGINNER_MIN_COMPETENCY),
+            },
+            "final_recommendations": [
+                {"category": names[j], "score": score, "reason": reason, "opportunity": opportunities[j]}
+                for j, score in zip(row, row_scores) if score != -np.inf
+            ],
+            "rejected_categories": _rejected_categories(level, competency, cgpa),
+        })
+    return results
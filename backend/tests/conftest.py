@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The Python services in src/ are flat modules; make them importable from the tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
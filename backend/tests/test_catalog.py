@@ -0,0 +1,88 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from catalog import OpportunityCatalog, OpportunityStore, http_fetch
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "fixtures", "opportunities")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def fixture_server():
+    """Serves the bundled event pages on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=FIXTURES))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def catalog():
+    catalog = OpportunityCatalog(store=OpportunityStore(":memory:"), fetch_page=http_fetch,
+                                 search_source=lambda query: [], workers=3)
+    yield catalog
+    catalog.close()
+
+
+def test_crawl_parses_fixture_pages(fixture_server, catalog):
+    urls = [f"{fixture_server}/{name}" for name in ("devfest.html", "ml-internship.html", "city-ideathon.html")]
+    report = catalog.crawl(urls + [f"{fixture_server}/missing.html"])
+
+    assert report["scraped"] == 3
+    assert list(report["failed"]) == [f"{fixture_server}/missing.html"]
+    by_title = {o["title"]: o for o in catalog.opportunities()}
+    assert set(by_title) == {"DevFest Pune Hackathon 2026", "Machine Learning Intern", "Pune City Ideathon"}
+
+    devfest = by_title["DevFest Pune Hackathon 2026"]
+    assert devfest["type"] == "HACKATHON"
+    assert devfest["organizer"] == "GDG Pune"
+    assert devfest["deadline"] == "2026-05-02"
+    assert devfest["apply_link"] == "https://gdg.community.dev/devfest-pune/apply"
+
+    intern = by_title["Machine Learning Intern"]
+    assert (intern["type"], intern["organizer"], intern["deadline"]) == ("INTERNSHIP", "Acme AI", "2026-04-15")
+    assert intern["apply_link"] == "https://acme.ai/careers/ml-intern"
+
+    ideathon = by_title["Pune City Ideathon"]
+    assert (ideathon["type"], ideathon["organizer"]) == ("IDEATHON", "Pune Innovation Cell")
+    assert ideathon["apply_link"] == "https://puneinnovation.org/ideathon/register"
+
+
+def test_scrape_is_cached(fixture_server, catalog):
+    url = f"{fixture_server}/devfest.html"
+    catalog.scrape(url)
+    catalog.scrape(url)
+    assert (catalog.cache.misses, catalog.cache.hits) == (1, 1)
+
+
+def test_search_matches_any_term_ranked_by_matches(fixture_server, catalog):
+    catalog.crawl([f"{fixture_server}/{name}" for name in ("devfest.html", "ml-internship.html", "city-ideathon.html")])
+
+    # Free-form query: no opportunity contains every word
+    titles = [o["title"] for o in catalog.store.search("ML internships or hackathons for beginners in Pune")]
+    assert set(titles) == {"DevFest Pune Hackathon 2026", "Machine Learning Intern", "Pune City Ideathon"}
+    # The ideathon matches both "beginners" and "pune"
+    assert titles[0] == "Pune City Ideathon"
+    assert [o["title"] for o in catalog.store.search("gdg hack")] == ["DevFest Pune Hackathon 2026"]
+    assert catalog.store.search("blockchain") == []
+
+
+def test_full_catalog_is_not_truncated():
+    store = OpportunityStore(":memory:")
+    store.upsert([{"type": "HACKATHON", "title": f"Hack {i}", "apply_link": f"https://example.com/{i}"}
+                  for i in range(1500)], source="test")
+    catalog = OpportunityCatalog(store=store, search_source=lambda query: [])
+    try:
+        assert len(catalog.opportunities()) == 1500
+    finally:
+        catalog.close()
@@ -0,0 +1,66 @@
+from eligibility import recommend
+
+OPPORTUNITIES = [
+    {"type": "IDEATHON", "title": "Campus Ideathon", "organizer": "College club", "scope": "LOCAL"},
+    {"type": "IDEATHON", "title": "National Innovation Ideathon", "organizer": "TechNext"},
+    {"type": "HACKATHON", "title": "City Hack Night", "organizer": "Pune devs", "scope": "LOCAL"},
+    {"type": "HACKATHON", "title": "Global Web Hack", "organizer": "HackCo"},
+    {"type": "HACKATHON", "title": "Elite Global Hack", "organizer": "GDG", "eligibility": "CGPA > 7.5 required"},
+    {"type": "INTERNSHIP", "title": "Backend API Intern", "organizer": "Acme"},
+    {"type": "JOB", "title": "ML Engineer", "organizer": "Acme", "eligibility": "CGPA of 8.0 minimum"},
+]
+
+LOW_BEGINNER = {"cgpa": 7.2, "competency_score": 58, "project_count": 1, "frontend_skill_count": 2}
+BEGINNER = {"cgpa": 7.2, "competency_score": 65, "project_count": 1, "backend_skill_count": 2}
+INTERMEDIATE = {"cgpa": 7.8, "competency_score": 70, "project_count": 2, "frontend_skill_count": 3}
+ADVANCED = {"cgpa": 8.4, "competency_score": 88, "project_count": 2, "internship_count": 1, "ml_ai_skill_count": 4}
+
+
+def recommended_titles(profile: dict) -> set:
+    [result] = recommend([profile], OPPORTUNITIES, top_k=len(OPPORTUNITIES))
+    return {r["opportunity"]["title"] for r in result["final_recommendations"]}
+
+
+def test_levels():
+    results = recommend([LOW_BEGINNER, BEGINNER, INTERMEDIATE, ADVANCED], OPPORTUNITIES)
+    assert [r["level"] for r in results] == ["BEGINNER", "BEGINNER", "INTERMEDIATE", "ADVANCED"]
+
+
+def test_beginner_below_60_gets_local_ideathons_only():
+    assert recommended_titles(LOW_BEGINNER) == {"Campus Ideathon"}
+    [result] = recommend([LOW_BEGINNER], OPPORTUNITIES)
+    assert not result["eligibility"]["hackathon_allowed"]
+    assert {"HACKATHON", "NON_LOCAL_EVENT", "GDG"} <= set(result["rejected_categories"])
+
+
+def test_beginner_gets_local_events_only():
+    assert recommended_titles(BEGINNER) == {"Campus Ideathon", "City Hack Night"}
+
+
+def test_intermediate_gets_local_events_only():
+    assert recommended_titles(INTERMEDIATE) == {"Campus Ideathon", "City Hack Night"}
+    [result] = recommend([INTERMEDIATE], OPPORTUNITIES)
+    assert {"NON_LOCAL_EVENT", "INTERNSHIP", "JOB"} <= set(result["rejected_categories"])
+
+
+def test_advanced_gets_jobs_and_non_local_events():
+    assert recommended_titles(ADVANCED) == {o["title"] for o in OPPORTUNITIES}
+
+
+def test_levels_are_monotonic():
+    # Same CGPA for everyone, so only the level differs
+    profiles = [{**profile, "cgpa": 9.0} for profile in (LOW_BEGINNER, BEGINNER, INTERMEDIATE, ADVANCED)]
+    offered = [recommended_titles(profile) for profile in profiles]
+    for lower, higher in zip(offered, offered[1:]):
+        assert lower <= higher
+
+
+def test_cgpa_rules():
+    # Below 7.5: no GDG / elite hackathons; explicit CGPA requirements always apply
+    low_cgpa_advanced = {**ADVANCED, "cgpa": 7.2}
+    assert recommended_titles(low_cgpa_advanced) == {
+        "Campus Ideathon", "National Innovation Ideathon", "City Hack Night", "Global Web Hack", "Backend API Intern",
+    }
+    [result] = recommend([low_cgpa_advanced], OPPORTUNITIES)
+    assert not result["eligibility"]["gdg_allowed"]
+    assert "ML Engineer" not in recommended_titles({**ADVANCED, "cgpa": 7.9})
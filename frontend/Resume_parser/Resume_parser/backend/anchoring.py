@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, select
+from eth_hash.auto import keccak
+
+from metrics import STAGE_SECONDS
+
+# Merkle-batched anchoring of resume hashes on chain.
+# New resume_hashes rows are collected into a batch per time/size window, a Merkle
+# tree is built over them, and only the root is sent in a single transaction.
+# Every resume keeps its inclusion proof, so it can be verified offline against
+# the anchored root.
+
+ANCHOR_BATCH_SIZE = int(os.getenv("ANCHOR_BATCH_SIZE", "1024"))      # size window
+ANCHOR_INTERVAL = float(os.getenv("ANCHOR_INTERVAL", "300"))         # time window, seconds
+ANCHOR_POLL = float(os.getenv("ANCHOR_POLL", "5"))
+# Contract function that receives the root: selector + 32-byte root as calldata
+ANCHOR_FUNCTION = os.getenv("ANCHOR_FUNCTION", "anchorRoot(bytes32)")
+
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    # Sorted pairs: proofs need no left/right flags (same scheme as OpenZeppelin MerkleProof)
+    return keccak(a + b if a <= b else b + a)
+
+
+def leaf_hash(file_hash: str) -> bytes:
+    return keccak(bytes.fromhex(file_hash))
+
+
+def build_merkle_tree(file_hashes: list) -> tuple:
+    """
+    Builds a Merkle tree over SHA-256 hex digests.
+    Returns (root, proofs) where proofs[i] is the list of sibling hashes for leaf i.
+    An odd node at the end of a level is promoted unchanged.
+    """
+    if not file_hashes:
+        raise ValueError("Cannot build a Merkle tree without leaves.")
+    level = [leaf_hash(h) for h in file_hashes]
+    # positions[i] = index of leaf i's ancestor in the current level
+    positions = list(range(len(level)))
+    proofs = [[] for _ in level]
+
+    while len(level) > 1:
+        for leaf, pos in enumerate(positions):
+            sibling = pos ^ 1
+            if sibling < len(level):
+                proofs[leaf].append(level[sibling])
+        level = [
+            _hash_pair(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        positions = [pos // 2 for pos in positions]
+
+    return level[0], proofs
+
+
+def verify_proof(file_hash: str, proof: list, root) -> bool:
+    """Offline check that file_hash is included under root. Proof/root may be bytes or hex strings."""
+    node = leaf_hash(file_hash)
+    for sibling in proof:
+        node = _hash_pair(node, bytes.fromhex(sibling.removeprefix("0x")) if isinstance(sibling, str) else sibling)
+    root = bytes.fromhex(root.removeprefix("0x")) if isinstance(root, str) else root
+    return node == root
+
+
+class ChainSubmitter:
+    """Sends a Merkle root to the anchoring contract in one signed transaction."""
+
+    def __init__(self, w3, private_key: str, contract_address: str, function_signature: str = ANCHOR_FUNCTION):
+        self.w3 = w3
+        self.account = w3.eth.account.from_key(private_key)
+        self.contract_address = w3.to_checksum_address(contract_address)
+        self.selector = keccak(function_signature.encode())[:4]
+
+    def submit(self, root: bytes) -> dict:
+        tx = {
+            "from": self.account.address,
+            "to": self.contract_address,
+            "data": "0x" + (self.selector + root).hex(),
+            "value": 0,
+            "nonce": self.w3.eth.get_transaction_count(self.account.address, "pending"),
+            "chainId": self.w3.eth.chain_id,
+        }
+        tx["gas"] = self.w3.eth.estimate_gas(tx)
+        tx["gasPrice"] = self.w3.eth.gas_price
+        signed = self.account.sign_transaction(tx)
+        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt.status != 1:
+            raise RuntimeError(f"Anchor transaction {self.w3.to_hex(tx_hash)} reverted")
+        return {"tx_hash": self.w3.to_hex(tx_hash), "block_number": receipt.blockNumber, "gas_used": receipt.gasUsed}
+
+
+class AnchorService:
+    """
+    Collects un-anchored resume hashes and anchors them in Merkle batches.
+    Tables: `hash_table` (resume_hashes), `batch_table` (anchor_batches),
+    `anchor_table` (resume_anchors: per-resume proof). `get_submitter` returns the
+    ChainSubmitter (or any object with submit(root)); it is only called when a batch
+    is sent, so the chain client is not created before it is needed.
+
+    Batches are serialized by a lock, so the background loop and /anchor/flush never
+    send the same pending hashes twice. The lock is per process: run anchoring in one
+    process only (ANCHOR_ENABLED=false on any additional workers).
+    """
+
+    def __init__(self, engine, hash_table, batch_table, anchor_table, get_submitter,
+                 batch_size: int = ANCHOR_BATCH_SIZE, interval: float = ANCHOR_INTERVAL):
+        self.engine = engine
+        self.hashes = hash_table
+        self.batches = batch_table
+        self.anchors = anchor_table
+        self.get_submitter = get_submitter
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def _pending_query(self):
+        return (
+            select(self.hashes.c.file_hash, self.hashes.c.created_at)
+            .outerjoin(self.anchors, self.anchors.c.file_hash == self.hashes.c.file_hash)
+            .where(self.anchors.c.file_hash.is_(None))
+        )
+
+    def pending_stats(self) -> tuple:
+        """Returns (pending_count, oldest_created_at)."""
+        sub = self._pending_query().subquery()
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count(), func.min(sub.c.created_at))).one()
+
+    def due(self) -> bool:
+        count, oldest = self.pending_stats()
+        if not count:
+            return False
+        if count >= self.batch_size:
+            return True
+        return oldest is not None and (datetime.utcnow() - oldest).total_seconds() >= self.interval
+
+    def anchor_batch(self) -> dict:
+        """
+        Anchors up to batch_size pending hashes in one transaction and stores their proofs.
+        Returns the batch report (with throughput numbers), or None if nothing was pending.
+        """
+        # select -> submit -> insert must not interleave with another batch
+        with self._lock:
+            return self._anchor_pending()
+
+    def _anchor_pending(self) -> dict:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                self._pending_query().order_by(self.hashes.c.created_at).limit(self.batch_size)
+            ).all()
+        file_hashes = [row.file_hash for row in rows]
+        if not file_hashes:
+            return None
+
+        started = time.perf_counter()
+        root, proofs = build_merkle_tree(file_hashes)
+        built = time.perf_counter()
+        receipt = self.get_submitter().submit(root)
+        submitted = time.perf_counter()
+        STAGE_SECONDS.observe(built - started, stage="anchor_build")
+        STAGE_SECONDS.observe(submitted - built, stage="anchor_submit")
+
+        report = {
+            "root": "0x" + root.hex(),
+            "leaf_count": len(file_hashes),
+            "tx_hash": receipt["tx_hash"],
+            "block_number": receipt["block_number"],
+            "gas_used": receipt["gas_used"],
+            "gas_per_leaf": round(receipt["gas_used"] / len(file_hashes), 1),
+            "build_ms": round((built - started) * 1000, 2),
+            "submit_ms": round((submitted - built) * 1000, 2),
+            "leaves_per_second": round(len(file_hashes) / max(submitted - started, 1e-9), 1),
+        }
+
+        with self.engine.begin() as conn:
+            batch_id = conn.execute(
+                self.batches.insert().values(
+                    root=report["root"],
+                    leaf_count=report["leaf_count"],
+                    tx_hash=report["tx_hash"],
+                    block_number=report["block_number"],
+                    gas_used=report["gas_used"],
+                    build_ms=report["build_ms"],
+                    submit_ms=report["submit_ms"],
+                )
+            ).inserted_primary_key[0]
+            conn.execute(self.anchors.insert(), [
+                {
+                    "file_hash": file_hash,
+                    "batch_id": batch_id,
+                    "leaf_index": index,
+                    "proof": json.dumps(["0x" + p.hex() for p in proofs[index]]),
+                }
+                for index, file_hash in enumerate(file_hashes)
+            ])
+        report["batch_id"] = batch_id
+        print(f"⛓️  Anchored {report['leaf_count']} resume hashes in tx {report['tx_hash']} "
+              f"({report['leaves_per_second']} leaves/s, {report['gas_per_leaf']:.0f} gas/leaf)")
+        return report
+
+    def flush(self) -> list:
+        """Anchors everything pending, one batch at a time."""
+        reports = []
+        while (report := self.anchor_batch()) is not None:
+            reports.append(report)
+        return reports
+
+    def proof_for(self, file_hash: str) -> dict:
+        """Inclusion proof for one resume hash, or None if it is not anchored yet."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.anchors.c.leaf_index, self.anchors.c.proof,
+                       self.batches.c.id, self.batches.c.root, self.batches.c.tx_hash, self.batches.c.block_number)
+                .join(self.batches, self.batches.c.id == self.anchors.c.batch_id)
+                .where(self.anchors.c.file_hash == file_hash)
+            ).first()
+        if row is None:
+            return None
+        proof = json.loads(row.proof)
+        return {
+            "hash": file_hash,
+            "batch_id": row.id,
+            "leaf_index": row.leaf_index,
+            "root": row.root,
+            "proof": proof,
+            "tx_hash": row.tx_hash,
+            "block_number": row.block_number,
+            "verified": verify_proof(file_hash, proof, row.root),
+        }
+
+    async def run_forever(self):
+        """Background loop: anchors a batch whenever the size or time window is reached."""
+        while True:
+            try:
+                if await asyncio.to_thread(self.due):
+                    await asyncio.to_thread(self.anchor_batch)
+            except Exception as e:
+                print(f"Anchoring failed, will retry: {e}")
+            await asyncio.sleep(ANCHOR_POLL)
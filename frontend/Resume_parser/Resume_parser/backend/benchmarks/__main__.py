@@ -0,0 +1,128 @@
+"""
+Runs the backend microbenchmarks offline and compares them with stored baselines.
+
+    python -m benchmarks                         # everything, compared with baseline.json
+    python -m benchmarks -k extract -k dedup     # only matching benchmarks
+    python -m benchmarks --save-baseline         # record the current numbers as the baseline
+    python -m benchmarks --json results.json
+
+A benchmark regresses when its median is more than `--threshold` times its baseline
+median (default 1.25, or the per-benchmark value stored in the baseline file);
+the exit status is then 1, so the suite can gate CI. Baselines are only comparable
+on the machine that recorded them: re-record with --save-baseline on the CI runner.
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 1.25
+
+
+def measure(fn, loop, min_rounds: int, max_rounds: int, budget: float) -> list:
+    """Timings (seconds) of one warm-up-excluded round each, until the time budget is used up."""
+    def call():
+        result = fn()
+        if inspect.isawaitable(result):
+            loop.run_until_complete(result)
+
+    call()  # warm-up: imports, caches, first-use allocations
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < budget):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings: list) -> dict:
+    ordered = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "rounds": len(ordered),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend microbenchmarks.")
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="only run benchmarks whose name or group contains this (repeatable)")
+    parser.add_argument("--rounds", type=int, default=5, help="minimum timed rounds per benchmark")
+    parser.add_argument("--max-rounds", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds of timing per benchmark")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, help=f"allowed median ratio vs baseline (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.baseline)
+
+    # Fixtures, SQLite files and caches are created in a scratch directory, never in the repo
+    sys.path.insert(0, BACKEND_DIR)
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.chdir(workdir)
+    os.environ.setdefault("ANCHOR_ENABLED", "false")
+    from benchmarks.suite import BENCHMARKS
+    import asyncio
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    results, regressions = {}, []
+    print(f"{'benchmark':<36} {'median':>10} {'p95':>10} {'rounds':>6}  vs baseline")
+    for name, spec in BENCHMARKS.items():
+        if args.patterns and not any(p in name or p in spec["group"] for p in args.patterns):
+            continue
+        # Service modules log with print(); keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn = spec["setup"]()
+            timings = measure(fn, loop, args.rounds, args.max_rounds, args.budget)
+        result = results[name] = {"group": spec["group"], **summarize(timings)}
+
+        comparison = ""
+        before = baseline.get(name)
+        if before:
+            threshold = args.threshold or before.get("threshold", DEFAULT_THRESHOLD)
+            ratio = result["median_ms"] / max(before["median_ms"], 1e-9)
+            comparison = f"{ratio:5.2f}x"
+            if ratio > threshold:
+                comparison += f"  REGRESSION (> {threshold}x)"
+                regressions.append(name)
+        print(f"{name:<36} {result['median_ms']:>8.3f}ms {result['p95_ms']:>8.3f}ms {result['rounds']:>6}  {comparison}")
+    loop.close()
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        for name, result in results.items():
+            # Keep hand-tuned thresholds of noisy benchmarks
+            if "threshold" in baseline.get(name, {}):
+                result["threshold"] = baseline[name]["threshold"]
+        baseline.update(results)
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {baseline_path}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Groq/OpenAI-compatible chat completions server for load tests.
+
+Answers POST /openai/v1/chat/completions (plain and streamed) with a canned resume
+parse after an injectable delay, and rejects a configurable share of requests with
+429 + retry-after, so the real groq SDK and AsyncLLMClient code paths run unchanged.
+Point the backend at it with GROQ_BASE_URL:
+
+    python -m benchmarks.fake_groq --port 9100 --latency 0.8 --jitter 0.4 --rate-limit 0.05
+    GROQ_BASE_URL=http://127.0.0.1:9100 GROQ_API_KEY=fake python main.py
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+
+def create_app(latency: float = 0.5, jitter: float = 0.0, rate_limit_ratio: float = 0.0,
+               retry_after: float = 1.0, response: dict = None, seed: int = 0):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    from benchmarks.fakes import canned_parse
+
+    app = FastAPI(title="Fake Groq")
+    rng = random.Random(seed)
+    content = json.dumps(response if response is not None else canned_parse(seed))
+    app.state.stats = {"requests": 0, "rate_limited": 0, "streamed": 0}
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats = app.state.stats
+        stats["requests"] += 1
+        await asyncio.sleep(latency + rng.uniform(0, jitter))
+        if rng.random() < rate_limit_ratio:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": f"{retry_after:g}"},
+                content={"error": {"message": "Rate limit reached (fake)", "type": "tokens",
+                                   "code": "rate_limit_exceeded"}},
+            )
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = body.get("model", "fake")
+        if body.get("stream"):
+            stats["streamed"] += 1
+
+            async def events():
+                for start in range(0, len(content), 64):
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                             "model": model, "choices": [{"index": 0, "finish_reason": None,
+                                                          "delta": {"content": content[start:start + 64]}}]}
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        prompt_tokens = sum(len(m.get("content") or "") for m in body.get("messages", [])) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.stats
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Groq chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay, 0..jitter seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.jitter, args.rate_limit, args.retry_after),
+                host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
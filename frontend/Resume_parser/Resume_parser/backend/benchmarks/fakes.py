@@ -0,0 +1,247 @@
+"""
+In-process stand-ins for the external services, shared by the benchmarks and the load test.
+
+- FakeFirestore: the subset of the google-cloud-firestore client that firebase_service
+  uses (documents, subcollections, batches, get_all, stream), kept in a dict, with an
+  optional per-round-trip latency to mimic the network.
+- LLMStub: a drop-in for groq.AsyncGroq with configurable latency, 429 rate and
+  canned JSON output, so AsyncLLMClient runs its real rate limiting and retry code.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, db, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str):
+        return FakeCollection(self._db, f"{self.path}/{name}")
+
+    def get(self, field_paths=None):
+        self._db._round_trip("reads")
+        return FakeSnapshot(self, self._db._read(self.path))
+
+    def set(self, data: dict, merge=False):
+        self._db._round_trip("writes")
+        self._db._write(self.path, data, merge)
+
+    def delete(self):
+        self._db._round_trip("writes")
+        self._db._write(self.path, None, False)
+
+
+class FakeCollection:
+    def __init__(self, db, path: str):
+        self._db = db
+        self.path = path
+
+    def document(self, doc_id: str):
+        return FakeDocument(self._db, f"{self.path}/{doc_id}")
+
+    def stream(self):
+        self._db._round_trip("reads")
+        prefix = self.path + "/"
+        with self._db._lock:
+            items = [(path, dict(data)) for path, data in self._db.docs.items()
+                     if path.startswith(prefix) and "/" not in path[len(prefix):]]
+        return [FakeSnapshot(FakeDocument(self._db, path), data) for path, data in sorted(items)]
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref, data: dict, merge=False):
+        self._ops.append((ref.path, data, merge))
+
+    def delete(self, ref):
+        self._ops.append((ref.path, None, False))
+
+    def commit(self):
+        self._db._round_trip("commits")
+        with self._db._lock:
+            for path, data, merge in self._ops:
+                self._db._apply(path, data, merge)
+            self._db.stats["writes"] += len(self._ops)
+
+
+class FakeFirestore:
+    """
+    In-memory Firestore client. `latency` seconds are slept once per round trip
+    (get, get_all, stream, commit), and `stats` counts round trips and written documents.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.docs = {}
+        self.stats = {"reads": 0, "writes": 0, "commits": 0}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, refs, field_paths=None):
+        self._round_trip("reads")
+        return [FakeSnapshot(ref, self._read(ref.path)) for ref in refs]
+
+    def reset(self):
+        with self._lock:
+            self.docs.clear()
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def _round_trip(self, kind: str):
+        if kind != "writes":
+            with self._lock:
+                self.stats[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _read(self, path: str):
+        with self._lock:
+            data = self.docs.get(path)
+            return dict(data) if data is not None else None
+
+    def _write(self, path: str, data, merge: bool):
+        with self._lock:
+            self._apply(path, data, merge)
+            self.stats["writes"] += 1
+
+    def _apply(self, path: str, data, merge: bool):
+        if data is None:
+            self.docs.pop(path, None)
+        elif merge:
+            self.docs.setdefault(path, {}).update(data)
+        else:
+            self.docs[path] = dict(data)
+
+
+def canned_parse(seed: int = 0) -> dict:
+    """A plausible LLM parse (RESUME_SCHEMA shape) built from the synthetic resume content."""
+    from benchmarks.synthetic import resume_content
+
+    content = resume_content(1, seed)
+    email, phone, location, _ = content["contact"]
+    return {
+        "personal_info": {"full_name": content["name"], "email": email, "phone": phone, "location": location},
+        "professional_summary": content["summary"],
+        "skills": {
+            "technical": content["skills_table"][0][1].split(", "),
+            "soft": content["skills_table"][2][1].split(", "),
+            "tools_frameworks": content["skills_table"][1][1].split(", "),
+        },
+        "education": [{"degree": degree, "field_of_study": None, "institution": institution, "year": year}
+                      for institution, degree, year in content["education"]],
+        "experience": [{"role": role, "company": company, "duration": f"{start} - Present", "responsibilities": bullets}
+                       for role, company, start, bullets in content["experience"]],
+        "projects": [{"title": title, "summary": bullets[0], "tech_stack": stack.split(", ")}
+                     for title, stack, bullets in content["projects"]],
+        "certifications": [],
+    }
+
+
+class _Completions:
+    def __init__(self, stub):
+        self._stub = stub
+
+    async def create(self, messages=None, stream=False, **kwargs):
+        return await self._stub._complete(messages or [], stream)
+
+
+class LLMStub:
+    """
+    Stands in for groq.AsyncGroq. Each call sleeps `latency` seconds (plus up to
+    `jitter`), fails with a 429 RateLimitError with probability `rate_limit_ratio`,
+    and otherwise returns `response` (a dict, or a callable of the messages).
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rate_limit_ratio: float = 0.0,
+                 response=None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.response = response if response is not None else canned_parse()
+        self.calls = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    async def _complete(self, messages: list, stream: bool):
+        import groq
+        import httpx
+
+        self.calls += 1
+        await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+        if self._rng.random() < self.rate_limit_ratio:
+            self.rate_limited += 1
+            request = httpx.Request("POST", "http://llm-stub/openai/v1/chat/completions")
+            response = httpx.Response(429, headers={"retry-after": "0"}, request=request)
+            raise groq.RateLimitError("Rate limit reached (stub)", response=response, body=None)
+
+        data = self.response(messages) if callable(self.response) else self.response
+        content = json.dumps(data)
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        if stream:
+            return self._stream(content)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4),
+        )
+
+    async def _stream(self, content: str, chunk_chars: int = 64):
+        for start in range(0, len(content), chunk_chars):
+            delta = SimpleNamespace(content=content[start:start + chunk_chars])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def install_llm_stub(stub: LLMStub, rpm: float = 1e6, tpm: float = 1e9):
+    """
+    Makes get_llm_client() return a real AsyncLLMClient whose transport is `stub`.
+    The default rate limits are effectively unlimited; pass real values to see queueing.
+    """
+    import llm_client
+
+    client = llm_client.AsyncLLMClient(api_key="stub", rpm=rpm, tpm=tpm)
+    client.client = stub
+    llm_client._llm_client = client
+    return client
+
+
+def install_fake_firestore(db: FakeFirestore, storage_latency: float = 0.0):
+    """
+    Routes firebase_service (and the pipeline's Storage upload) to the in-memory fake.
+    Storage uploads sleep `storage_latency` seconds and return a fake URL.
+    """
+    import firebase_service
+    import pipeline
+
+    def upload_file_to_storage(file_content, filename, content_type):
+        if storage_latency:
+            time.sleep(storage_latency)
+        return f"https://storage.fake/resumes/{filename}"
+
+    firebase_service.get_db = lambda: db
+    firebase_service.upload_file_to_storage = upload_file_to_storage
+    pipeline.upload_file_to_storage = upload_file_to_storage
+    firebase_service._profile_cache.clear()
@@ -0,0 +1,279 @@
+"""
+End-to-end load test of both services against local stand-ins.
+
+Boots text_extractor and the parser API (main) on local ports in this process, with:
+- Groq replaced by benchmarks.fake_groq over real HTTP (latency, jitter and 429s injectable),
+- Firestore / Storage replaced by the in-memory fake (with a per-round-trip latency),
+- the anchoring chain replaced by an in-process eth-tester chain (or --rpc-url for a local
+  dev node such as anvil / hardhat, with PRIVATE_KEY and CONTRACT_ADDRESS in the env).
+
+N concurrent clients then replay a synthetic resume corpus through the same flow as the
+frontend (POST /extract-text, then POST /upload-resume) and the run reports throughput,
+p50/p95/p99 latency per endpoint and per stage (from the Server-Timing headers) and error rates:
+
+    python -m benchmarks.loadtest --clients 32 --requests 500 --llm-latency 1.2 --llm-429 0.05
+    python -m benchmarks.loadtest --parse-mode auto --groq-rpm 300 --json report.json
+
+No credentials, network access or paid quota are needed.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEV_CHAIN_KEY = "0x" + "0" * 63 + "1"  # pre-funded on eth-tester
+ANCHOR_SINK = "0x000000000000000000000000000000000000dEaD"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_in_thread(app, port: int):
+    """Runs a FastAPI app with uvicorn on a background thread; returns the server once it accepts requests."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Server on port {port} failed to start")
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+
+def parse_server_timing(header: str) -> dict:
+    """{"extract": 12.3, ...} (milliseconds) from a Server-Timing header."""
+    stages = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                stages[name] = float(value)
+    return stages
+
+
+class Recorder:
+    """Collects latency, status and Server-Timing stages per endpoint."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.stages = {}
+        self.errors = {}
+
+    def record(self, endpoint: str, elapsed: float, status: int = None, server_timing: str = None, error: str = None):
+        self.latencies.setdefault(endpoint, []).append(elapsed * 1000)
+        key = str(status) if status is not None else "exception"
+        self.statuses.setdefault(endpoint, {}).setdefault(key, 0)
+        self.statuses[endpoint][key] += 1
+        if error:
+            self.errors.setdefault(endpoint, {}).setdefault(error, 0)
+            self.errors[endpoint][error] += 1
+        for stage, ms in parse_server_timing(server_timing).items():
+            if stage != "total":
+                self.stages.setdefault(endpoint, {}).setdefault(stage, []).append(ms)
+
+    def report(self, wall_seconds: float) -> dict:
+        def summary(values):
+            return {"count": len(values), "p50_ms": round(percentile(values, 50), 1),
+                    "p95_ms": round(percentile(values, 95), 1), "p99_ms": round(percentile(values, 99), 1)}
+
+        endpoints = {}
+        for endpoint, latencies in self.latencies.items():
+            statuses = self.statuses[endpoint]
+            failed = sum(n for status, n in statuses.items() if status == "exception" or status >= "500")
+            endpoints[endpoint] = {
+                **summary(latencies),
+                "throughput_rps": round(len(latencies) / wall_seconds, 2),
+                "error_rate": round(failed / len(latencies), 4),
+                "statuses": statuses,
+                "errors": self.errors.get(endpoint, {}),
+                "stages": {stage: summary(values) for stage, values in sorted(self.stages.get(endpoint, {}).items())},
+            }
+        return {"wall_seconds": round(wall_seconds, 2), "endpoints": endpoints}
+
+
+async def run_clients(extractor_url: str, parser_url: str, corpus: list, clients: int, requests: int,
+                      recorder: Recorder, timeout: float):
+    """`clients` workers send `requests` resumes (cycling through the corpus) through both services."""
+    import httpx
+
+    jobs = asyncio.Queue()
+    for i in range(requests):
+        jobs.put_nowait(i)
+
+    async def timed_post(client, endpoint, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, **kwargs)
+        except httpx.HTTPError as e:
+            recorder.record(endpoint, time.perf_counter() - start, error=type(e).__name__)
+            return None
+        error = None
+        if response.status_code >= 400:
+            error = str(response.json().get("detail", ""))[:80] if "json" in response.headers.get("content-type", "") else None
+        recorder.record(endpoint, time.perf_counter() - start, response.status_code,
+                        response.headers.get("server-timing"), error)
+        return response
+
+    async def worker(client):
+        while not jobs.empty():
+            i = jobs.get_nowait()
+            filename, data = corpus[i % len(corpus)]
+            content_type = "application/pdf" if filename.endswith(".pdf") else \
+                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            files = {"file": (filename, data, content_type)}
+            if extractor_url:
+                await timed_post(client, "POST /extract-text", f"{extractor_url}/extract-text", files=files)
+            if parser_url:
+                await timed_post(client, "POST /upload-resume", f"{parser_url}/upload-resume",
+                                 files=files, data={"user_id": f"load-user-{i % len(corpus)}"})
+
+    limits = httpx.Limits(max_connections=clients * 2, max_keepalive_connections=clients * 2)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(clients)))
+
+
+def print_report(report: dict, extras: dict):
+    print(f"\nWall time {report['wall_seconds']}s")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"\n{endpoint}: {stats['count']} requests, {stats['throughput_rps']} req/s, "
+              f"error rate {stats['error_rate']:.2%}, statuses {stats['statuses']}")
+        for error, count in stats["errors"].items():
+            print(f"  {count} x {error}")
+        print(f"  {'':<20} {'p50':>9} {'p95':>9} {'p99':>9} {'count':>7}")
+        rows = [("end-to-end", stats)] + list(stats["stages"].items())
+        for name, row in rows:
+            print(f"  {name:<20} {row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {row['count']:>7}")
+    for name, value in extras.items():
+        print(f"\n{name}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test both services against local stand-ins.")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="resumes to send in total")
+    parser.add_argument("--corpus", type=int, default=100, help="distinct synthetic resumes (repeats hit dedup / caches)")
+    parser.add_argument("--target", choices=["both", "extractor", "parser"], default="both")
+    parser.add_argument("--parse-mode", choices=["auto", "llm"], default=os.environ.get("PARSE_MODE", "llm"))
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="seconds per fake Groq completion")
+    parser.add_argument("--llm-jitter", type=float, default=0.4)
+    parser.add_argument("--llm-429", type=float, default=0.0, help="share of Groq calls answered with 429")
+    parser.add_argument("--groq-rpm", type=float, help="client-side rate limit (default: GROQ_RPM / 30)")
+    parser.add_argument("--groq-tpm", type=float, help="client-side token limit (default: GROQ_TPM / 12000)")
+    parser.add_argument("--firestore-latency", type=float, default=0.02, help="seconds per Firestore round trip")
+    parser.add_argument("--storage-latency", type=float, default=0.15, help="seconds per Storage upload")
+    parser.add_argument("--rpc-url", help="local dev chain instead of the in-process eth-tester chain")
+    parser.add_argument("--anchor-interval", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="show service logs instead of writing them to service.log")
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    # Service configuration is read at import time, so it is set before importing them.
+    # SQLite files and caches go to a scratch directory.
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(tempfile.mkdtemp(prefix="resume-load-"))
+    from benchmarks import fake_groq
+    from benchmarks.fakes import FakeFirestore, install_fake_firestore
+    from benchmarks.synthetic import generate_corpus
+
+    groq_port = free_port()
+    os.environ.update({
+        "GROQ_BASE_URL": f"http://127.0.0.1:{groq_port}",
+        "GROQ_API_KEY": "fake",
+        "PARSE_MODE": args.parse_mode,
+        "ANCHOR_ENABLED": "true",
+        "ANCHOR_INTERVAL": str(args.anchor_interval),
+    })
+    if args.groq_rpm:
+        os.environ["GROQ_RPM"] = str(args.groq_rpm)
+    if args.groq_tpm:
+        os.environ["GROQ_TPM"] = str(args.groq_tpm)
+    if args.rpc_url:
+        os.environ["RPC_URL"] = args.rpc_url
+    else:
+        os.environ.update({"RPC_URL": "eth-tester", "PRIVATE_KEY": DEV_CHAIN_KEY, "CONTRACT_ADDRESS": ANCHOR_SINK})
+
+    print(f"Generating {args.corpus} synthetic resumes...")
+    corpus = generate_corpus(args.corpus)
+
+    import main as parser_service
+    import text_extractor
+    if not args.rpc_url:
+        from web3 import EthereumTesterProvider, Web3
+        text_extractor._w3 = Web3(EthereumTesterProvider())
+    firestore = FakeFirestore(latency=args.firestore_latency)
+    install_fake_firestore(firestore, storage_latency=args.storage_latency)
+
+    groq_app = fake_groq.create_app(args.llm_latency, args.llm_jitter, args.llm_429, retry_after=1.0)
+    servers = [serve_in_thread(groq_app, groq_port)]
+    extractor_url = parser_url = None
+    if args.target in ("both", "extractor"):
+        port = free_port()
+        servers.append(serve_in_thread(text_extractor.app, port))
+        extractor_url = f"http://127.0.0.1:{port}"
+    if args.target in ("both", "parser"):
+        port = free_port()
+        servers.append(serve_in_thread(parser_service.app, port))
+        parser_url = f"http://127.0.0.1:{port}"
+
+    print(f"Running {args.requests} resumes with {args.clients} clients "
+          f"(parse mode {args.parse_mode}, fake Groq {args.llm_latency}s +{args.llm_jitter}s, {args.llm_429:.0%} 429s)...")
+    recorder = Recorder()
+    # Service modules log with print(); keep the report readable
+    log_path = os.path.abspath("service.log")
+    log = open(os.devnull if args.verbose else log_path, "w")
+    started = time.perf_counter()
+    try:
+        with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(log):
+            asyncio.run(run_clients(extractor_url, parser_url, corpus, args.clients, args.requests,
+                                    recorder, args.timeout))
+            wall = time.perf_counter() - started
+            anchored = None
+            if extractor_url:
+                # Anchor whatever the interval hasn't picked up yet, so anchoring cost is part of the report
+                import httpx
+                anchored = httpx.post(f"{extractor_url}/anchor/flush", timeout=args.timeout).json()
+    finally:
+        for server in reversed(servers):
+            server.should_exit = True
+        log.close()
+
+    report = recorder.report(wall)
+    report["groq"] = dict(groq_app.state.stats)
+    report["firestore"] = dict(firestore.stats)
+    if anchored is not None:
+        batches = anchored.get("batches", [])
+        report["anchoring_flush"] = {"batches": len(batches), "leaves": sum(b["leaf_count"] for b in batches)}
+    print_report(report, {k: report[k] for k in ("groq", "firestore", "anchoring_flush") if k in report})
+    if not args.verbose:
+        print(f"\nService logs in {log_path}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Benchmark definitions. Each entry is a setup function that prepares its inputs once
+and returns the callable to time (sync, or a coroutine function for async paths).
+"""
+import asyncio
+import contextlib
+import copy
+import hashlib
+import io
+import os
+import sys
+
+from benchmarks.fakes import FakeFirestore, LLMStub, canned_parse, install_fake_firestore, install_llm_stub
+from benchmarks.synthetic import generate_docx, generate_pdf
+
+BENCHMARKS = {}
+_fixtures = {}
+
+
+def benchmark(name: str, group: str):
+    def register(setup):
+        BENCHMARKS[name] = {"group": group, "setup": setup}
+        return setup
+    return register
+
+
+def fixture(fmt: str, pages: int) -> str:
+    """Path of a generated resume, written once per run into the working directory."""
+    key = (fmt, pages)
+    if key not in _fixtures:
+        path = os.path.abspath(f"synthetic_{pages}p.{fmt}")
+        with open(path, "wb") as f:
+            f.write(generate_pdf(pages, seed=pages) if fmt == "pdf" else generate_docx(pages, seed=pages))
+        _fixtures[key] = path
+    return _fixtures[key]
+
+
+def resume_text(pages: int = 2) -> str:
+    from parser import extract_text
+    return extract_text(fixture("pdf", pages), "resume.pdf")
+
+
+# ---------------------------------------------------------------- extraction
+
+@contextlib.contextmanager
+def _extraction_limits(pages: int):
+    """
+    Lifts the page and text caps (MAX_PDF_PAGES, MAX_TEXT_CHARS) so an N-page
+    benchmark really extracts N pages instead of stopping at the production cap.
+    """
+    import parser
+    saved = parser.MAX_PDF_PAGES, parser.MAX_TEXT_CHARS
+    parser.MAX_PDF_PAGES, parser.MAX_TEXT_CHARS = max(pages, saved[0]), sys.maxsize
+    try:
+        yield
+    finally:
+        parser.MAX_PDF_PAGES, parser.MAX_TEXT_CHARS = saved
+
+
+def _extract(fmt: str, pages: int):
+    from parser import extract_text
+    path = fixture(fmt, pages)
+
+    def run():
+        with _extraction_limits(pages):
+            return extract_text(path, f"resume.{fmt}")
+    return run
+
+
+for _pages in (1, 10, 50, 300):
+    benchmark(f"extract_pdf_{_pages}p", "extraction")(lambda pages=_pages: _extract("pdf", pages))
+for _pages in (1, 50):
+    benchmark(f"extract_docx_{_pages}p", "extraction")(lambda pages=_pages: _extract("docx", pages))
+
+
+# ---------------------------------------------------------------- hashing / dedup
+
+@benchmark("spool_and_hash_5mb", "dedup")
+def _spool_and_hash():
+    from uploads import spool_stream
+    data = os.urandom(5 * 1024 * 1024)
+
+    def run():
+        spooled = spool_stream(io.BytesIO(data), "resume.pdf", "application/pdf", max_bytes=len(data))
+        spooled.cleanup()
+    return run
+
+
+def _dedup_indexes(stored: int):
+    """HashIndex and MinHashLSHIndex over a fresh SQLite file with `stored` hashes / signatures."""
+    from sqlalchemy import create_engine
+    import text_extractor
+    from hash_index import HashIndex, enable_sqlite_wal
+    from minhash_index import MinHashLSHIndex
+
+    path = os.path.abspath(f"dedup_{stored}.db")
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    enable_sqlite_wal(engine)
+    text_extractor.Base.metadata.create_all(bind=engine)
+    table = text_extractor.ResumeHash.__table__
+    rows = [{"file_hash": hashlib.sha256(str(i).encode()).hexdigest(), "filename": f"r{i}.pdf"}
+            for i in range(stored)]
+    if rows:
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+    hashes = HashIndex(engine, table)
+    hashes.warm()
+    near_dup = MinHashLSHIndex(engine, text_extractor.ResumeMinHash.__table__,
+                               text_extractor.ResumeLSHBucket.__table__)
+    return hashes, near_dup
+
+
+@benchmark("dedup_check_500_of_50k", "dedup")
+def _dedup_check():
+    hashes, _ = _dedup_indexes(50000)
+    # Half already stored, half new
+    batch = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(0, 50000, 200)]
+    batch += [hashlib.sha256(f"new{i}".encode()).hexdigest() for i in range(250)]
+    return lambda: hashes.check_many(batch)
+
+
+@benchmark("dedup_claim", "dedup")
+def _dedup_claim():
+    hashes, _ = _dedup_indexes(50000)
+    counter = iter(range(10 ** 9))
+    return lambda: hashes.claim(hashlib.sha256(f"claim{next(counter)}".encode()).hexdigest(), "new.pdf")
+
+
+@benchmark("near_duplicate_lookup_2k", "dedup")
+def _near_duplicates():
+    from minhash_index import minhash_signature
+    from benchmarks.synthetic import _lines, resume_content
+    _, near_dup = _dedup_indexes(0)
+    for i in range(2000):
+        text = "\n".join(line for _, line in _lines(resume_content(1, seed=i)))
+        near_dup.add(f"{i:064x}", minhash_signature(text))
+    text = resume_text(1)
+    return lambda: near_dup.query(minhash_signature(text), exclude=None)
+
+
+# ---------------------------------------------------------------- persistence
+
+def _saved_profile(db: FakeFirestore, user_id: str, data: dict):
+    from firebase_service import save_user_profile
+    install_fake_firestore(db)
+    save_user_profile(user_id, copy.deepcopy(data))
+
+
+@benchmark("save_profile_new", "persistence")
+def _save_new():
+    from firebase_service import save_user_profile
+    db = FakeFirestore()
+    install_fake_firestore(db)
+    data = canned_parse()
+    counter = iter(range(10 ** 9))
+    return lambda: save_user_profile(f"user{next(counter)}", copy.deepcopy(data))
+
+
+@benchmark("save_profile_unchanged", "persistence")
+def _save_unchanged():
+    from firebase_service import save_user_profile
+    db = FakeFirestore()
+    data = canned_parse()
+    _saved_profile(db, "u", data)
+    return lambda: save_user_profile("u", copy.deepcopy(data))
+
+
+@benchmark("save_profile_one_project_changed", "persistence")
+def _save_changed():
+    from firebase_service import save_user_profile
+    db = FakeFirestore()
+    data = canned_parse()
+    _saved_profile(db, "u", data)
+    variants = [copy.deepcopy(data) for _ in range(2)]
+    variants[1]["projects"][0]["summary"] = "Rewritten summary."
+    counter = iter(range(10 ** 9))
+    return lambda: save_user_profile("u", copy.deepcopy(variants[next(counter) % 2]))
+
+
+@benchmark("patch_profile_3_ops", "persistence")
+def _patch():
+    from firebase_service import patch_user_profile
+    db = FakeFirestore()
+    data = canned_parse()
+    _saved_profile(db, "u", data)
+    project_id = data["projects"][0]["title"].lower().replace(" ", "_")
+    operations = [
+        {"op": "replace", "path": f"/projects/{project_id}/summary", "value": "Edited"},
+        {"op": "add", "path": "/skills/-", "value": {"name": "Rust", "category": "technical"}},
+        {"op": "replace", "path": "/personal_info/location", "value": "Pune"},
+    ]
+    return lambda: patch_user_profile("u", operations)
+
+
+@benchmark("profile_read_uncached", "persistence")
+def _profile_read():
+    import firebase_service
+    db = FakeFirestore()
+    _saved_profile(db, "u", canned_parse())
+
+    async def run():
+        firebase_service.invalidate_profile("u")
+        await firebase_service.get_user_profile("u")
+    return run
+
+
+# ---------------------------------------------------------------- prompt / parsing
+
+@benchmark("prepare_prompt_2p", "prompt")
+def _prepare_prompt():
+    from llm_service import SYSTEM_PROMPT
+    from prompt_preprocessor import prepare_resume_text
+    text = resume_text(2)
+    return lambda: prepare_resume_text(text, SYSTEM_PROMPT)
+
+
+@benchmark("rule_parse_2p", "prompt")
+def _rule_parse():
+    from rule_parser import parse_resume_locally
+    text = resume_text(2)
+    return lambda: parse_resume_locally(text)
+
+
+@benchmark("canonicalize_skills_60", "prompt")
+def _canonicalize():
+    from benchmarks.synthetic import SKILLS, SOFT_SKILLS
+    from skill_canonicalizer import canonicalize_skills
+    skills = {"technical": [s.upper() for s in SKILLS] + ["HTML/CSS", "React.js and Redux"],
+              "tools_frameworks": SKILLS + ["NodeJS", "node js"], "soft": SOFT_SKILLS * 4}
+    return lambda: canonicalize_skills(skills)
+
+
+@benchmark("llm_parse_stub", "prompt")
+def _llm_parse():
+    from llm_service import parse_resume_with_groq_async
+    install_llm_stub(LLMStub(latency=float(os.environ.get("BENCH_LLM_LATENCY", "0"))))
+    text = resume_text(2)
+    return lambda: parse_resume_with_groq_async(text)
+
+
+@benchmark("llm_parse_stub_32_concurrent", "prompt")
+def _llm_parse_concurrent():
+    from llm_service import parse_resume_with_groq_async
+    install_llm_stub(LLMStub(latency=float(os.environ.get("BENCH_LLM_LATENCY", "0.01"))))
+    text = resume_text(2)
+
+    async def run():
+        await asyncio.gather(*(parse_resume_with_groq_async(text) for _ in range(32)))
+    return run
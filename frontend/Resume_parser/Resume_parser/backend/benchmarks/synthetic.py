@@ -0,0 +1,193 @@
+"""
+Synthetic resumes for benchmarks and load tests.
+
+Generates PDF and DOCX resumes of a configurable size (1-300 pages) with the usual
+sections, bullet lists and a skills table, deterministically from a seed:
+
+    python -m benchmarks.synthetic --pages 20 --format pdf out.pdf
+    python -m benchmarks.synthetic --corpus 200 corpus/      # mixed sizes and formats
+"""
+import argparse
+import io
+import os
+import random
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Kabir", "Ananya", "Rohan", "Sara", "Vihaan", "Nisha"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Gupta", "Nair", "Khan", "Joshi", "Mehta", "Das"]
+CITIES = ["Mumbai", "Pune", "Bengaluru", "Hyderabad", "Chennai", "Delhi"]
+INSTITUTIONS = ["IIT Bombay", "NIT Trichy", "BITS Pilani", "VJTI Mumbai", "COEP Pune", "IIIT Hyderabad"]
+DEGREES = ["B.Tech Computer Science", "B.E. Information Technology", "M.Tech Data Science", "B.Sc Mathematics"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Hooli", "Stark Labs", "Wayne Analytics", "Umbrella Systems"]
+ROLES = ["Software Engineering Intern", "Data Analyst Intern", "Backend Developer", "ML Research Intern"]
+SKILLS = ["Python", "JavaScript", "React", "Node.js", "SQL", "Docker", "AWS", "Machine Learning", "Git",
+          "TypeScript", "Java", "C++", "Kubernetes", "TensorFlow", "PostgreSQL", "Redis", "FastAPI", "Figma"]
+SOFT_SKILLS = ["Communication", "Leadership", "Teamwork", "Problem Solving", "Time Management"]
+VERBS = ["Built", "Designed", "Optimized", "Led", "Implemented", "Automated", "Migrated", "Scaled"]
+OBJECTS = ["a REST API", "the data pipeline", "a recommendation engine", "CI/CD workflows",
+           "a React dashboard", "the search service", "an ETL job", "a mobile app backend"]
+RESULTS = ["cutting latency by {n}%", "serving {n}k daily users", "reducing costs by {n}%",
+           "improving accuracy by {n}%", "saving {n} hours per week"]
+
+
+def _bullet(rng: random.Random) -> str:
+    result = rng.choice(RESULTS).format(n=rng.randint(10, 90))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, {result}."
+
+
+def resume_content(pages: int = 1, seed: int = 0) -> dict:
+    """
+    Section content of one synthetic resume. Longer resumes get more experience
+    and project entries (roughly 45 lines per page).
+    """
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    entries = max(1, pages * 3)
+    return {
+        "name": name,
+        "contact": [f"{name.lower().replace(' ', '.')}@example.com", f"+91 9{rng.randint(100000000, 999999999)}",
+                    rng.choice(CITIES), f"github.com/{name.split()[0].lower()}{seed}"],
+        "summary": " ".join(_bullet(rng) for _ in range(2)),
+        "skills_table": [
+            ["Languages", ", ".join(rng.sample(SKILLS[:12], 4))],
+            ["Frameworks & Tools", ", ".join(rng.sample(SKILLS[6:], 4))],
+            ["Soft Skills", ", ".join(rng.sample(SOFT_SKILLS, 3))],
+        ],
+        "education": [(rng.choice(INSTITUTIONS), rng.choice(DEGREES), str(rng.randint(2018, 2026)))
+                      for _ in range(max(1, entries // 6))],
+        "experience": [(rng.choice(ROLES), rng.choice(COMPANIES), f"{rng.choice(['Jan', 'Jun'])} {rng.randint(2019, 2025)}",
+                        [_bullet(rng) for _ in range(4)]) for _ in range(entries)],
+        "projects": [(f"Project {rng.choice(['Atlas', 'Nova', 'Pulse', 'Orbit', 'Quill'])} {i + 1}",
+                      ", ".join(rng.sample(SKILLS, 3)), [_bullet(rng) for _ in range(3)]) for i in range(entries)],
+    }
+
+
+def _lines(content: dict) -> list:
+    """Flattens the content into (style, text) lines, the table as tab-separated rows."""
+    lines = [("title", content["name"]), ("body", " | ".join(content["contact"])),
+             ("heading", "SUMMARY"), ("body", content["summary"]), ("heading", "SKILLS")]
+    lines += [("row", f"{category}\t{values}") for category, values in content["skills_table"]]
+    lines.append(("heading", "EDUCATION"))
+    for institution, degree, year in content["education"]:
+        lines += [("body", institution), ("body", f"{degree} {year}")]
+    lines.append(("heading", "EXPERIENCE"))
+    for role, company, start, bullets in content["experience"]:
+        lines.append(("body", f"{company} - {role} ({start} - Present)"))
+        lines += [("bullet", b) for b in bullets]
+    lines.append(("heading", "PROJECTS"))
+    for title, stack, bullets in content["projects"]:
+        lines.append(("body", f"{title} | {stack}"))
+        lines += [("bullet", b) for b in bullets]
+    return lines
+
+
+def generate_pdf(pages: int = 1, seed: int = 0) -> bytes:
+    """A text PDF of exactly `pages` pages (content is repeated to fill, the skills table is drawn as a grid)."""
+    import fitz
+
+    lines = _lines(resume_content(pages, seed))
+    doc = fitz.open()
+    line_height, top, bottom = 15, 60, 800
+    index = 0
+    for _ in range(pages):
+        page = doc.new_page()
+        y = top
+        while y < bottom:
+            style, text = lines[index % len(lines)]
+            index += 1
+            if style == "row":
+                category, values = text.split("\t")
+                page.draw_rect(fitz.Rect(50, y - 11, 545, y + 4), width=0.5)
+                page.draw_line(fitz.Point(170, y - 11), fitz.Point(170, y + 4), width=0.5)
+                page.insert_text((54, y), category, fontsize=10)
+                page.insert_text((174, y), values[:80], fontsize=10)
+            elif style == "bullet":
+                page.insert_text((64, y), f"- {text}"[:95], fontsize=10)
+            else:
+                page.insert_text((50, y), text[:90], fontsize=14 if style in ("title", "heading") else 10)
+            y += line_height
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def generate_docx(pages: int = 1, seed: int = 0) -> bytes:
+    """A DOCX with the same content and a real skills table (~45 lines per page)."""
+    import docx
+
+    document = docx.Document()
+    table = None
+    for style, text in _lines(resume_content(pages, seed)):
+        if style == "row":
+            if table is None:
+                table = document.add_table(rows=0, cols=2)
+            row = table.add_row().cells
+            row[0].text, row[1].text = text.split("\t")
+            continue
+        table = None
+        if style == "title":
+            document.add_heading(text, level=0)
+        elif style == "heading":
+            document.add_heading(text, level=1)
+        elif style == "bullet":
+            document.add_paragraph(text, style="List Bullet")
+        else:
+            document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate_resume(fmt: str = "pdf", pages: int = 1, seed: int = 0) -> bytes:
+    if fmt == "pdf":
+        return generate_pdf(pages, seed)
+    if fmt == "docx":
+        return generate_docx(pages, seed)
+    raise ValueError(f"Unknown format {fmt!r}")
+
+
+def corpus_spec(count: int, seed: int = 0) -> list:
+    """
+    (filename, format, pages) for a realistic mix: mostly 1-2 page resumes,
+    some longer CVs and the occasional 20+ page portfolio, about 1 in 4 as DOCX.
+    """
+    rng = random.Random(seed)
+    spec = []
+    for i in range(count):
+        pages = rng.choices([1, 2, 3, 5, 25], weights=[50, 30, 10, 7, 3])[0]
+        fmt = "docx" if rng.random() < 0.25 else "pdf"
+        spec.append((f"resume_{i:04d}.{fmt}", fmt, pages))
+    return spec
+
+
+def generate_corpus(count: int, seed: int = 0) -> list:
+    """[(filename, bytes)] for corpus_spec(count, seed); every file has distinct content."""
+    return [(filename, generate_resume(fmt, pages, seed * 100000 + i))
+            for i, (filename, fmt, pages) in enumerate(corpus_spec(count, seed))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic resumes.")
+    parser.add_argument("output", help="output file, or directory with --corpus")
+    parser.add_argument("--pages", type=int, default=1, help="1-300")
+    parser.add_argument("--format", choices=["pdf", "docx"], default="pdf")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", type=int, help="write this many mixed resumes into the output directory")
+    args = parser.parse_args()
+
+    if args.corpus:
+        os.makedirs(args.output, exist_ok=True)
+        for filename, data in generate_corpus(args.corpus, args.seed):
+            with open(os.path.join(args.output, filename), "wb") as f:
+                f.write(data)
+        print(f"Wrote {args.corpus} resumes to {args.output}")
+        return
+
+    if not 1 <= args.pages <= 300:
+        parser.error("--pages must be between 1 and 300")
+    with open(args.output, "wb") as f:
+        f.write(generate_resume(args.format, args.pages, args.seed))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
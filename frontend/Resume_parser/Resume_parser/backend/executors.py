@@ -0,0 +1,41 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# Process pool for CPU-bound work (PDF/DOCX extraction).
+# Created on first use so importing this module stays cheap, and shut down
+# from the app's shutdown hook.
+_process_pool = None
+
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", os.cpu_count() or 2))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS)
+    return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def run_cpu_bound(func, *args, **kwargs):
+    """
+    Runs a CPU-bound function in the process pool without blocking the event loop.
+    The function and its arguments must be picklable.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Runs a blocking I/O function (Groq, Firestore, Storage) in a worker thread.
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
@@ -1,37 +1,72 @@
-import firebase_admin
-from firebase_admin import credentials, firestore, storage
+import asyncio
+import hashlib
+import json
 import os
+import threading
 from datetime import datetime
 
-# Initialize Firebase
-# We check if app is already initialized to avoid errors during hot reloads or multiple imports
-if not firebase_admin._apps:
-    cred_path = os.environ.get("FIREBASE_CREDENTIALS_PATH")
-    # Only initialize if credentials exist, otherwise we mock or warn
-    if cred_path and os.path.exists(cred_path):
-        cred = credentials.Certificate(cred_path)
-        firebase_admin.initialize_app(cred, {
-            'storageBucket': 'ascendra-89464.appspot.com'
-        })
-    else:
-        print("WARNING: Firebase credentials not found at specified path. Firestore operations will fail.")
+from executors import run_blocking
+from metrics import record_cache, timed
+from skill_canonicalizer import canonicalize_skill, canonicalize_skills, skill_id
+from ttl_cache import TTLCache
 
-def get_db():
+# firebase_admin and the Firestore / Storage clients are imported and initialized
+# on first use, so importing this module (and starting the API) stays fast and
+# never fails because of missing credentials.
+
+_init_lock = threading.Lock()
+_warned = False
+
+def init_firebase() -> bool:
+    """
+    Initializes the Firebase app once. Returns False when no credentials are configured.
+    """
+    global _warned
+    import firebase_admin
+    # We check if app is already initialized to avoid errors during hot reloads or multiple imports
     if firebase_admin._apps:
+        return True
+    with _init_lock:
+        if firebase_admin._apps:
+            return True
+        cred_path = os.environ.get("FIREBASE_CREDENTIALS_PATH")
+        # Only initialize if credentials exist, otherwise we mock or warn
+        if cred_path and os.path.exists(cred_path):
+            from firebase_admin import credentials
+            cred = credentials.Certificate(cred_path)
+            firebase_admin.initialize_app(cred, {
+                'storageBucket': 'ascendra-89464.appspot.com'
+            })
+            return True
+        if not _warned:
+            print("WARNING: Firebase credentials not found at specified path. Firestore operations will fail.")
+            _warned = True
+        return False
+
+def get_db():
+    if init_firebase():
+        from firebase_admin import firestore
         return firestore.client()
     return None
 
 def upload_file_to_storage(file_content, filename, content_type):
     """
     Uploads a file to Firebase Storage and returns the public URL.
+    `file_content` is either the raw bytes or a path to a spooled upload,
+    which is streamed from disk instead of being loaded into memory.
     """
     try:
+        init_firebase()
+        from firebase_admin import storage
         bucket = storage.bucket()
         # Create a unique filename to prevent overwrites (optional, but good practice)
         # For now, we use the original filename but in a 'resumes' folder
         blob = bucket.blob(f"resumes/{filename}")
         
-        blob.upload_from_string(file_content, content_type=content_type)
+        if isinstance(file_content, (bytes, bytearray)):
+            blob.upload_from_string(file_content, content_type=content_type)
+        else:
+            blob.upload_from_filename(file_content, content_type=content_type)
         
         # Make the blob public (for prototype visibility)
         blob.make_public()
@@ -41,18 +76,164 @@ def upload_file_to_storage(file_content, filename, content_type):
         print(f"Error uploading to storage: {e}")
         return None
 
-def save_user_profile(user_id: str, data: dict, source: str = "resume"):
+# Firestore caps a write batch at 500 operations
+FIRESTORE_BATCH_LIMIT = 500
+
+# Assembled profiles served by get_user_profile. Entries are dropped whenever
+# save_user_profile or patch_user_profile writes the user, but only in this process:
+# the TTL bounds staleness from writes made by other workers and from outside this
+# service (e.g. the frontend SDK). Lower it when running several workers.
+PROFILE_CACHE_TTL = float(os.environ.get("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_SIZE = int(os.environ.get("PROFILE_CACHE_SIZE", "1024"))
+_profile_cache = TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+# Bumped on every invalidation; a load that raced with a write is not cached
+_profile_epoch = 0
+
+def _skill_doc(skill: dict, source: str) -> tuple:
+    from firebase_admin import firestore
+    # Canonical names collapse aliases ("NodeJS", "node js") onto one document ID
+    name = (canonicalize_skill(skill["name"]) or [skill["name"]])[0]
+    return skill_id(name), {
+        "name": name,
+        "category": skill.get("category"),
+        "confidence": skill.get("confidence", 1.0),
+        "source": source,
+        "active": True,
+        "last_updated": firestore.SERVER_TIMESTAMP
+    }
+
+def _project_doc(project: dict, source: str) -> tuple:
+    from firebase_admin import firestore
+    title = project.get("title", "Untitled")
+    return title.lower().strip().replace(" ", "_")[:50], {
+        "title": title,
+        "summary": project.get("summary"),
+        "tech_stack": project.get("tech_stack"),
+        "source": source,
+        "last_updated": firestore.SERVER_TIMESTAMP
+    }
+
+def _experience_doc(exp: dict, source: str) -> tuple:
+    company = exp.get("company", "Unknown")
+    role = exp.get("role", "Unknown")
+    return f"{company}_{role}".lower().strip().replace(" ", "_")[:50], {
+        "role": role,
+        "company": company,
+        "duration": exp.get("duration"),
+        "responsibilities": exp.get("responsibilities"),
+        "source": source
+    }
+
+def _education_doc(edu: dict, source: str) -> tuple:
+    institution = edu.get("institution", "Unknown")
+    degree = edu.get("degree", "Unknown")
+    return f"{institution}_{degree}".lower().strip().replace(" ", "_")[:50], {
+        "institution": institution,
+        "degree": degree,
+        "field_of_study": edu.get("field_of_study"),
+        "year": edu.get("year"),
+        "source": source
+    }
+
+# Subcollection -> builder of (doc_id, doc_data) for one item
+SECTION_DOCS = {
+    "skills": _skill_doc,
+    "projects": _project_doc,
+    "experience": _experience_doc,
+    "education": _education_doc,
+}
+
+def _collection_writes(user_ref, data: dict, source: str) -> dict:
+    """
+    Builds the per-subcollection (doc_ref, doc_data) writes for a parsed profile.
+    """
+    items = {
+        "skills": [
+            {"name": name, "category": category}
+            for category, names in canonicalize_skills(data.get("skills") or {}).items()
+            for name in names
+        ],
+        "projects": data.get("projects") or [],
+        "experience": data.get("experience") or [],
+        "education": data.get("education") or [],
+    }
+    writes = {}
+    for section, build in SECTION_DOCS.items():
+        section_ref = user_ref.collection(section)
+        writes[section] = []
+        for item in items[section]:
+            doc_id, doc_data = build(item, source)
+            writes[section].append((section_ref.document(doc_id), doc_data))
+    return writes
+
+def _user_owned_paths(db, doc_refs) -> set:
+    """
+    Returns the paths of the given documents that were edited by the user (source == 'user'),
+    using a single multi-document read.
+    """
+    if not doc_refs:
+        return set()
+    # De-duplicate: the same skill can appear under several categories
+    unique_refs = list({ref.path: ref for ref in doc_refs}.values())
+    owned = set()
+    for snapshot in db.get_all(unique_refs, field_paths=["source"]):
+        if snapshot.exists and snapshot.to_dict().get("source") == "user":
+            owned.add(snapshot.reference.path)
+    return owned
+
+def _content_hash(value) -> str:
+    """
+    Stable hash of a document's parsed content (Firestore sentinels like
+    SERVER_TIMESTAMP are left out so they don't make every save look changed).
+    """
+    if isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in ("last_updated", "updated_at")}
+    encoded = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+def _section_hashes(user_doc_data: dict, collection_writes: dict) -> dict:
+    """
+    {"personal_info": hash, section: {"hash": hash, "docs": {doc_id: hash}}} for one parse.
+    """
+    hashes = {"personal_info": _content_hash(user_doc_data)}
+    for section, section_writes in collection_writes.items():
+        docs = {doc_ref.id: _content_hash(doc_data) for doc_ref, doc_data in section_writes}
+        hashes[section] = {"hash": _content_hash(docs), "docs": docs}
+    return hashes
+
+def _commit_in_batches(db, writes, overwrite: set = frozenset()):
+    """
+    Commits (doc_ref, doc_data) merge-writes through write batches of at most FIRESTORE_BATCH_LIMIT.
+    A doc_data of None deletes the document; paths in `overwrite` are replaced instead of merged.
+    """
+    for start in range(0, len(writes), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for doc_ref, doc_data in writes[start:start + FIRESTORE_BATCH_LIMIT]:
+            if doc_data is None:
+                batch.delete(doc_ref)
+            else:
+                batch.set(doc_ref, doc_data, merge=doc_ref.path not in overwrite)
+        batch.commit()
+
+def save_user_profile(user_id: str, data: dict, source: str = "resume") -> dict:
     """
     Saves parsed resume data to Firestore, respecting user edits.
     If source is 'user', it forces updates and sets source='user'.
+
+    Resume saves are incremental: users/{id}/meta/parse_hashes keeps a content hash
+    per section (and per document) of the last saved parse, so only added or changed
+    documents are written, entries that disappeared from the resume are deleted in
+    the same batches, and an identical re-upload doesn't write at all.
+    Returns {"written", "deleted", "skipped_sections"}.
     """
     db = get_db()
     if not db:
         print("Firestore not initialized, skipping save.")
-        return
+        return {"written": 0, "deleted": 0, "skipped_sections": []}
 
+    from firebase_admin import firestore
     user_ref = db.collection("users").document(user_id)
-    
+
     # 1. Personal Info (Main Doc)
     personal_info = data.get("personal_info", {})
     user_doc_data = {
@@ -64,108 +245,219 @@ def save_user_profile(user_id: str, data: dict, source: str = "resume"):
         "resume_url": data.get("resume_url"),
         "updated_at": firestore.SERVER_TIMESTAMP
     }
-    user_ref.set(user_doc_data, merge=True)
-
-    # 2. Skills
-    skills_ref = user_ref.collection("skills")
-    for category, skill_list in data.get("skills", {}).items():
-        if not skill_list: continue
-        for skill_name in skill_list:
-            skill_id = skill_name.lower().strip().replace(" ", "_").replace(".", "-").replace("/", "-")
-            
-            skill_data = {
-                "name": skill_name,
-                "category": category,
-                "confidence": 1.0, 
-                "source": source,
-                "active": True,
-                "last_updated": firestore.SERVER_TIMESTAMP
-            }
-            
-            doc_ref = skills_ref.document(skill_id)
-            
-            # Logic: 
-            # If source == "user", we always update (overwrite).
-            # If source == "resume", we check if existing is "user".
-            
-            if source == "resume":
-                doc = doc_ref.get()
-                if doc.exists:
-                    existing = doc.to_dict()
-                    if existing.get("source") == "user":
-                        continue
-            
-            doc_ref.set(skill_data, merge=True)
-
-    # 3. Projects
-    projects_ref = user_ref.collection("projects")
-    for project in data.get("projects", []):
-        title = project.get("title", "Untitled")
-        project_id = title.lower().strip().replace(" ", "_")[:50]
-        
-        project_data = {
-            "title": title,
-            "summary": project.get("summary"),
-            "tech_stack": project.get("tech_stack"),
-            "source": source,
-            "last_updated": firestore.SERVER_TIMESTAMP
-        }
-        
-        doc_ref = projects_ref.document(project_id)
-        
-        if source == "resume":
-            doc = doc_ref.get()
-            if doc.exists:
-                existing = doc.to_dict()
-                if existing.get("source") == "user":
-                    continue
-        
-        doc_ref.set(project_data, merge=True)
-
-    # 4. Experience
-    experience_ref = user_ref.collection("experience")
-    for exp in data.get("experience", []):
-        company = exp.get("company", "Unknown")
-        role = exp.get("role", "Unknown")
-        exp_id = f"{company}_{role}".lower().strip().replace(" ", "_")[:50]
-        
-        exp_data = {
-            "role": role,
-            "company": company,
-            "duration": exp.get("duration"),
-            "responsibilities": exp.get("responsibilities"),
-            "source": source
-        }
-        
-        doc_ref = experience_ref.document(exp_id)
-        
-        if source == "resume":
-            doc = doc_ref.get()
-            if doc.exists and doc.to_dict().get("source") == "user":
-                continue
-            
-        doc_ref.set(exp_data, merge=True)
-
-    # 5. Education
-    education_ref = user_ref.collection("education")
-    for edu in data.get("education", []):
-        institution = edu.get("institution", "Unknown")
-        degree = edu.get("degree", "Unknown")
-        edu_id = f"{institution}_{degree}".lower().strip().replace(" ", "_")[:50]
-        
-        edu_data = {
-            "institution": institution,
-            "degree": degree,
-            "field_of_study": edu.get("field_of_study"),
-            "year": edu.get("year"),
-            "source": source
-        }
-        
-        doc_ref = education_ref.document(edu_id)
-        
-        if source == "resume":
-            doc = doc_ref.get()
-            if doc.exists and doc.to_dict().get("source") == "user":
-                continue
-            
-        doc_ref.set(edu_data, merge=True)
+    collection_writes = _collection_writes(user_ref, data, source)
+
+    if source != "resume":
+        # User edits always overwrite and leave the resume hashes alone
+        pending = [(user_ref, user_doc_data)]
+        for section_writes in collection_writes.values():
+            pending.extend(section_writes)
+        _commit_in_batches(db, pending)
+        invalidate_profile(user_id)
+        return {"written": len(pending), "deleted": 0, "skipped_sections": []}
+
+    # 2. Diff against the hashes of the last saved parse
+    hashes_ref = user_ref.collection("meta").document("parse_hashes")
+    snapshot = hashes_ref.get()
+    previous = (snapshot.to_dict() or {}) if snapshot.exists else {}
+    current = _section_hashes(user_doc_data, collection_writes)
+
+    changed_writes, stale_refs, skipped = [], [], []
+    for section, section_writes in collection_writes.items():
+        before = previous.get(section) or {}
+        if before.get("hash") == current[section]["hash"]:
+            skipped.append(section)
+            continue
+        old_docs, new_docs = before.get("docs") or {}, current[section]["docs"]
+        changed_writes.extend(w for w in section_writes if old_docs.get(w[0].id) != new_docs[w[0].id])
+        section_ref = user_ref.collection(section)
+        stale_refs.extend(section_ref.document(doc_id) for doc_id in old_docs if doc_id not in new_docs)
+
+    personal_changed = previous.get("personal_info") != current["personal_info"]
+    if not personal_changed:
+        skipped.append("personal_info")
+        if not changed_writes and not stale_refs:
+            print(f"Profile of {user_id} unchanged, skipping Firestore writes.")
+            return {"written": 0, "deleted": 0, "skipped_sections": skipped}
+
+    # 3. Documents edited by the user are neither overwritten nor deleted
+    owned = _user_owned_paths(db, [ref for ref, _ in changed_writes] + stale_refs)
+    pending = [(user_ref, user_doc_data)] if personal_changed else []
+    pending.extend(w for w in changed_writes if w[0].path not in owned)
+    deletes = [(ref, None) for ref in stale_refs if ref.path not in owned]
+
+    # Written last, so an interrupted save is simply redone on the next upload
+    _commit_in_batches(db, pending + deletes + [(hashes_ref, current)], overwrite={hashes_ref.path})
+    invalidate_profile(user_id)
+    return {"written": len(pending), "deleted": len(deletes), "skipped_sections": skipped}
+
+# Fields of the main user doc that can be edited through patch_user_profile
+PERSONAL_FIELDS = ("full_name", "email", "phone", "location")
+PATCH_OPS = ("add", "replace", "remove")
+
+def _patch_path(path: str) -> list:
+    """Splits a JSON pointer ("/projects/my_app/summary") into unescaped segments."""
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid path {path!r}: must start with '/'")
+    return [segment.replace("~1", "/").replace("~0", "~") for segment in path[1:].split("/")]
+
+def _patch_write(user_ref, op: str, segments: list, value) -> tuple:
+    """
+    Translates one patch operation into a (doc_ref, doc_data, replace) write; doc_data None
+    deletes, and replace is True when doc_data is a whole item that replaces the stored one.
+    """
+    from firebase_admin import firestore
+    section = segments[0]
+
+    if section == "personal_info" and len(segments) == 2 and segments[1] in PERSONAL_FIELDS:
+        return user_ref, {segments[1]: None if op == "remove" else value, "updated_at": firestore.SERVER_TIMESTAMP}, False
+    if section == "professional_summary" and len(segments) == 1:
+        return user_ref, {section: None if op == "remove" else value, "updated_at": firestore.SERVER_TIMESTAMP}, False
+    if section not in SECTION_DOCS or len(segments) not in (2, 3):
+        raise ValueError(f"Unsupported path /{'/'.join(segments)}")
+
+    build = SECTION_DOCS[section]
+    section_ref = user_ref.collection(section)
+    doc_id = segments[1]
+    if section == "skills" and doc_id != "-":
+        doc_id = skill_id(doc_id)  # "/skills/NodeJS" and "/skills/node-js" address the same doc
+
+    if len(segments) == 3:
+        # Single field of an existing item
+        field = segments[2]
+        _, template = build({"name": "-"} if section == "skills" else {}, "user")
+        if field not in template or field in ("source", "last_updated"):
+            raise ValueError(f"Unknown field {field!r} in {section}")
+        return section_ref.document(doc_id), {field: None if op == "remove" else value, "source": "user"}, False
+
+    if op == "remove":
+        if section == "skills":
+            # Keep a user-owned tombstone so the next resume upload doesn't bring the skill back
+            return section_ref.document(doc_id), {"active": False, "source": "user",
+                                                  "last_updated": firestore.SERVER_TIMESTAMP}, False
+        return section_ref.document(doc_id), None, False
+
+    if section == "skills" and isinstance(value, str):
+        value = {"name": value}
+    if not isinstance(value, dict):
+        raise ValueError(f"Value for /{'/'.join(segments)} must be an object")
+    if section == "skills" and not str(value.get("name") or "").strip():
+        raise ValueError(f"Value for /{'/'.join(segments)} must have a non-empty 'name'")
+    new_id, doc_data = build(value, "user")
+    # "/section/-" appends under the derived ID; otherwise the addressed doc is replaced.
+    # Either way the item is written whole: fields it leaves out are dropped, not kept.
+    return section_ref.document(new_id if doc_id == "-" else doc_id), doc_data, True
+
+def patch_user_profile(user_id: str, operations: list) -> dict:
+    """
+    Applies JSON-patch style operations ({"op": "add" | "replace" | "remove", "path", "value"})
+    to a stored profile. Only the addressed documents are written, all in a single batch,
+    and each of them is marked source='user'. Paths:
+
+        /personal_info/<full_name|email|phone|location>, /professional_summary
+        /<skills|projects|experience|education>/<doc id>          whole item (replaces the stored one)
+        /<skills|projects|experience|education>/<doc id>/<field>  one field
+        /<skills|projects|experience|education>/-                 add a new item
+
+    Raises ValueError for invalid operations; nothing is written in that case.
+    """
+    if len(operations) > FIRESTORE_BATCH_LIMIT:
+        raise ValueError(f"At most {FIRESTORE_BATCH_LIMIT} operations per update")
+
+    db = get_db()
+    if not db:
+        print("Firestore not initialized, skipping update.")
+        return {"written": 0, "deleted": 0}
+
+    user_ref = db.collection("users").document(user_id)
+    # Operations on the same document are folded into one write
+    writes, overwrite = {}, set()
+    for operation in operations:
+        op = operation.get("op")
+        if op not in PATCH_OPS:
+            raise ValueError(f"Unsupported op {op!r}, expected one of {', '.join(PATCH_OPS)}")
+        doc_ref, doc_data, replace = _patch_write(user_ref, op, _patch_path(operation.get("path", "")),
+                                                  operation.get("value"))
+        previous = writes.get(doc_ref.path)
+        if replace:
+            # A whole-item write supersedes earlier operations on the same document
+            overwrite.add(doc_ref.path)
+        elif previous and previous[1] is not None and doc_data is not None:
+            doc_data = {**previous[1], **doc_data}
+        elif doc_data is None:
+            overwrite.discard(doc_ref.path)
+        writes[doc_ref.path] = (doc_ref, doc_data)
+
+    _commit_in_batches(db, list(writes.values()), overwrite=overwrite)
+    invalidate_profile(user_id)
+    deleted = sum(1 for _, doc_data in writes.values() if doc_data is None)
+    return {"written": len(writes) - deleted, "deleted": deleted}
+
+def invalidate_profile(user_id: str):
+    """Drops the cached profile of a user after a write."""
+    global _profile_epoch
+    _profile_epoch += 1
+    _profile_cache.pop(user_id)
+
+def _assemble_profile(user_doc: dict, sections: dict) -> dict:
+    """
+    Builds the RESUME_SCHEMA shape from the stored documents. Items of the list
+    sections carry their document `id` and `source` so the dashboard can patch them.
+    """
+    skills = {"technical": [], "soft": [], "tools_frameworks": []}
+    for doc_id, doc in sections["skills"]:
+        if doc.get("active", True):
+            skills.setdefault(doc.get("category") or "technical", []).append(doc.get("name"))
+
+    def items(section):
+        fields = [f for f in SECTION_DOCS[section]({"name": "-"}, "")[1] if f not in ("source", "last_updated")]
+        return [
+            {"id": doc_id, **{f: doc.get(f) for f in fields}, "source": doc.get("source")}
+            for doc_id, doc in sections[section]
+        ]
+
+    return {
+        "personal_info": {f: user_doc.get(f) for f in PERSONAL_FIELDS},
+        "professional_summary": user_doc.get("professional_summary"),
+        "skills": skills,
+        "education": items("education"),
+        "experience": items("experience"),
+        "projects": items("projects"),
+        "certifications": [],
+        "resume_url": user_doc.get("resume_url"),
+    }
+
+async def get_user_profile(user_id: str):
+    """
+    Returns the stored profile of a user in the RESUME_SCHEMA shape (None if there is none).
+    The user doc and the four subcollections are read concurrently and the result is
+    cached in memory; callers must not mutate the returned dict.
+    """
+    cached = _profile_cache.get(user_id)
+    record_cache("profile", cached is not None)
+    if cached is not None:
+        return cached
+
+    db = get_db()
+    if not db:
+        raise RuntimeError("Firestore not initialized")
+    user_ref = db.collection("users").document(user_id)
+    epoch = _profile_epoch
+
+    def read_section(section):
+        return [(snap.id, snap.to_dict() or {}) for snap in user_ref.collection(section).stream()]
+
+    with timed("firestore_read"):
+        user_snapshot, *section_docs = await asyncio.gather(
+            run_blocking(user_ref.get),
+            *(run_blocking(read_section, section) for section in SECTION_DOCS),
+        )
+    sections = dict(zip(SECTION_DOCS, section_docs))
+    if not user_snapshot.exists and not any(sections.values()):
+        return None
+
+    profile = _assemble_profile(user_snapshot.to_dict() or {}, sections)
+    # PROFILE_CACHE_TTL=0 turns the cache off (every read goes to Firestore)
+    if epoch == _profile_epoch and PROFILE_CACHE_TTL > 0:
+        _profile_cache.set(user_id, profile)
+    return profile
@@ -0,0 +1,160 @@
+import math
+import os
+import threading
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from metrics import CACHE_REQUESTS
+
+# Duplicate-resume index for the text_extractor service.
+# An in-memory Bloom filter answers "definitely new" without touching SQLite;
+# everything else goes through pooled WAL-mode connections, and claiming a hash
+# is a single atomic INSERT ... ON CONFLICT DO NOTHING.
+# Each worker process has its own filter. Before trusting a Bloom miss, the filter
+# catches up on rows other workers inserted since it last looked (one range scan
+# on the primary key), so a miss is never a false negative. Rows are never deleted,
+# so ids only grow.
+
+BLOOM_CAPACITY = int(os.environ.get("HASH_BLOOM_CAPACITY", "2000000"))
+BLOOM_ERROR_RATE = float(os.environ.get("HASH_BLOOM_ERROR_RATE", "0.001"))
+# SQLite caps bound parameters per statement; bulk lookups are chunked below it
+LOOKUP_CHUNK = 500
+
+
+def enable_sqlite_wal(engine):
+    """Puts every pooled SQLite connection in WAL mode with a busy timeout."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+class BloomFilter:
+    """
+    Bloom filter over SHA-256 hex digests. The digests are already uniformly
+    distributed, so bit positions are sliced straight out of them (double hashing)
+    instead of hashing again.
+    """
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, hex_digest: str):
+        h1 = int(hex_digest[:16], 16)
+        h2 = int(hex_digest[16:32], 16) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, hex_digest: str):
+        with self._lock:
+            for pos in self._positions(hex_digest):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def __contains__(self, hex_digest: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(hex_digest))
+
+
+class HashIndex:
+    """
+    Exact duplicate index over the resume_hashes table (integer primary key).
+    claim() atomically records a new hash; contains() / check_many() answer lookups,
+    skipping the hash lookup for hashes the Bloom filter has never seen.
+    """
+
+    def __init__(self, engine, table):
+        self.engine = engine
+        self.table = table
+        self.id_column = list(table.primary_key.columns)[0]
+        self.bloom = BloomFilter()
+        self.bloom_skips = 0
+        self._warmed = False
+        self._last_id = 0  # highest row id loaded into the Bloom filter
+        self._warm_lock = threading.Lock()
+
+    @property
+    def warmed(self) -> bool:
+        return self._warmed
+
+    def warm(self):
+        """Loads every stored hash into the Bloom filter (streamed, once per process)."""
+        with self._warm_lock:
+            if self._warmed:
+                return
+            with self.engine.connect() as conn:
+                self._load_new_rows(conn)
+            self._warmed = True
+
+    def _load_new_rows(self, conn, loaded: set = None):
+        """
+        Adds the hashes stored (by any process) since the last load to the Bloom filter,
+        and to `loaded` if given.
+        """
+        query = (select(self.id_column, self.table.c.file_hash)
+                 .where(self.id_column > self._last_id)
+                 .order_by(self.id_column))
+        for row_id, file_hash in conn.execution_options(yield_per=10000).execute(query):
+            self.bloom.add(file_hash)
+            if loaded is not None:
+                loaded.add(file_hash)
+            self._last_id = row_id
+
+    def claim(self, file_hash: str, filename: str) -> bool:
+        """
+        Records the hash. Returns True if it was new, False if it already existed.
+        One atomic statement, so concurrent uploads of the same file cannot both win.
+        """
+        self.warm()
+        stmt = sqlite_insert(self.table).values(file_hash=file_hash, filename=filename)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["file_hash"])
+        with self.engine.begin() as conn:
+            inserted = conn.execute(stmt).rowcount == 1
+        self.bloom.add(file_hash)
+        return inserted
+
+    def contains(self, file_hash: str) -> bool:
+        return self.check_many([file_hash])[file_hash]
+
+    def check_many(self, hashes) -> dict:
+        """
+        Returns {hash: already_stored} for many hashes: at most one query per chunk of
+        Bloom candidates, plus one catch-up query when some hash is a Bloom miss.
+        """
+        self.warm()
+        results = dict.fromkeys(hashes, False)
+        in_bloom = {file_hash: file_hash in self.bloom for file_hash in results}
+        with self.engine.connect() as conn:
+            if not all(in_bloom.values()):
+                # Another worker may have claimed them since this filter last looked
+                loaded = set()
+                with self._warm_lock:
+                    self._load_new_rows(conn, loaded)
+                for file_hash, hit in in_bloom.items():
+                    if not hit and file_hash in loaded:
+                        in_bloom[file_hash] = True
+            candidates = []
+            for file_hash, hit in in_bloom.items():
+                if hit:
+                    candidates.append(file_hash)
+                else:
+                    self.bloom_skips += 1
+            # A Bloom "hit" is a lookup answered from memory, a "miss" one that needs the database
+            CACHE_REQUESTS.inc(len(results) - len(candidates), cache="bloom", result="hit")
+            CACHE_REQUESTS.inc(len(candidates), cache="bloom", result="miss")
+
+            if candidates:
+                for start in range(0, len(candidates), LOOKUP_CHUNK):
+                    chunk = candidates[start:start + LOOKUP_CHUNK]
+                    found = set(conn.execute(
+                        select(self.table.c.file_hash).where(self.table.c.file_hash.in_(chunk))
+                    ).scalars())
+                    for file_hash in chunk:
+                        results[file_hash] = file_hash in found
+        return results
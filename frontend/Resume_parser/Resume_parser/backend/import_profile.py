@@ -0,0 +1,94 @@
+"""
+Import-time profile of the backend services.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+summarizes the slowest imports, so cold-start cost can be compared release to release.
+
+    python import_profile.py                      # main + text_extractor, top 15
+    python import_profile.py main --top 30
+    python import_profile.py --json profile.json  # save a report to diff later
+    python import_profile.py --baseline profile.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["main", "text_extractor"]
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def profile_import(module: str) -> dict:
+    """
+    Imports `module` in a subprocess and returns
+    {"total_ms", "imports": [{"module", "self_ms", "cumulative_ms", "depth"}]}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            # importtime indents nested imports by two spaces per level
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        })
+
+    top_level = next((i for i in reversed(imports) if i["module"] == module), None)
+    return {
+        "total_ms": top_level["cumulative_ms"] if top_level else sum(i["self_ms"] for i in imports),
+        "imports": imports,
+    }
+
+
+def print_report(module: str, report: dict, top: int, baseline: dict = None):
+    line = f"\n{module}: {report['total_ms']:.0f} ms"
+    if baseline and module in baseline:
+        before = baseline[module]["total_ms"]
+        line += f" (baseline {before:.0f} ms, {report['total_ms'] - before:+.0f} ms)"
+    print(line)
+    print(f"  {'cumulative':>10}  {'self':>8}  module")
+    slowest = sorted(report["imports"], key=lambda i: i["cumulative_ms"], reverse=True)
+    for item in [i for i in slowest if i["module"] != module][:top]:
+        print(f"  {item['cumulative_ms']:>8.1f}ms  {item['self_ms']:>6.1f}ms  {'  ' * item['depth']}{item['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of the backend services.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to show")
+    parser.add_argument("--json", help="write the full report to this file")
+    parser.add_argument("--baseline", help="report written earlier with --json to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    reports = {}
+    for module in args.modules:
+        reports[module] = profile_import(module)
+        print_report(module, reports[module], args.top, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+from metrics import LLM_RETRIES, LLM_TOKENS
+
+# Async Groq client layer: rate limiting, bounded concurrency, retries with
+# jittered exponential backoff, JSON repair / re-ask, and a circuit breaker.
+# Under load, requests queue here instead of failing with 429s.
+
+GROQ_RPM = float(os.environ.get("GROQ_RPM", "30"))          # requests per minute for our tier
+GROQ_TPM = float(os.environ.get("GROQ_TPM", "12000"))       # tokens per minute for our tier
+GROQ_MAX_CONCURRENCY = int(os.environ.get("GROQ_MAX_CONCURRENCY", "8"))
+GROQ_MAX_RETRIES = int(os.environ.get("GROQ_MAX_RETRIES", "5"))
+GROQ_TIMEOUT = float(os.environ.get("GROQ_TIMEOUT", "60"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("GROQ_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("GROQ_BREAKER_COOLDOWN", "30"))
+
+
+def _retryable_errors() -> tuple:
+    # The groq SDK is imported on first use; it is slow to import and only needed once we call out
+    import groq
+    return (groq.RateLimitError, groq.APITimeoutError, groq.APIConnectionError, groq.InternalServerError)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when Groq cannot serve the request (breaker open or retries exhausted)."""
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMResponseError(ValueError):
+    """Raised when the model keeps returning output that is not valid JSON."""
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens are added per second up to `capacity`.
+    acquire() waits until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1):
+        # A request bigger than the bucket would wait forever; clamp it
+        amount = min(amount, self.capacity)
+        while True:
+            # Check-and-take has no await in it, so it is atomic on the event loop.
+            # Waiters sleep without holding anything: a small request is not queued
+            # behind a large one, and each re-checks the bucket when it wakes up.
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def drain(self, seconds: float):
+        """Empties the bucket for `seconds` (used when the server says to back off)."""
+        self.tokens = min(self.tokens, -seconds * self.rate)
+        self.updated_at = time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for `cooldown` seconds.
+    After the cooldown a single trial call is let through (half-open); every trial
+    ends in record_success, record_failure or release_trial, so it can never stay in flight.
+    """
+
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_in_flight):
+            remaining = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            raise LLMUnavailableError("Groq circuit breaker is open.", retry_after=remaining or 1.0)
+        if state == "half-open":
+            self._trial_in_flight = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        # A trial that was throttled or cancelled says nothing about health; let another one through
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+def _retry_after(error) -> float:
+    """Reads the server's retry-after hint (seconds) from a Groq error, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's retry-after."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def repair_json(content: str) -> dict:
+    """
+    Best-effort repair of almost-JSON model output: strips markdown fences and
+    surrounding prose, and removes trailing commas. Raises json.JSONDecodeError if still invalid.
+    """
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", content.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    text = re.sub(r",\s*([}\]])", r"\1", text)
+    return json.loads(text)
+
+
+class AsyncLLMClient:
+    """Rate-limited, retrying async wrapper around groq.AsyncGroq for JSON completions."""
+
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 rpm: float = GROQ_RPM, tpm: float = GROQ_TPM,
+                 max_concurrency: int = GROQ_MAX_CONCURRENCY, max_retries: int = GROQ_MAX_RETRIES):
+        import groq
+        # Retries are handled here, so the SDK's own retry loop is disabled
+        self.client = groq.AsyncGroq(
+            api_key=api_key or os.environ.get("GROQ_API_KEY"),
+            base_url=base_url or os.environ.get("GROQ_BASE_URL"),
+            max_retries=0,
+            timeout=GROQ_TIMEOUT,
+        )
+        self.request_bucket = TokenBucket(rate=rpm / 60, capacity=max(1.0, rpm / 60 * 10))
+        self.token_bucket = TokenBucket(rate=tpm / 60, capacity=tpm)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.breaker = CircuitBreaker()
+        self.max_retries = max_retries
+        self.retries = 0
+
+    async def _create(self, estimated_tokens: int, **kwargs):
+        """One completion call with rate limiting, concurrency cap, retries and breaker."""
+        import groq
+        retryable = _retryable_errors()
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                await self.request_bucket.acquire()
+                await self.token_bucket.acquire(estimated_tokens)
+                async with self.semaphore:
+                    completion = await self.client.chat.completions.create(**kwargs)
+            except retryable as e:
+                retry_after = _retry_after(e)
+                # 429s mean "slow down", not "broken": they are absorbed by backoff only
+                if isinstance(e, groq.RateLimitError):
+                    self.breaker.release_trial()
+                    if retry_after:
+                        # Everyone else should back off too, not just this request
+                        self.request_bucket.drain(retry_after)
+                else:
+                    self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise LLMUnavailableError(f"Groq request failed after {attempt + 1} attempts: {e}",
+                                              retry_after=retry_after) from e
+                delay = backoff_delay(attempt, retry_after)
+                self.retries += 1
+                LLM_RETRIES.inc(error=type(e).__name__)
+                print(f"Groq call failed ({type(e).__name__}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                continue
+            except groq.APIStatusError:
+                # Bad request, auth error...: not retried, but Groq answered, so it is up
+                self.breaker.record_success()
+                raise
+            finally:
+                # Anything else (e.g. the client disconnected mid-call) ends the trial unjudged
+                self.breaker.release_trial()
+            self.breaker.record_success()
+            usage = getattr(completion, "usage", None)  # streams have no usage
+            if usage is not None:
+                LLM_TOKENS.observe(usage.prompt_tokens, kind="prompt")
+                LLM_TOKENS.observe(usage.completion_tokens, kind="completion")
+            return completion
+
+    async def complete_json(self, messages: list, model: str, estimated_tokens: int = 0, **kwargs) -> tuple:
+        """
+        Requests a JSON object completion and returns (parsed_dict, completion).
+        Malformed output is repaired locally; if that fails the model is asked once more
+        with the parse error, before giving up with LLMResponseError.
+        """
+        import groq
+        kwargs.setdefault("temperature", 0)
+        kwargs.setdefault("response_format", {"type": "json_object"})
+        messages = list(messages)
+        for reask in range(2):
+            try:
+                completion = await self._create(estimated_tokens, messages=messages, model=model, **kwargs)
+                content = completion.choices[0].message.content
+            except groq.BadRequestError as e:
+                # Groq rejects generations that fail its own JSON validation
+                body = e.body if isinstance(e.body, dict) else {}
+                error = body.get("error", body)
+                if not isinstance(error, dict) or error.get("code") != "json_validate_failed":
+                    raise
+                completion, content = None, error.get("failed_generation") or ""
+            try:
+                return repair_json(content), completion
+            except json.JSONDecodeError as e:
+                if reask == 1:
+                    raise LLMResponseError("LLM did not return valid JSON.") from e
+                print("LLM returned malformed JSON, asking again...")
+                messages = messages + [
+                    {"role": "assistant", "content": content},
+                    {"role": "user", "content": f"That was not valid JSON ({e.msg}). "
+                                                "Reply again with ONLY the corrected JSON object."},
+                ]
+
+    async def stream_text(self, messages: list, model: str, estimated_tokens: int = 0, **kwargs):
+        """
+        Streams the completion text as it is generated (async generator of text deltas).
+        Rate limiting and retries apply to opening the stream; once tokens are
+        flowing, a failure is raised to the caller.
+        """
+        kwargs.setdefault("temperature", 0)
+        kwargs.setdefault("response_format", {"type": "json_object"})
+        stream = await self._create(estimated_tokens, messages=messages, model=model, stream=True, **kwargs)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+_llm_client = None
+
+
+def get_llm_client() -> AsyncLLMClient:
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = AsyncLLMClient()
+    return _llm_client
@@ -1,13 +1,25 @@
 import os
 import json
-from groq import Groq
-from dotenv import load_dotenv
+import hashlib
 
-load_dotenv()
+from prompt_preprocessor import prepare_resume_text, merge_extracted_fields
+from skill_canonicalizer import canonicalize_skills
+from llm_client import get_llm_client, repair_json
+from partial_json import IncrementalObjectParser
+from metrics import LLM_TOKENS
 
-# Initialize Groq client
+# Sync Groq client, created on first use (see get_groq_client)
 # Ensure GROQ_API_KEY is set in .env
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+_client = None
+
+def get_groq_client():
+    global _client
+    if _client is None:
+        from groq import Groq
+        _client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+    return _client
+
+GROQ_MODEL = "llama-3.3-70b-versatile"
 
 RESUME_SCHEMA = """
 {
@@ -50,15 +62,18 @@ RESUME_SCHEMA = """
 }
 """
 
+# The schema is sent minified: indentation costs tokens on every request
+COMPACT_RESUME_SCHEMA = json.dumps(json.loads(RESUME_SCHEMA), separators=(",", ":"))
+
 SYSTEM_PROMPT = f"""
 You are an advanced ATS resume parser. Your job is to extract structured data from resume text.
 You must output STRICT JSON matching the following schema exactly:
-{RESUME_SCHEMA}
+{COMPACT_RESUME_SCHEMA}
 
 RULES:
 - Resume input is PLAIN TEXT.
+- The email and phone found locally were removed from the text; fill email and phone only if one still appears in it.
 - Section names may vary ("Tech Stack" -> SKILLS).
-- Normalize aliases (ML -> Machine Learning, JS -> JavaScript).
 - Infer skills conservatively.
 - If data is missing, return null or empty arrays [].
 - NEVER hallucinate.
@@ -66,26 +81,93 @@ RULES:
 - NO markdown, NO comments, NO explanations.
 """
 
+# Identifies the prompt + model combination. Cached parses are keyed on it,
+# so editing the prompt or switching models invalidates them automatically.
+PARSE_VERSION = hashlib.sha256(f"{GROQ_MODEL}\n{SYSTEM_PROMPT}".encode()).hexdigest()[:16]
+
+def _prepare_messages(resume_text: str):
+    """
+    Pre-processes the resume text locally (see prompt_preprocessor) to cut input tokens
+    and builds the chat messages. Returns (prepared, messages).
+    """
+    prepared = prepare_resume_text(resume_text, SYSTEM_PROMPT)
+    saved = prepared.tokens_before - prepared.tokens_after
+    print(f"Prompt tokens (est.): {prepared.tokens_before} -> {prepared.tokens_after} "
+          f"(-{saved * 100 // max(prepared.tokens_before, 1)}%)")
+    LLM_TOKENS.observe(prepared.tokens_before, kind="estimated_raw")
+    LLM_TOKENS.observe(prepared.tokens_after, kind="estimated_prompt")
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Parse this resume:\n\n{prepared.text}"}
+    ]
+    return prepared, messages
+
+async def parse_resume_with_groq_async(resume_text: str):
+    """
+    Async variant of parse_resume_with_groq used by the API.
+    Goes through the shared AsyncLLMClient: rate limited, retried with backoff,
+    JSON repaired / re-asked, and guarded by a circuit breaker.
+    """
+    prepared, messages = _prepare_messages(resume_text)
+    parsed_data, completion = await get_llm_client().complete_json(
+        messages, model=GROQ_MODEL, estimated_tokens=prepared.tokens_after
+    )
+    if completion is not None and completion.usage is not None:
+        print(f"Prompt tokens (Groq): {completion.usage.prompt_tokens}")
+    return merge_extracted_fields(parsed_data, prepared)
+
+async def stream_resume_with_groq(resume_text: str):
+    """
+    Streams the Groq parse. Yields ("field", key, value) for each top-level schema
+    member as soon as the model has finished generating it, then ("result", data)
+    with the full parse. Falls back to a regular (retried, re-asked) call if the
+    streamed document turns out not to be valid JSON.
+    """
+    prepared, messages = _prepare_messages(resume_text)
+    parser = IncrementalObjectParser()
+    chunks = []
+    async for delta in get_llm_client().stream_text(messages, model=GROQ_MODEL,
+                                                    estimated_tokens=prepared.tokens_after):
+        chunks.append(delta)
+        for key, value in parser.feed(delta):
+            if key == "personal_info" and isinstance(value, dict):
+                value = merge_extracted_fields({"personal_info": value}, prepared)["personal_info"]
+            elif key == "skills" and isinstance(value, dict):
+                value = canonicalize_skills(value)
+            yield ("field", key, value)
+
+    try:
+        parsed_data = repair_json("".join(chunks))
+    except json.JSONDecodeError:
+        print("Streamed parse was not valid JSON, retrying without streaming...")
+        parsed_data, _ = await get_llm_client().complete_json(
+            messages, model=GROQ_MODEL, estimated_tokens=prepared.tokens_after
+        )
+    yield ("result", merge_extracted_fields(parsed_data, prepared))
+
 def parse_resume_with_groq(resume_text: str):
     """
     Parses resume text using Groq API and returns structured JSON.
+    The text is pre-processed locally first (see prompt_preprocessor) to cut input tokens.
     """
+    prepared, messages = _prepare_messages(resume_text)
+
     try:
-        completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"Parse this resume:\n\n{resume_text}"}
-            ],
-            model="llama-3.3-70b-versatile", 
+        completion = get_groq_client().chat.completions.create(
+            messages=messages,
+            model=GROQ_MODEL,
             temperature=0,
             response_format={"type": "json_object"}
         )
         
+        if completion.usage is not None:
+            print(f"Prompt tokens (Groq): {completion.usage.prompt_tokens}")
+
         content = completion.choices[0].message.content
-        parsed_data = json.loads(content)
-        return parsed_data
+        parsed_data = repair_json(content)
+        return merge_extracted_fields(parsed_data, prepared)
     except json.JSONDecodeError:
-        # Basic retry logic could go here, for now we raise
+        # Retries and re-asking live in the async client (parse_resume_with_groq_async)
         raise ValueError("LLM did not return valid JSON.")
     except Exception as e:
         print(f"Error parsing resume with Groq: {e}")
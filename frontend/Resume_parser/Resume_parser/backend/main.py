@@ -1,14 +1,41 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse
+from typing import List, Optional
 import uvicorn
 import os
+import json
+import zipfile
 
-from parser import extract_text
-from llm_service import parse_resume_with_groq
-from firebase_service import save_user_profile, upload_file_to_storage
+from dotenv import load_dotenv
+
+# Load .env before the service modules read their configuration.
+# External clients (Firebase, Groq) are only created on first use; see /ready.
+load_dotenv()
+
+from firebase_service import save_user_profile, patch_user_profile, get_user_profile, init_firebase
+from pipeline import process_resume, process_batch, compare_parse_paths, stream_resume_events, EmptyResumeError
+from executors import run_blocking, shutdown_process_pool
+from uploads import spool_upload, spool_stream, UploadTooLargeError, MAX_UPLOAD_BYTES
+from llm_client import LLMUnavailableError, get_llm_client
+from metrics import install_metrics
 from pydantic import BaseModel
 
 app = FastAPI(title="Antigravity Resume Parser")
+# GET /metrics (Prometheus) and a Server-Timing header with per-stage timings on every response
+install_metrics(app)
+
+# Batch ingestion limits
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "16"))
+MAX_ARCHIVE_BYTES = int(os.environ.get("MAX_ARCHIVE_BYTES", str(500 * 1024 * 1024)))
+MAX_ARCHIVE_EXTRACTED_BYTES = int(os.environ.get("MAX_ARCHIVE_EXTRACTED_BYTES", str(1024 * 1024 * 1024)))
+MAX_ARCHIVE_FILES = int(os.environ.get("MAX_ARCHIVE_FILES", "1000"))
+ALLOWED_EXTENSIONS = (".pdf", ".docx")
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    shutdown_process_pool()
 
 # CORS configuration
 app.add_middleware(
@@ -19,6 +46,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _llm_unavailable(e: LLMUnavailableError) -> HTTPException:
+    """503 with a Retry-After hint when Groq is throttling us or the breaker is open."""
+    headers = {"Retry-After": str(int(e.retry_after) + 1)} if e.retry_after else None
+    return HTTPException(status_code=503, detail=f"Resume parsing temporarily unavailable: {str(e)}", headers=headers)
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe. Initializes the external clients on first call (so the first
+    real request does not pay for it) and reports 503 until they are usable.
+    """
+    checks = {}
+    try:
+        checks["firebase"] = await run_blocking(init_firebase)
+    except Exception as e:
+        print(f"Firebase init failed: {e}")
+        checks["firebase"] = False
+    checks["groq"] = bool(os.environ.get("GROQ_API_KEY")) and get_llm_client().breaker.state != "open"
+
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks},
+    )
+
 @app.post("/upload-resume")
 async def upload_resume(
     file: UploadFile = File(...), 
@@ -33,93 +85,271 @@ async def upload_resume(
         raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX allowed.")
 
     try:
-        # Read file content
-        file_content = await file.read()
-        
-        # 1. Extract Text (Local, No LLM)
-        print(f"Extracting text from {filename}...")
-        text = extract_text(file_content, filename)
-        
-        if not text:
-            raise HTTPException(status_code=400, detail="Could not extract text from file.")
-
-        # 2. Upload to Firebase Storage
-        print(f"Uploading {filename} to Firebase Storage...")
-        resume_url = upload_file_to_storage(file_content, filename, file.content_type)
-        
-        # 3. Parse with Groq (One Call)
-        print("Parsing text with Groq...")
-        parsed_data = parse_resume_with_groq(text)
-        
-        # Add resume URL to data
-        if resume_url:
-            parsed_data["resume_url"] = resume_url
-        
-        # 3. Save to Firestore (Preserving User Edits)
-        print(f"Saving data for user: {user_id}...")
-        save_user_profile(user_id, parsed_data)
-        
+        # Spool to disk in chunks (hashing on the way), rejecting oversized files early
+        upload = await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        parsed_data = await process_resume(upload, user_id)
+
         return {
             "status": "success",
             "message": "Resume parsed and saved successfully.",
             "data": parsed_data
         }
 
+    except EmptyResumeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
     except Exception as e:
         print(f"Error processing resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    finally:
+        upload.cleanup()
 
-class ProfileUpdate(BaseModel):
-    user_id: str
-    data: dict
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
+@app.post("/upload-resume/stream")
+async def upload_resume_stream(
+    file: UploadFile = File(...),
+    user_id: str = Form("default_user")
+):
+    """
+    Same pipeline as /upload-resume, but reports progress over Server-Sent Events:
+    `stage` events (extracted, uploaded, parsing, saved), a `field` event for each
+    top-level schema field as soon as it has been parsed, then a final `result`
+    event (or an `error` event).
+    """
+    filename = file.filename
+    if not filename.lower().endswith(ALLOWED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX allowed.")
+    try:
+        upload = await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    async def event_stream():
+        try:
+            async for event, data in stream_resume_events(upload, user_id):
+                yield _sse(event, data)
+        except EmptyResumeError as e:
+            yield _sse("error", {"status": 400, "detail": str(e)})
+        except LLMUnavailableError as e:
+            yield _sse("error", {"status": 503, "detail": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            print(f"Error streaming resume: {str(e)}")
+            yield _sse("error", {"status": 500, "detail": f"Internal Server Error: {str(e)}"})
+        finally:
+            upload.cleanup()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/parse/compare")
+async def compare_parsers(file: UploadFile = File(...)):
+    """
+    Parses a resume with both the local rule-based parser and Groq and returns
+    both results with their field-level agreement. Nothing is saved.
+    """
+    if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX allowed.")
+    try:
+        upload = await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
+    try:
+        return await compare_parse_paths(upload)
+    except EmptyResumeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LLMUnavailableError as e:
+        raise _llm_unavailable(e)
+    except Exception as e:
+        print(f"Error comparing parsers: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    finally:
+        upload.cleanup()
+
+def _spool_archive(archive_path: str) -> list:
+    """
+    Spools every PDF/DOCX entry of a ZIP archive to its own temp file.
+    Returns batch items keyed by the entry's full path inside the archive.
+
+    Zip bombs are bounded by three limits: the number of entries (MAX_ARCHIVE_FILES),
+    the total uncompressed size (MAX_ARCHIVE_EXTRACTED_BYTES), both checked before
+    anything is decompressed, and the per-file upload limit. zipfile never reads past
+    an entry's declared size, so the declared sizes are safe to check against.
+    An entry over the per-file limit becomes a failed item instead of failing the batch.
+    """
+    items = []
+    try:
+        with zipfile.ZipFile(archive_path) as zf:
+            entries = []
+            for info in zf.infolist():
+                name = os.path.basename(info.filename)
+                # Skip folders and macOS resource forks
+                if info.is_dir() or not name or info.filename.startswith("__MACOSX/"):
+                    continue
+                if not name.lower().endswith(ALLOWED_EXTENSIONS):
+                    continue
+                entries.append((info, name))
+
+            if len(entries) > MAX_ARCHIVE_FILES:
+                raise UploadTooLargeError(f"archive has {len(entries)} resumes; the limit is {MAX_ARCHIVE_FILES}.")
+            extracted = sum(info.file_size for info, _ in entries if info.file_size <= MAX_UPLOAD_BYTES)
+            if extracted > MAX_ARCHIVE_EXTRACTED_BYTES:
+                raise UploadTooLargeError(
+                    f"archive expands to {extracted // (1024 * 1024)}MB; "
+                    f"the limit is {MAX_ARCHIVE_EXTRACTED_BYTES // (1024 * 1024)}MB."
+                )
+
+            for info, name in entries:
+                content_type = "application/pdf" if name.lower().endswith(".pdf") else \
+                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                try:
+                    if info.file_size > MAX_UPLOAD_BYTES:
+                        raise UploadTooLargeError(
+                            f"{name} exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)}MB upload limit."
+                        )
+                    with zf.open(info) as member:
+                        items.append({"name": info.filename, "upload": spool_stream(member, name, content_type)})
+                except UploadTooLargeError as e:
+                    items.append({"name": info.filename, "upload": None, "error": str(e)})
+    except BaseException:
+        _cleanup_items(items)
+        raise
+    return items
+
+
+def _cleanup_items(items: list):
+    for item in items:
+        if item["upload"] is not None:
+            item["upload"].cleanup()
+
+
+@app.post("/upload-resumes/batch")
+async def upload_resumes_batch(
+    files: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None),
+    user_map: str = Form("{}"),  # JSON object: filename (path inside the ZIP for archive entries) -> user_id
+    concurrency: int = Form(BATCH_CONCURRENCY)
+):
+    """
+    Ingests many resumes at once (multiple files and/or a ZIP archive).
+    Each file is mapped to a user via `user_map` (archive entries by their full
+    path inside the ZIP, e.g. "team_a/resume.pdf") and run through the same
+    extract -> parse -> save pipeline as /upload-resume, with bounded concurrency.
+    Per-file results are streamed back as NDJSON as soon as each one finishes,
+    followed by a final summary line.
+    """
+    try:
+        mapping = json.loads(user_map)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="user_map must be a JSON object.")
+    if not isinstance(mapping, dict):
+        raise HTTPException(status_code=400, detail="user_map must be a JSON object.")
+
+    for file in files or []:
+        if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
+            raise HTTPException(status_code=400, detail=f"Invalid file type: {file.filename}. Only PDF and DOCX allowed.")
+
+    # Spool everything up front: the upload files are closed once this handler returns
+    items = []
+    try:
+        for file in files or []:
+            items.append({"name": file.filename, "upload": await spool_upload(file)})
+
+        if archive is not None:
+            archive_upload = await spool_upload(archive, max_bytes=MAX_ARCHIVE_BYTES)
+            try:
+                items.extend(await run_blocking(_spool_archive, archive_upload.path))
+            finally:
+                archive_upload.cleanup()
+    except UploadTooLargeError as e:
+        _cleanup_items(items)
+        raise HTTPException(status_code=413, detail=str(e))
+    except zipfile.BadZipFile:
+        _cleanup_items(items)
+        raise HTTPException(status_code=400, detail="archive is not a valid ZIP file.")
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF or DOCX files provided.")
+
+    # user_map is keyed by name, so two files with the same name would go to the same user
+    seen = set()
+    for item in items:
+        if item["name"] in seen:
+            _cleanup_items(items)
+            raise HTTPException(status_code=400, detail=f"Duplicate file name in batch: {item['name']}.")
+        seen.add(item["name"])
+        item["user_id"] = mapping.get(item["name"])
+
+    concurrency = min(max(1, concurrency), BATCH_MAX_CONCURRENCY)
+
+    async def stream_results():
+        succeeded = 0
+        async for result in process_batch(items, concurrency):
+            if result["status"] == "success":
+                succeeded += 1
+            yield json.dumps(result, default=str) + "\n"
+        yield json.dumps({"summary": {
+            "total": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+        }}) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.get("/profile/{user_id}")
+async def get_profile(user_id: str):
+    """
+    Returns the stored profile (RESUME_SCHEMA shape), served from memory on repeat loads.
+    """
+    try:
+        profile = await get_user_profile(user_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return profile
+
+class PatchOperation(BaseModel):
+    op: str
+    path: str
+    value: Optional[object] = None
+
+class ProfileUpdate(BaseModel):
+    user_id: str
+    # Either JSON-patch style operations (preferred) or a full profile object
+    operations: Optional[List[PatchOperation]] = None
+    data: Optional[dict] = None
 
 @app.post("/update-profile")
 async def update_profile(update: ProfileUpdate):
     """
-    Updates user profile data manually.
+    Updates user profile data manually. Every written document is marked
+    source='user', so later resume uploads never overwrite the edit.
+
+    `operations` only touches the addressed documents, in one batch:
+        [{"op": "replace", "path": "/projects/my_app/summary", "value": "..."},
+         {"op": "add", "path": "/skills/-", "value": {"name": "Rust", "category": "technical"}},
+         {"op": "remove", "path": "/experience/acme_intern"}]
+    `data` (a full profile) rewrites every section it contains.
     """
+    if update.operations is None and update.data is None:
+        raise HTTPException(status_code=400, detail="Provide either 'operations' or 'data'.")
     try:
-        # We flag this data as coming from 'user' so it locks in the edits
-        # The frontend should send the full object or partial. 
-        # We need to ensure the 'source' is set to 'user' for these fields.
-        
-        # Helper to recursively set source='user' would be ideal, 
-        # but for now we rely on the save_user_profile logic which we might need to tweak 
-        # OR we just pass a flag to save_user_profile.
-        
-        # Actually, let's just modify the data before saving to enforce source='user'
-        # This is a bit of a hack for the prototype.
-        
-        data = update.data
-        
-        # Mark top-level source if we had one, but we track at collection level.
-        # We need to ensure that when we save, we explicitly set source='user'
-        # Let's modify save_user_profile to accept a 'source' override or handle it here.
-        
-        # For this prototype, we will trust the frontend to send 'source': 'user' 
-        # OR we update the save_user_profile to handle this.
-        # Let's update save_user_profile in firebase_service.py to be more robust first?
-        # No, let's just do it here for simplicity:
-        
-        # We will iterate and inject source='user' for the collections
-        if "skills" in data:
-            for cat, skills in data["skills"].items():
-                # This is just a list of strings in the JSON schema
-                # We need to change how we save it.
-                pass 
-                
-        # Actually, the save_user_profile function logic:
-        # if existing.get("source") == "user": continue
-        # This prevents OVERWRITING user data with resume data.
-        # But now we ARE the user. We want to overwrite everything.
-        
-        # So we need a mode in save_user_profile.
-        
-        save_user_profile(update.user_id, data, source="user")
-        
-        return {"status": "success", "message": "Profile updated."}
+        if update.operations is not None:
+            operations = [operation.model_dump() for operation in update.operations]
+            result = await run_blocking(patch_user_profile, update.user_id, operations)
+        else:
+            result = await run_blocking(save_user_profile, update.user_id, update.data, source="user")
+        return {"status": "success", "message": "Profile updated.", **result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
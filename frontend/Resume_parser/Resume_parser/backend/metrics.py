@@ -0,0 +1,186 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# In-process metrics for both services, exposed in the Prometheus text format on
+# /metrics. Stage timings of the current request are also collected per request
+# and returned in a Server-Timing header, so a slow upload can be broken down
+# (extract / llm / storage_upload / firestore_save ...) straight from the browser.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (16e3, 64e3, 128e3, 256e3, 512e3, 1e6, 2e6, 5e6, 10e6, 25e6)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+_registry = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram, optionally split by labels."""
+
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = 'le="%s"' % (bound if bound == "+Inf" else f"{bound:g}")
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:g}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency.",
+                            LATENCY_BUCKETS, ("method", "route", "status"))
+STAGE_SECONDS = Histogram("resume_stage_duration_seconds", "Latency of one pipeline stage.",
+                          LATENCY_BUCKETS, ("stage",))
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result (hit / miss).",
+                         ("cache", "result"))
+LLM_RETRIES = Counter("llm_retries_total", "Retried Groq calls by error type.", ("error",))
+LLM_TOKENS = Histogram("llm_tokens", "Tokens per Groq call (estimated prompt, or prompt / completion usage).",
+                       TOKEN_BUCKETS, ("kind",))
+FILE_SIZE_BYTES = Histogram("resume_file_size_bytes", "Size of uploaded resume files.", SIZE_BUCKETS)
+PAGE_COUNT = Histogram("resume_pages", "Page count of uploaded PDF resumes.", PAGE_BUCKETS)
+
+# Stage timings of the request being handled: a list shared with the tasks and
+# threads the request spawns (both copy the context, not the list)
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(stage: str):
+    """Times a block into resume_stage_duration_seconds and the request's Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def server_timing(timings: list, total: float) -> str:
+    """Server-Timing header value; repeated stages (e.g. PDF page ranges) are summed."""
+    durations = {}
+    for stage, elapsed in timings:
+        durations[stage] = durations.get(stage, 0) + elapsed
+    durations["total"] = total
+    return ", ".join(f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in durations.items())
+
+
+def install_metrics(app):
+    """Adds request timing, the Server-Timing header and GET /metrics to a FastAPI app."""
+    from fastapi.responses import PlainTextResponse
+
+    @app.middleware("http")
+    async def record_request(request, call_next):
+        timings = []
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _request_timings.reset(token)
+        # Headers go out before the body, so Server-Timing covers the time to the first byte
+        response.headers["Server-Timing"] = server_timing(timings, time.perf_counter() - start)
+        # Route templates ("/profile/{user_id}") keep the label set small
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        labels = {"method": request.method, "route": route, "status": response.status_code}
+
+        async def observed_body(body):
+            # The latency is recorded once the body is sent: streaming routes
+            # (/upload-resume/stream, /upload-resumes/batch) do their work here
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+
+        response.body_iterator = observed_body(response.body_iterator)
+        return response
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,102 @@
+"""
+One-off migration of users/{id}/skills documents to canonical skill IDs.
+
+Skill documents used to be keyed by the raw skill name ("NodeJS" -> "nodejs"); they
+are now keyed by the canonical name ("Node.js" -> "node-js", see skill_canonicalizer).
+This re-keys every existing document and merges the ones that now share an ID:
+- a user-owned document (source == "user", including removal tombstones) wins over
+  resume-sourced ones, so user edits survive the migration;
+- otherwise the document already stored under the new ID is kept.
+The stale documents are deleted and users/{id}/meta/parse_hashes is dropped, so the
+next resume upload of each migrated user rewrites its sections from scratch.
+
+    python migrate_skill_ids.py --dry-run        # report what would change
+    python migrate_skill_ids.py                  # migrate every user
+    python migrate_skill_ids.py USER_ID [...]    # migrate some users only
+
+Safe to run more than once: users already on canonical IDs are left untouched.
+"""
+import argparse
+
+from firebase_service import get_db, invalidate_profile, _commit_in_batches
+from skill_canonicalizer import canonicalize_skill, skill_id
+
+
+def _keep_first(snapshots: list, new_id: str):
+    """The document that survives among those re-keyed to new_id."""
+    def rank(snapshot):
+        data = snapshot.to_dict() or {}
+        return (data.get("source") != "user", snapshot.id != new_id)
+    return min(snapshots, key=rank)
+
+
+def migrate_user(db, user_id: str, dry_run: bool = False) -> dict:
+    """
+    Re-keys one user's skill documents. Returns {"moved", "merged", "deleted"}:
+    documents written under a new ID, documents folded into another one, and
+    documents removed in total.
+    """
+    user_ref = db.collection("users").document(user_id)
+    skills_ref = user_ref.collection("skills")
+
+    groups = {}
+    for snapshot in skills_ref.stream():
+        name = (snapshot.to_dict() or {}).get("name") or snapshot.id
+        groups.setdefault(skill_id(name), []).append(snapshot)
+
+    writes, stats = [], {"moved": 0, "merged": 0, "deleted": 0}
+    for new_id, snapshots in groups.items():
+        if len(snapshots) == 1 and snapshots[0].id == new_id:
+            continue
+        kept = _keep_first(snapshots, new_id)
+        new_ref = skills_ref.document(new_id)
+        if kept.id != new_id:
+            data = kept.to_dict()
+            if data.get("source") != "user":
+                # Resume-sourced names follow the canonical form; user-typed names stay as written
+                name = data.get("name") or kept.id
+                data["name"] = (canonicalize_skill(name) or [name])[0]
+            writes.append((new_ref, data))
+            stats["moved"] += 1
+        stats["merged"] += len(snapshots) - 1
+        for snapshot in snapshots:
+            if snapshot.id != new_id:
+                writes.append((snapshot.reference, None))
+                stats["deleted"] += 1
+
+    if writes and not dry_run:
+        hashes_ref = user_ref.collection("meta").document("parse_hashes")
+        # Whole documents move, so the new ones replace whatever was stored under their ID
+        overwrite = {ref.path for ref, data in writes if data is not None}
+        _commit_in_batches(db, writes + [(hashes_ref, None)], overwrite=overwrite)
+        invalidate_profile(user_id)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-key skill documents to canonical skill IDs.")
+    parser.add_argument("user_ids", nargs="*", help="users to migrate (default: every user)")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing")
+    args = parser.parse_args()
+
+    db = get_db()
+    if not db:
+        raise SystemExit("Firestore not initialized (check the Firebase credentials).")
+
+    user_ids = args.user_ids or [snapshot.id for snapshot in db.collection("users").stream()]
+    totals = {"users": 0, "moved": 0, "merged": 0, "deleted": 0}
+    for user_id in user_ids:
+        stats = migrate_user(db, user_id, dry_run=args.dry_run)
+        if stats["deleted"]:
+            totals["users"] += 1
+            print(f"{user_id}: {stats['moved']} moved, {stats['merged']} merged, {stats['deleted']} deleted")
+        for key in ("moved", "merged", "deleted"):
+            totals[key] += stats[key]
+
+    prefix = "Would migrate" if args.dry_run else "Migrated"
+    print(f"{prefix} {totals['users']} of {len(user_ids)} users: {totals['moved']} documents moved, "
+          f"{totals['merged']} merged, {totals['deleted']} deleted")
+
+
+if __name__ == "__main__":
+    main()
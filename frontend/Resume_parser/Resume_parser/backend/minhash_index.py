@@ -0,0 +1,112 @@
+import hashlib
+import os
+import re
+import zlib
+
+import numpy as np
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# Near-duplicate resume detection.
+# Each resume's extracted text is reduced to a MinHash signature over word shingles;
+# signatures are split into bands and stored in LSH buckets, so a lookup only
+# compares against resumes that share at least one band (sub-linear in corpus size).
+
+NUM_PERM = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERM // LSH_BANDS   # 4 rows/band: candidate pairs from roughly 0.4 Jaccard up
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", "0.7"))
+
+# Universal hashing h(x) = (a*x + b) mod p over 32-bit shingle hashes.
+# p < 2^31 keeps a*x + b inside uint64.
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(seed=20240101)  # fixed: signatures must be stable across restarts
+_PERM_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Word n-gram shingles of the lowercased text, hashed to 32 bits."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of the text's shingle set."""
+    values = np.fromiter(shingles(text), dtype=np.uint64)
+    if values.size == 0:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    hashed = (_PERM_A[:, None] * values[None, :] + _PERM_B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def band_keys(signature: np.ndarray) -> list:
+    """One 63-bit bucket key per band."""
+    keys = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "big") >> 1)
+    return keys
+
+
+class MinHashLSHIndex:
+    """
+    LSH index stored in SQLite next to the exact-hash table.
+    `signature_table` holds (file_hash, signature); `bucket_table` holds (band, bucket, file_hash).
+    """
+
+    def __init__(self, engine, signature_table, bucket_table, threshold: float = SIMILARITY_THRESHOLD):
+        self.engine = engine
+        self.signatures = signature_table
+        self.buckets = bucket_table
+        self.threshold = threshold
+
+    def add(self, file_hash: str, signature: np.ndarray):
+        keys = band_keys(signature)
+        with self.engine.begin() as conn:
+            conn.execute(
+                sqlite_insert(self.signatures)
+                .values(file_hash=file_hash, signature=signature.tobytes())
+                .on_conflict_do_nothing(index_elements=["file_hash"])
+            )
+            conn.execute(
+                sqlite_insert(self.buckets).on_conflict_do_nothing(),
+                [{"band": band, "bucket": key, "file_hash": file_hash} for band, key in enumerate(keys)],
+            )
+
+    def query(self, signature: np.ndarray, exclude: str = None, limit: int = 10) -> list:
+        """
+        Returns [(file_hash, estimated_jaccard)] for stored resumes at or above the
+        threshold, most similar first. Only bucket-mates are ever compared.
+        """
+        keys = band_keys(signature)
+        with self.engine.connect() as conn:
+            candidates = set(conn.execute(
+                select(self.buckets.c.file_hash).where(
+                    tuple_(self.buckets.c.band, self.buckets.c.bucket).in_(list(enumerate(keys)))
+                )
+            ).scalars())
+            candidates.discard(exclude)
+            if not candidates:
+                return []
+            rows = conn.execute(
+                select(self.signatures.c.file_hash, self.signatures.c.signature)
+                .where(self.signatures.c.file_hash.in_(list(candidates)))
+            ).all()
+
+        matches = []
+        for file_hash, raw in rows:
+            score = estimate_jaccard(signature, np.frombuffer(raw, dtype=np.uint32))
+            if score >= self.threshold:
+                matches.append((file_hash, round(score, 3)))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches[:limit]
@@ -0,0 +1,117 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+# Content-addressed cache for LLM parse results.
+# Key = SHA-256 of the uploaded file bytes + the parse version (prompt + model),
+# so a prompt or model change automatically misses instead of serving stale parses.
+
+PARSE_CACHE_PATH = os.environ.get("PARSE_CACHE_PATH", "./parse_cache.db")
+PARSE_CACHE_TTL = float(os.environ.get("PARSE_CACHE_TTL", str(30 * 24 * 3600)))  # 30 days
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", "20000"))
+PARSE_CACHE_MEMORY_ENTRIES = int(os.environ.get("PARSE_CACHE_MEMORY_ENTRIES", "512"))
+# Size/TTL eviction runs every N writes rather than on every insert
+EVICT_EVERY = 64
+
+
+class ParseCache:
+    """
+    Two-tier parse cache: an in-memory LRU in front of a persistent SQLite table.
+    Values are stored as JSON text, so every hit returns a fresh dict the caller may mutate.
+    """
+
+    def __init__(self, path: str = PARSE_CACHE_PATH, ttl: float = PARSE_CACHE_TTL,
+                 max_entries: int = PARSE_CACHE_MAX_ENTRIES,
+                 memory_entries: int = PARSE_CACHE_MEMORY_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory = TTLCache(maxsize=memory_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_parse_cache_last_access ON parse_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(file_hash: str, version: str) -> str:
+        return f"{file_hash}:{version}"
+
+    def get(self, key: str):
+        raw = self.memory.get(key)
+        if raw is None:
+            raw = self._get_persistent(key)
+            if raw is None:
+                return None
+            self.memory.set(key, raw)
+        return json.loads(raw)
+
+    def set(self, key: str, data: dict):
+        raw = json.dumps(data)
+        self.memory.set(key, raw)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO parse_cache (key, data, created_at, last_access) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data, "
+                "created_at = excluded.created_at, last_access = excluded.last_access",
+                (key, raw, now, now),
+            )
+            self._conn.commit()
+            self._writes += 1
+            evict_now = self._writes % EVICT_EVERY == 0
+        if evict_now:
+            self.evict()
+
+    def _get_persistent(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, created_at = row
+            if created_at + self.ttl < now:
+                self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE parse_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return data
+
+    def evict(self):
+        """Drops expired rows, then the least recently used rows above max_entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM parse_cache WHERE key IN ("
+                "SELECT key FROM parse_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+
+_parse_cache = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
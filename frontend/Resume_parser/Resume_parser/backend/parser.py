@@ -1,32 +1,112 @@
 import fitz  # PyMuPDF
 import docx
 import io
+import os
+from itertools import repeat
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extracts text from a PDF file stream."""
+# Extraction limits: a huge "portfolio" PDF must not tie up a worker.
+MAX_PDF_PAGES = int(os.environ.get("MAX_PDF_PAGES", "50"))
+MAX_TEXT_CHARS = int(os.environ.get("MAX_TEXT_CHARS", "200000"))
+# PDFs with at least this many pages are split into page ranges across worker processes
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("PARALLEL_PAGE_THRESHOLD", "24"))
+PAGES_PER_CHUNK = int(os.environ.get("PAGES_PER_CHUNK", "8"))
+# PDF pages are joined with a form feed so later stages can still tell where a page
+# starts and ends (running headers/footers are detected per page before the LLM call).
+PAGE_BREAK = "\f"
+
+# Every extractor accepts either the raw file bytes or a path to a spooled upload.
+# Paths are preferred: they avoid holding (and pickling to worker processes) the whole file.
+
+def _open_pdf(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source, filetype="pdf")
+
+def _open_docx(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return docx.Document(io.BytesIO(source))
+    return docx.Document(source)
+
+def iter_pdf_pages(source, start: int = 0, stop: int = None):
+    """
+    Yields the text of each page in [start, stop), capped at MAX_PDF_PAGES.
+    The document is closed once the generator finishes or is closed.
+    """
+    with _open_pdf(source) as doc:
+        stop = min(len(doc), MAX_PDF_PAGES) if stop is None else min(stop, len(doc), MAX_PDF_PAGES)
+        for page_number in range(start, stop):
+            yield doc[page_number].get_text()
+
+def join_page_texts(page_texts, max_chars: int = None, separator: str = "\n") -> str:
+    """
+    Joins page texts with `separator`, consuming the iterable lazily and stopping
+    as soon as max_chars (default MAX_TEXT_CHARS) is reached. The result is not stripped,
+    so partial results from page ranges can be joined again without losing separators.
+    """
+    if max_chars is None:
+        max_chars = MAX_TEXT_CHARS
+    parts = []
+    total = 0
+    for page_text in page_texts:
+        parts.append(page_text)
+        total += len(page_text) + len(separator)
+        if total >= max_chars:
+            break
+    return separator.join(parts)[:max_chars]
+
+def pdf_page_count(source) -> int:
+    """Returns the number of pages that will be extracted (after the page cap)."""
+    with _open_pdf(source) as doc:
+        return min(len(doc), MAX_PDF_PAGES)
+
+def pdf_page_ranges(page_count: int) -> list:
+    """
+    Splits [0, page_count) into (start, stop) ranges for parallel extraction.
+    Small documents get a single range.
+    """
+    page_count = min(page_count, MAX_PDF_PAGES)
+    if page_count < PARALLEL_PAGE_THRESHOLD:
+        return [(0, page_count)]
+    return [(start, min(start + PAGES_PER_CHUNK, page_count))
+            for start in range(0, page_count, PAGES_PER_CHUNK)]
+
+def extract_pdf_page_range(source, start: int, stop: int) -> str:
+    """Extracts one page range. Runs inside a worker process for large documents."""
+    try:
+        return join_page_texts(iter_pdf_pages(source, start, stop), separator=PAGE_BREAK)
+    except Exception as e:
+        raise ValueError(f"Error parsing PDF: {str(e)}")
+
+def extract_text_from_pdf(source, executor=None) -> str:
+    """
+    Extracts text from a PDF file (bytes or path).
+    If an executor is given and the document is large, page ranges are extracted in parallel on it.
+    """
     try:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text() + "\n"
-        return text.strip()
+        ranges = pdf_page_ranges(pdf_page_count(source))
+        if executor is not None and len(ranges) > 1:
+            starts, stops = zip(*ranges)
+            chunks = executor.map(extract_pdf_page_range, repeat(source), starts, stops)
+            return join_page_texts(chunks, separator=PAGE_BREAK).strip()
+        return join_page_texts(iter_pdf_pages(source), separator=PAGE_BREAK).strip()
+    except ValueError:
+        raise
     except Exception as e:
         raise ValueError(f"Error parsing PDF: {str(e)}")
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
-    """Extracts text from a DOCX file stream."""
+def extract_text_from_docx(source) -> str:
+    """Extracts text from a DOCX file (bytes or path)."""
     try:
-        doc = docx.Document(io.BytesIO(file_bytes))
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text.strip()
+        doc = _open_docx(source)
+        return join_page_texts(para.text for para in doc.paragraphs).strip()
     except Exception as e:
         raise ValueError(f"Error parsing DOCX: {str(e)}")
 
-def extract_text(file_bytes: bytes, filename: str) -> str:
+def extract_text(source, filename: str) -> str:
     """Determines file type and extracts text accordingly."""
     if filename.lower().endswith(".pdf"):
-        return extract_text_from_pdf(file_bytes)
+        return extract_text_from_pdf(source)
     elif filename.lower().endswith(".docx"):
-        return extract_text_from_docx(file_bytes)
+        return extract_text_from_docx(source)
     else:
         raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
@@ -0,0 +1,78 @@
+import json
+
+
+class IncrementalObjectParser:
+    """
+    Incrementally parses a streamed JSON object and reports each top-level
+    member as soon as its value is complete, e.g. "personal_info" is available
+    long before the model has finished generating "projects".
+
+        parser = IncrementalObjectParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_is_key = False
+        self.expecting_key = False
+        self.key_start = None
+        self.key = None
+        self.value_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list:
+        """Consumes a chunk of text and returns the (key, value) pairs completed by it."""
+        self.text += chunk
+        completed = []
+        text = self.text
+        while self.pos < len(text) and not self.done:
+            ch = text[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.string_is_key:
+                        self.key = json.loads(text[self.key_start:self.pos + 1])
+            elif ch == '"':
+                self.in_string = True
+                self.string_is_key = self.depth == 1 and self.expecting_key
+                if self.string_is_key:
+                    self.key_start = self.pos
+            elif ch in "{[":
+                self.depth += 1
+                if self.depth == 1:
+                    self.expecting_key = True
+            elif ch in "}]":
+                if self.depth == 1:
+                    self._complete(text, completed)
+                    self.done = True
+                self.depth -= 1
+            elif self.depth == 1 and ch == ":":
+                self.value_start = self.pos + 1
+                self.expecting_key = False
+            elif self.depth == 1 and ch == ",":
+                self._complete(text, completed)
+                self.expecting_key = True
+            self.pos += 1
+        return completed
+
+    def _complete(self, text: str, completed: list):
+        if self.key is None or self.value_start is None:
+            return
+        raw = text[self.value_start:self.pos].strip()
+        try:
+            completed.append((self.key, json.loads(raw)))
+        except json.JSONDecodeError:
+            # Leave malformed members to the final, whole-document parse
+            pass
+        self.key = None
+        self.value_start = None
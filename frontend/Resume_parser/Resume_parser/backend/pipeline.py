@@ -0,0 +1,291 @@
+import asyncio
+import os
+
+from parser import extract_text, extract_pdf_page_range, join_page_texts, pdf_page_count, pdf_page_ranges, PAGE_BREAK
+from llm_service import parse_resume_with_groq_async, stream_resume_with_groq, PARSE_VERSION
+from parse_cache import get_parse_cache, ParseCache
+from rule_parser import parse_resume_locally, compare_parses, LOCAL_PARSE_CONFIDENCE
+from firebase_service import save_user_profile, upload_file_to_storage
+from executors import run_cpu_bound, run_blocking
+from uploads import SpooledUpload
+from metrics import timed, record_cache, FILE_SIZE_BYTES, PAGE_COUNT
+
+# How resumes are parsed:
+#   llm     - always Groq (default)
+#   auto    - local rule-based parser, Groq only when its confidence is below the threshold.
+#             Opt-in until /parse/compare agreement data shows the local parser is good enough.
+#   compare - run both, log field-level agreement, keep the Groq result
+PARSE_MODE = os.environ.get("PARSE_MODE", "llm")
+LOCAL_CONFIDENCE_THRESHOLD = float(os.environ.get("LOCAL_PARSE_CONFIDENCE", str(LOCAL_PARSE_CONFIDENCE)))
+
+
+class EmptyResumeError(ValueError):
+    """Raised when no text could be extracted from the uploaded file."""
+
+
+async def process_resume(upload: SpooledUpload, user_id: str) -> dict:
+    """
+    Runs the full resume pipeline without blocking the event loop:
+    [storage upload || (parse cache | extract -> Groq parse)] -> Firestore save.
+    Every stage reads the spooled file from disk; the file bytes are never held in memory.
+    Returns the parsed data, including the resume URL when the upload succeeded.
+    """
+    filename = upload.filename
+    FILE_SIZE_BYTES.observe(upload.size)
+    # 1. Upload to Firebase Storage in the background.
+    # Nothing downstream depends on it until the save, so it overlaps the parse.
+    print(f"Uploading {filename} to Firebase Storage...")
+    upload_task = asyncio.create_task(upload_to_storage(upload))
+    try:
+        parsed_data = await parse_resume_content(upload)
+    except BaseException:
+        upload_task.cancel()
+        raise
+    resume_url = await upload_task
+
+    # Add resume URL to data
+    if resume_url:
+        parsed_data["resume_url"] = resume_url
+
+    # 4. Save to Firestore (Preserving User Edits)
+    print(f"Saving data for user: {user_id}...")
+    with timed("firestore_save"):
+        await run_blocking(save_user_profile, user_id, parsed_data)
+
+    return parsed_data
+
+
+async def upload_to_storage(upload: SpooledUpload):
+    with timed("storage_upload"):
+        return await run_blocking(upload_file_to_storage, upload.path, upload.filename, upload.content_type)
+
+
+async def parse_resume_content(upload: SpooledUpload) -> dict:
+    """
+    Returns the structured parse of a resume file, serving repeated uploads of the
+    same bytes from the parse cache instead of calling Groq again.
+    """
+    filename = upload.filename
+    cache = get_parse_cache()
+    cache_key = ParseCache.make_key(upload.sha256, PARSE_VERSION)
+
+    with timed("parse_cache"):
+        cached = await run_blocking(cache.get, cache_key)
+    record_cache("parse", cached is not None)
+    if cached is not None:
+        print(f"Parse cache hit for {filename}")
+        return cached
+
+    # 2. Extract Text (Local, No LLM) - CPU bound, runs in the process pool
+    print(f"Extracting text from {filename}...")
+    text = await extract_text_async(upload.path, filename)
+
+    if not text:
+        raise EmptyResumeError("Could not extract text from file.")
+
+    # 3. Parse: local fast path first, Groq (One Call) when it is not confident enough
+    if PARSE_MODE in ("auto", "compare"):
+        with timed("local_parse"):
+            local = await run_cpu_bound(parse_resume_locally, text)
+        print(f"Local parse confidence for {filename}: {local.confidence}")
+        if PARSE_MODE == "auto" and local.confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+            # Local parses are cheap to redo, so they are not cached
+            return local.data
+
+    print("Parsing text with Groq...")
+    with timed("llm"):
+        parsed_data = await parse_resume_with_groq_async(text)
+
+    if PARSE_MODE == "compare":
+        agreement = compare_parses(local.data, parsed_data)
+        print(f"Local vs Groq agreement for {filename}: {agreement}")
+
+    await run_blocking(cache.set, cache_key, parsed_data)
+    return parsed_data
+
+
+async def stream_resume_events(upload: SpooledUpload, user_id: str):
+    """
+    Streaming variant of process_resume. Yields (event, data) pairs as work completes:
+      ("stage", {"stage": "extracted" | "uploaded" | "parsing" | "saved", ...})
+      ("field", {"field": <top-level schema key>, "value": ...}) as soon as each is parsed
+      ("result", <full parsed data>)
+    Upload and parse run concurrently; events from both are merged in completion order.
+    """
+    filename = upload.filename
+    FILE_SIZE_BYTES.observe(upload.size)
+    events = asyncio.Queue()
+    finished = object()  # sentinel event: (finished, exception or None)
+
+    async def run_upload():
+        resume_url = await upload_to_storage(upload)
+        await events.put(("stage", {"stage": "uploaded", "resume_url": resume_url}))
+        return resume_url
+
+    async def run_parse():
+        cache = get_parse_cache()
+        cache_key = ParseCache.make_key(upload.sha256, PARSE_VERSION)
+        with timed("parse_cache"):
+            cached = await run_blocking(cache.get, cache_key)
+        record_cache("parse", cached is not None)
+        if cached is not None:
+            await events.put(("stage", {"stage": "parsing", "source": "cache"}))
+            for key, value in cached.items():
+                await events.put(("field", {"field": key, "value": value}))
+            return cached
+
+        text = await extract_text_async(upload.path, filename)
+        if not text:
+            raise EmptyResumeError("Could not extract text from file.")
+        await events.put(("stage", {"stage": "extracted", "characters": len(text)}))
+
+        # Same PARSE_MODE handling as parse_resume_content
+        if PARSE_MODE in ("auto", "compare"):
+            with timed("local_parse"):
+                local = await run_cpu_bound(parse_resume_locally, text)
+            print(f"Local parse confidence for {filename}: {local.confidence}")
+            if PARSE_MODE == "auto" and local.confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+                await events.put(("stage", {"stage": "parsing", "source": "local"}))
+                for key, value in local.data.items():
+                    await events.put(("field", {"field": key, "value": value}))
+                return local.data
+
+        await events.put(("stage", {"stage": "parsing", "source": "llm"}))
+        with timed("llm"):
+            async for item in stream_resume_with_groq(text):
+                if item[0] == "field":
+                    await events.put(("field", {"field": item[1], "value": item[2]}))
+                else:
+                    parsed_data = item[1]
+
+        if PARSE_MODE == "compare":
+            agreement = compare_parses(local.data, parsed_data)
+            print(f"Local vs Groq agreement for {filename}: {agreement}")
+
+        await run_blocking(cache.set, cache_key, parsed_data)
+        return parsed_data
+
+    async def run_and_signal(coro):
+        try:
+            result = await coro
+        except Exception as e:
+            # Reported through the queue; the consumer re-raises it
+            await events.put((finished, e))
+            return None
+        await events.put((finished, None))
+        return result
+
+    upload_task = asyncio.create_task(run_and_signal(run_upload()))
+    parse_task = asyncio.create_task(run_and_signal(run_parse()))
+    try:
+        pending = 2
+        while pending:
+            item = await events.get()
+            if item[0] is finished:
+                pending -= 1
+                # Surface a failure right away instead of waiting for the other task
+                if item[1] is not None:
+                    raise item[1]
+                continue
+            yield item
+
+        parsed_data = await parse_task
+        resume_url = await upload_task
+        if resume_url:
+            parsed_data["resume_url"] = resume_url
+
+        with timed("firestore_save"):
+            await run_blocking(save_user_profile, user_id, parsed_data)
+        yield ("stage", {"stage": "saved"})
+        yield ("result", parsed_data)
+    finally:
+        upload_task.cancel()
+        parse_task.cancel()
+
+
+async def compare_parse_paths(upload: SpooledUpload) -> dict:
+    """
+    Runs the local and Groq parsers on the same file and reports field-level agreement.
+    Nothing is cached or saved.
+    """
+    text = await extract_text_async(upload.path, upload.filename)
+    if not text:
+        raise EmptyResumeError("Could not extract text from file.")
+
+    local, llm_data = await asyncio.gather(
+        run_cpu_bound(parse_resume_locally, text),
+        parse_resume_with_groq_async(text),
+    )
+    return {
+        "local": local.data,
+        "llm": llm_data,
+        "local_confidence": local.confidence,
+        "local_checks": local.checks,
+        "agreement": compare_parses(local.data, llm_data),
+    }
+
+
+async def extract_text_async(source, filename: str) -> str:
+    """
+    Extracts text in the process pool. Large PDFs are split into page ranges
+    that are extracted on several worker processes at once.
+    """
+    with timed("extract"):
+        if filename.lower().endswith(".pdf"):
+            try:
+                pages = await run_blocking(pdf_page_count, source)
+            except Exception as e:
+                raise ValueError(f"Error parsing PDF: {str(e)}")
+            PAGE_COUNT.observe(pages)
+            ranges = pdf_page_ranges(pages)
+            if len(ranges) > 1:
+                chunks = await asyncio.gather(*(
+                    run_cpu_bound(extract_pdf_page_range, source, start, stop)
+                    for start, stop in ranges
+                ))
+                return join_page_texts(chunks, separator=PAGE_BREAK).strip()
+        return await run_cpu_bound(extract_text, source, filename)
+
+
+async def process_batch(items, concurrency: int):
+    """
+    Runs many resumes through process_resume with at most `concurrency` in flight.
+    `items` is a list of dicts with a SpooledUpload under "upload", a "user_id" and
+    optionally the "name" the file is reported under (defaults to its filename).
+    Items that already failed while spooling carry "error" and no upload.
+    Yields one result dict per file in completion order; spooled files are removed
+    as soon as their file is done.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(item):
+        upload = item["upload"]
+        if upload is None:
+            return {"filename": item["name"], "user_id": item.get("user_id"), "status": "error", "error": item["error"]}
+        result = {"filename": item.get("name", upload.filename), "user_id": item.get("user_id")}
+        try:
+            if not item.get("user_id"):
+                result.update(status="error", error="No user_id mapped for this file.")
+                return result
+            async with semaphore:
+                try:
+                    data = await process_resume(upload, item["user_id"])
+                    result.update(status="success", data=data)
+                except Exception as e:
+                    print(f"Error processing {upload.filename} in batch: {str(e)}")
+                    result.update(status="error", error=str(e))
+            return result
+        finally:
+            upload.cleanup()
+
+    tasks = [asyncio.create_task(run_one(item)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream: stop the remaining work
+        for task in tasks:
+            task.cancel()
+        for item in items:
+            if item["upload"] is not None:
+                item["upload"].cleanup()
@@ -0,0 +1,165 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from parser import PAGE_BREAK
+from skill_canonicalizer import canonicalize_skills
+
+# Local clean-up of extracted resume text before it is sent to the LLM.
+# Everything here is deterministic and cheap; the goal is to send fewer input tokens.
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+URL_RE = re.compile(
+    r"(?:https?://|www\.)[^\s<>()\"']+"
+    r"|(?:linkedin\.com|github\.com|gitlab\.com|leetcode\.com|behance\.net)/[^\s<>()\"']+",
+    re.IGNORECASE,
+)
+# Optional country code and "(0)" trunk prefix ("+44 (0)20 7946 0958"), area code, number
+PHONE_RE = re.compile(r"(?<![\w/])(?:\+?\d{1,3}[\s.-]?)?(?:\(0\)\s?)?(?:\(?\d{2,5}\)?[\s.-]?)?\d{3,5}[\s.-]?\d{4,5}(?![\w/])")
+# Lines that may carry the phone number: the resume header, or a line labelled as contact details
+CONTACT_LABEL_RE = re.compile(r"\b(?:phone|mobile|mob|tel|telephone|cell|contact|whatsapp)\b", re.IGNORECASE)
+PAGE_MARKER_RE = re.compile(r"^(?:page\s*)?\d{1,3}\s*(?:(?:of|/)\s*\d{1,3})?$|^-\s*\d{1,3}\s*-$", re.IGNORECASE)
+# Separators left behind once contact details are pulled out of a line, e.g. "a@b.com | +91 ..."
+SEPARATOR_RUN_RE = re.compile(r"(?:\s*[|•·,;]\s*){2,}")
+CONTACT_LEFTOVER_RE = re.compile(r"^[\s|•·,;:/\\-]*(?:(?:email|e-mail|phone|mobile|tel|linkedin|github|portfolio)[\s:]*[\s|•·,;/\\-]*)*$", re.IGNORECASE)
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# A line among the first/last BOILERPLATE_EDGE_LINES lines of at least
+# BOILERPLATE_MIN_PAGES pages is treated as a running header/footer
+BOILERPLATE_EDGE_LINES = 2
+BOILERPLATE_MIN_PAGES = 2
+BOILERPLATE_MIN_LENGTH = 12
+# The first CONTACT_HEADER_LINES non-empty lines of the first page form the contact header
+CONTACT_HEADER_LINES = 8
+
+
+@dataclass
+class PreparedResume:
+    text: str
+    email: str = None
+    phone: str = None
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap, tokenizer-free estimate of LLM input tokens (words + punctuation, adjusted
+    for sub-word splits). Good enough to compare before/after sizes.
+    """
+    return int(len(TOKEN_RE.findall(text)) * 1.3)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapses runs of spaces/tabs, trims lines and squeezes blank-line runs."""
+    text = text.replace("\u00a0", " ").replace("\u200b", "")
+    lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.splitlines()]
+    squeezed = []
+    for line in lines:
+        if not line and (not squeezed or not squeezed[-1]):
+            continue
+        squeezed.append(line)
+    return "\n".join(squeezed).strip()
+
+
+def _edge_indexes(page: list) -> set:
+    """Indexes of the first and last BOILERPLATE_EDGE_LINES non-empty lines of a page."""
+    filled = [i for i, line in enumerate(page) if line]
+    return set(filled[:BOILERPLATE_EDGE_LINES] + filled[-BOILERPLATE_EDGE_LINES:])
+
+
+def remove_boilerplate(pages: list) -> list:
+    """
+    Drops page markers ("Page 2 of 3") and running headers/footers, i.e. long lines
+    at the top or bottom of several pages. Only page edges are considered, so a line
+    repeated in the body (the same tech stack under several projects) is kept.
+    The first occurrence of a header/footer is kept. `pages` is a list of line lists;
+    returns the remaining lines of all pages.
+    """
+    edges = [_edge_indexes(page) for page in pages]
+    counts = Counter()
+    for page, edge in zip(pages, edges):
+        counts.update({page[i].lower() for i in edge if len(page[i]) >= BOILERPLATE_MIN_LENGTH})
+
+    seen = set()
+    kept = []
+    for page, edge in zip(pages, edges):
+        for i, line in enumerate(page):
+            if i in edge:
+                if PAGE_MARKER_RE.match(line):
+                    continue
+                key = line.lower()
+                if counts.get(key, 0) >= BOILERPLATE_MIN_PAGES:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+            kept.append(line)
+    return kept
+
+
+def _is_contact_line(page_index: int, line_index: int, line: str) -> bool:
+    return (page_index == 0 and line_index < CONTACT_HEADER_LINES) or bool(CONTACT_LABEL_RE.search(line))
+
+
+def _find_phone(line: str) -> str:
+    # Emails and URLs are masked first: phone numbers must not be matched inside them
+    masked = URL_RE.sub(" ", EMAIL_RE.sub(" ", line))
+    for phone in PHONE_RE.findall(masked):
+        if len(re.sub(r"\D", "", phone)) >= 10:
+            return phone.strip()
+    return None
+
+
+def prepare_resume_text(text: str, system_prompt: str = "") -> PreparedResume:
+    """
+    Normalizes whitespace, removes repeated headers/footers and pulls out the
+    deterministic contact fields (email, phone) so the LLM only gets the text it
+    still needs to interpret. Only the values merge_extracted_fields fills back in
+    are removed: the first email, and the first phone number of the contact header
+    or of a line labelled as contact details. Other numbers (metrics, IDs) and URLs
+    stay in the text. Token estimates include the system prompt.
+    """
+    prepared = PreparedResume(text="")
+    pages = [[line for line in normalize_whitespace(page).splitlines() if line]
+             for page in text.split(PAGE_BREAK)]
+
+    emails = EMAIL_RE.findall(text)
+    prepared.email = emails[0] if emails else None
+    for page_index, page in enumerate(pages):
+        for line_index, line in enumerate(page):
+            if prepared.phone is None and _is_contact_line(page_index, line_index, line):
+                prepared.phone = _find_phone(line)
+
+    # Strip the extracted values out of the text sent to the LLM
+    for page_index, page in enumerate(pages):
+        for line_index, line in enumerate(page):
+            stripped = line.replace(prepared.email, " ") if prepared.email else line
+            if prepared.phone and _is_contact_line(page_index, line_index, line):
+                stripped = stripped.replace(prepared.phone, " ")
+            if stripped != line:
+                stripped = SEPARATOR_RUN_RE.sub(" | ", " ".join(stripped.split()))
+                page[line_index] = stripped.strip(" |•·,;")
+
+    lines = [line for line in remove_boilerplate(pages)
+             if line and not CONTACT_LEFTOVER_RE.match(line)]
+    prepared.text = "\n".join(lines)
+
+    prepared.tokens_before = estimate_tokens(system_prompt) + estimate_tokens(text)
+    prepared.tokens_after = estimate_tokens(system_prompt) + estimate_tokens(prepared.text)
+    return prepared
+
+
+def merge_extracted_fields(parsed_data: dict, prepared: PreparedResume) -> dict:
+    """
+    Fills the contact fields that were removed from the prompt back into the LLM output
+    (unless the LLM found a value itself) and maps skill aliases to their canonical names.
+    """
+    personal_info = parsed_data.get("personal_info") or {}
+    if prepared.email and not personal_info.get("email"):
+        personal_info["email"] = prepared.email
+    if prepared.phone and not personal_info.get("phone"):
+        personal_info["phone"] = prepared.phone
+    parsed_data["personal_info"] = personal_info
+    if isinstance(parsed_data.get("skills"), dict):
+        parsed_data["skills"] = canonicalize_skills(parsed_data["skills"])
+    return parsed_data
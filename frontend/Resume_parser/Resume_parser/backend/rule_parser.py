@@ -0,0 +1,269 @@
+import re
+from dataclasses import dataclass, field
+
+from prompt_preprocessor import EMAIL_RE, PHONE_RE, URL_RE, normalize_whitespace
+from skill_canonicalizer import canonicalize_skills
+
+# Local, rule-based resume parser.
+# Segments extracted text on common section headings and fills the same shape as
+# RESUME_SCHEMA. Template resumes parse in milliseconds with no network call; the
+# confidence score tells the caller when to fall back to the LLM.
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "about me", "objective", "career objective"],
+    "skills": ["skills", "technical skills", "tech stack", "core competencies", "skills & tools",
+               "skills and tools", "key skills", "technologies"],
+    "education": ["education", "academic background", "academics", "qualifications",
+                  "educational qualifications"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "internships", "internship", "work history"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": ["certifications", "certificates", "courses", "licenses & certifications"],
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+SKILL_CATEGORY_HINTS = {
+    "soft": ["soft", "interpersonal"],
+    "tools_frameworks": ["tool", "framework", "librar", "platform", "devops", "cloud", "database"],
+}
+
+BULLET_RE = re.compile(r"^[•▪●◦*\-–]\s*")
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+DATE_RANGE_RE = re.compile(
+    r"((?:[A-Za-z]{3,9}\.?\s+)?(?:19|20)\d{2}(?:-\d{2})?\s*(?:-|–|to)\s*"
+    r"(?:(?:[A-Za-z]{3,9}\.?\s+)?(?:19|20)\d{2}(?:-\d{2})?|present|current|now))",
+    re.IGNORECASE,
+)
+DEGREE_RE = re.compile(
+    r"\b(B\.?\s?Tech|M\.?\s?Tech|B\.?E\b|M\.?E\b|B\.?Sc|M\.?Sc|B\.?S\b|M\.?S\b|BCA|MCA|MBA|Ph\.?D|"
+    r"Bachelor(?:'s)?|Master(?:'s)?|Diploma|HSC|SSC|Class\s+(?:X|XII|10|12))[^,|\n]*",
+    re.IGNORECASE,
+)
+INSTITUTION_RE = re.compile(r"[^,|\n]*\b(University|Institute|College|School|Academy|IIT|NIT|IIIT)\b[^,|\n]*",
+                            re.IGNORECASE)
+TECH_STACK_RE = re.compile(r"(?:tech(?:nologies|\s*stack)?|tools|built with|stack)\s*[:\-]\s*(.+)", re.IGNORECASE)
+LIST_SPLIT_RE = re.compile(r"\s*[,|;•/]\s*")
+ENTRY_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*[|–]\s*|\s+-\s+|,\s*")
+
+LOCAL_PARSE_CONFIDENCE = 0.8
+
+
+@dataclass
+class LocalParse:
+    data: dict
+    confidence: float
+    checks: dict = field(default_factory=dict)
+
+
+def _empty_resume() -> dict:
+    return {
+        "personal_info": {"full_name": "", "email": "", "phone": "", "location": ""},
+        "professional_summary": "",
+        "skills": {"technical": [], "soft": [], "tools_frameworks": []},
+        "education": [],
+        "experience": [],
+        "projects": [],
+        "certifications": [],
+    }
+
+
+def _heading(line: str):
+    """Returns the section a heading line introduces, or None."""
+    key = line.strip().strip(":").strip().lower()
+    if len(key) > 40:
+        return None
+    return _HEADING_LOOKUP.get(key)
+
+
+def segment_sections(lines: list) -> dict:
+    """Splits lines into {section: [lines]}; lines before the first heading go to 'header'."""
+    sections = {"header": []}
+    current = "header"
+    for line in lines:
+        section = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _split_entries(lines: list) -> list:
+    """Groups lines into entries: a non-bullet line starts an entry, bullets belong to it."""
+    entries = []
+    for line in lines:
+        if BULLET_RE.match(line) and entries:
+            entries[-1]["bullets"].append(BULLET_RE.sub("", line))
+        else:
+            entries.append({"header": BULLET_RE.sub("", line), "bullets": []})
+    return entries
+
+
+def _parse_skills(lines: list) -> dict:
+    skills = {"technical": [], "soft": [], "tools_frameworks": []}
+    for line in lines:
+        line = BULLET_RE.sub("", line)
+        category = "technical"
+        if ":" in line:
+            label, line = line.split(":", 1)
+            label = label.lower()
+            for name, hints in SKILL_CATEGORY_HINTS.items():
+                if any(hint in label for hint in hints):
+                    category = name
+                    break
+        for skill in LIST_SPLIT_RE.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 40 and skill not in skills[category]:
+                skills[category].append(skill)
+    return skills
+
+
+def _parse_education(lines: list) -> list:
+    education = []
+    for entry in _split_entries(lines):
+        text = " ".join([entry["header"]] + entry["bullets"])
+        degree = DEGREE_RE.search(text)
+        institution = INSTITUTION_RE.search(text)
+        if not degree and not institution:
+            # Continuation line (e.g. a grade) of the previous entry
+            continue
+        field_of_study = ""
+        if degree and " in " in degree.group(0):
+            field_of_study = degree.group(0).split(" in ", 1)[1].strip()
+        years = YEAR_RE.findall(text)
+        education.append({
+            "degree": degree.group(0).strip() if degree else "",
+            "field_of_study": field_of_study,
+            "institution": institution.group(0).strip() if institution else "",
+            "year": years[-1] if years else "",
+        })
+    return education
+
+
+def _parse_experience(lines: list) -> list:
+    experience = []
+    for entry in _split_entries(lines):
+        header = entry["header"]
+        duration = DATE_RANGE_RE.search(header)
+        if duration:
+            header = header.replace(duration.group(1), " ")
+        parts = [p.strip() for p in ENTRY_SPLIT_RE.split(header) if p and p.strip(" ,()")]
+        if not parts:
+            continue
+        experience.append({
+            "role": parts[0],
+            "company": parts[1] if len(parts) > 1 else "",
+            "duration": duration.group(1).strip() if duration else "",
+            "responsibilities": entry["bullets"],
+        })
+    return experience
+
+
+def _parse_projects(lines: list) -> list:
+    projects = []
+    for entry in _split_entries(lines):
+        header = entry["header"]
+        tech_stack = []
+        summary_lines = []
+        for index, line in enumerate([header] + entry["bullets"]):
+            match = TECH_STACK_RE.search(line)
+            if match:
+                tech_stack.extend(s.strip(" .") for s in LIST_SPLIT_RE.split(match.group(1)) if s.strip(" ."))
+                line = line[:match.start()].strip(" |-–:")
+            # The header line is the title, not part of the summary
+            if line and index > 0:
+                summary_lines.append(line)
+        title = re.split(r"\s*[|–:]\s*|\s+-\s+", header, maxsplit=1)[0].strip()
+        title = TECH_STACK_RE.sub("", title).strip(" |-–:")
+        # Drop a trailing "(2022)" style year from the title
+        title = re.sub(r"\s*\((?:19|20)\d{2}\)$", "", title)
+        if not title:
+            continue
+        projects.append({"title": title, "summary": " ".join(summary_lines), "tech_stack": tech_stack})
+    return projects
+
+
+def _parse_header(lines: list, text: str) -> dict:
+    personal_info = {"full_name": "", "email": "", "phone": "", "location": ""}
+    emails = EMAIL_RE.findall(text)
+    phones = [p.strip() for p in PHONE_RE.findall(URL_RE.sub(" ", EMAIL_RE.sub(" ", text)))
+              if len(re.sub(r"\D", "", p)) >= 10]
+    personal_info["email"] = emails[0] if emails else ""
+    personal_info["phone"] = phones[0] if phones else ""
+    for line in lines:
+        if EMAIL_RE.search(line) or URL_RE.search(line) or any(ch.isdigit() for ch in line):
+            continue
+        words = line.split()
+        if 1 < len(words) <= 4 and all(w[:1].isalpha() for w in words):
+            personal_info["full_name"] = line.title() if line.isupper() else line
+            break
+    return personal_info
+
+
+def parse_resume_locally(text: str) -> LocalParse:
+    """
+    Parses extracted resume text with section heuristics and scores how much of it
+    looks reliably parsed (0.0 - 1.0).
+    """
+    lines = [line for line in normalize_whitespace(text).splitlines() if line]
+    sections = segment_sections(lines)
+
+    data = _empty_resume()
+    data["personal_info"] = _parse_header(sections.get("header", []), text)
+    data["professional_summary"] = " ".join(sections.get("summary", []))
+    data["skills"] = canonicalize_skills(_parse_skills(sections.get("skills", [])))
+    data["education"] = _parse_education(sections.get("education", []))
+    data["experience"] = _parse_experience(sections.get("experience", []))
+    data["projects"] = _parse_projects(sections.get("projects", []))
+    data["certifications"] = [BULLET_RE.sub("", line) for line in sections.get("certifications", [])]
+
+    # Lines not covered by a recognised section mean the template is unfamiliar
+    body_lines = len(lines) - len(sections.get("header", []))
+    header_ratio = len(sections.get("header", [])) / max(len(lines), 1)
+    checks = {
+        "name": bool(data["personal_info"]["full_name"]),
+        "email": bool(data["personal_info"]["email"]),
+        "skills": sum(len(v) for v in data["skills"].values()) >= 3,
+        "education": any(e["institution"] and e["degree"] for e in data["education"]),
+        "experience_or_projects": bool(data["experience"] or data["projects"]),
+        "sections": len(sections) - 1 >= 3 and body_lines > 0,
+        "coverage": header_ratio <= 0.25,
+    }
+    confidence = sum(checks.values()) / len(checks)
+    return LocalParse(data=data, confidence=round(confidence, 3), checks=checks)
+
+
+def _norm(value) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def compare_parses(local: dict, llm: dict) -> dict:
+    """
+    Field-level agreement between a local parse and an LLM parse (1.0 = identical).
+    List sections are compared by Jaccard similarity of their identifying keys.
+    """
+    agreement = {}
+    local_info = local.get("personal_info") or {}
+    llm_info = llm.get("personal_info") or {}
+    for key in ("full_name", "email", "phone", "location"):
+        agreement[f"personal_info.{key}"] = float(_norm(local_info.get(key)) == _norm(llm_info.get(key)))
+
+    def all_skills(data):
+        return {_norm(s) for values in (data.get("skills") or {}).values() for s in values or []}
+
+    agreement["skills"] = _jaccard(all_skills(local), all_skills(llm))
+    section_keys = {"education": "institution", "experience": "company", "projects": "title"}
+    for section, key in section_keys.items():
+        agreement[section] = _jaccard(
+            {_norm(e.get(key)) for e in local.get(section) or []},
+            {_norm(e.get(key)) for e in llm.get(section) or []},
+        )
+    agreement["overall"] = round(sum(agreement.values()) / len(agreement), 3)
+    return agreement
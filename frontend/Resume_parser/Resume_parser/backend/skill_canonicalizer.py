@@ -0,0 +1,195 @@
+import re
+
+# Skill canonicalization shared by the parsers and the Firestore layer.
+# "Node.js", "NodeJS" and "node js" all map to "Node.js", so they end up in one
+# skills document with a stable ID. Aliases are compiled once into a lookup table
+# (exact matches) and a token trie (aliases inside longer entries, e.g. "HTML/CSS"
+# or "React.js and Redux").
+
+SKILL_ALIASES = {
+    # Languages
+    "JavaScript": ["js", "javascript", "java script", "ecmascript", "es6"],
+    "TypeScript": ["ts", "typescript"],
+    "Python": ["python", "python3", "py"],
+    "Java": ["java", "core java"],
+    "C": ["c", "c language"],
+    "C++": ["c++", "cpp", "c plus plus"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Go": ["go", "golang"],
+    "Rust": ["rust"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "PHP": ["php"],
+    "R": ["r", "r programming"],
+    "SQL": ["sql"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "Solidity": ["solidity"],
+    # Frameworks / libraries
+    "React": ["react", "reactjs", "react js"],
+    "React Native": ["react native"],
+    "Next.js": ["next", "nextjs", "next js"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express.js": ["express", "expressjs", "express js"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Angular": ["angular", "angularjs", "angular js"],
+    "Redux": ["redux"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "Bootstrap": ["bootstrap"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi", "fast api"],
+    "Spring Boot": ["spring boot", "springboot"],
+    "Flutter": ["flutter"],
+    "TensorFlow": ["tensorflow", "tensor flow", "tf"],
+    "PyTorch": ["pytorch", "torch"],
+    "scikit-learn": ["scikit learn", "scikit-learn", "sklearn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "OpenCV": ["opencv", "open cv"],
+    "LangChain": ["langchain"],
+    # Data / infra
+    "MongoDB": ["mongodb", "mongo", "mongo db"],
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "MySQL": ["mysql", "my sql"],
+    "Firebase": ["firebase"],
+    "Redis": ["redis"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "AWS": ["aws", "amazon web services"],
+    "Google Cloud": ["gcp", "google cloud", "google cloud platform"],
+    "Azure": ["azure", "microsoft azure"],
+    "Git": ["git"],
+    "GitHub": ["github", "git hub"],
+    "Linux": ["linux"],
+    "REST APIs": ["rest", "rest api", "rest apis", "restful", "restful api", "restful apis"],
+    "GraphQL": ["graphql"],
+    "Power BI": ["power bi", "powerbi"],
+    "Microsoft Excel": ["excel", "ms excel", "microsoft excel"],
+    "Figma": ["figma"],
+    # Concepts
+    "Machine Learning": ["ml", "machine learning"],
+    "Deep Learning": ["dl", "deep learning"],
+    "Artificial Intelligence": ["ai", "artificial intelligence"],
+    "Natural Language Processing": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "Generative AI": ["genai", "gen ai", "generative ai"],
+    "Large Language Models": ["llm", "llms", "large language models"],
+    "Data Structures and Algorithms": ["dsa", "data structures and algorithms", "data structures & algorithms"],
+    "Object-Oriented Programming": ["oop", "oops", "object oriented programming", "object-oriented programming"],
+    "Blockchain": ["blockchain", "block chain"],
+    # Soft skills
+    "Communication": ["communication", "communication skills"],
+    "Leadership": ["leadership"],
+    "Teamwork": ["teamwork", "team work", "team player"],
+    "Problem Solving": ["problem solving", "problem-solving"],
+    "Time Management": ["time management"],
+}
+
+# Separators treated as whitespace when building keys ("node.js" -> "node js")
+_SEPARATOR_RE = re.compile(r"[\s._\-/|,;:()]+")
+# Splits compound entries ("HTML/CSS", "React, Redux & Node") into candidate tokens
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def skill_key(name: str) -> str:
+    """Lower-cased, separator-insensitive key: "Node.JS" and "node js" -> "node js"."""
+    return _SEPARATOR_RE.sub(" ", name.lower()).strip()
+
+
+def _compact(key: str) -> str:
+    return key.replace(" ", "")
+
+
+def _build_index(aliases: dict) -> tuple:
+    lookup = {}
+    trie = {}
+    for canonical, names in aliases.items():
+        for name in [canonical, *names]:
+            key = skill_key(name)
+            lookup.setdefault(key, canonical)
+            lookup.setdefault(_compact(key), canonical)
+            node = trie
+            for token in _TOKEN_RE.findall(key):
+                node = node.setdefault(token, {})
+            node.setdefault(None, canonical)  # None marks the end of an alias
+    return lookup, trie
+
+
+_LOOKUP, _TRIE = _build_index(SKILL_ALIASES)
+
+
+def _scan(tokens: list) -> list:
+    """Longest-match trie scan: [(canonical, start, end)] over the token list."""
+    matches = []
+    i = 0
+    while i < len(tokens):
+        node, match, match_end = _TRIE, None, i
+        for j in range(i, len(tokens)):
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            if None in node:
+                match, match_end = node[None], j + 1
+        if match:
+            matches.append((match, i, match_end))
+            i = match_end
+        else:
+            i += 1
+    return matches
+
+
+def find_skills(text: str) -> list:
+    """All known skills mentioned in `text`, longest alias first, in order of appearance."""
+    found = []
+    for canonical, _, _ in _scan(_TOKEN_RE.findall(skill_key(text))):
+        if canonical not in found:
+            found.append(canonical)
+    return found
+
+
+def canonicalize_skill(name: str) -> list:
+    """
+    Canonical skill name(s) for one parsed entry. Exact aliases win; otherwise a
+    compound entry made only of known skills ("HTML/CSS") is split into them.
+    Unknown skills are kept as written (trimmed).
+    """
+    cleaned = " ".join(str(name).split()).strip(" .,;")
+    if not cleaned:
+        return []
+    key = skill_key(cleaned)
+    canonical = _LOOKUP.get(key) or _LOOKUP.get(_compact(key))
+    if canonical:
+        return [canonical]
+
+    # Only split when every token belongs to a known skill, so "Java Swing" stays one skill
+    tokens = [t for t in _TOKEN_RE.findall(key) if t != "and"]
+    matches = _scan(tokens)
+    if len(matches) > 1 and sum(end - start for _, start, end in matches) == len(tokens):
+        return list(dict.fromkeys(canonical for canonical, _, _ in matches))
+    return [cleaned]
+
+
+def canonicalize_skills(skills: dict) -> dict:
+    """
+    Canonicalizes a {category: [skill, ...]} mapping. Each skill appears once,
+    in the first category it was listed under.
+    """
+    seen = set()
+    result = {}
+    for category, names in (skills or {}).items():
+        result[category] = []
+        for name in names or []:
+            for canonical in canonicalize_skill(name):
+                key = _compact(skill_key(canonical))
+                if key not in seen:
+                    seen.add(key)
+                    result[category].append(canonical)
+    return result
+
+
+def skill_id(name: str) -> str:
+    """Stable Firestore document ID for a skill (computed on the canonical name)."""
+    canonical = canonicalize_skill(name)
+    name = canonical[0] if canonical else name
+    return name.lower().strip().replace(" ", "_").replace(".", "-").replace("/", "-")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The backend is a flat set of modules; make them importable from the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def text_extractor(tmp_path_factory):
+    """
+    The text_extractor module, imported from a scratch directory: it creates
+    resumes.db in the working directory on import.
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("text_extractor"))
+    os.environ["ANCHOR_ENABLED"] = "false"
+    try:
+        import text_extractor
+    finally:
+        os.chdir(cwd)
+    return text_extractor
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from anchoring import AnchorService, ChainSubmitter
+
+DEV_CHAIN_KEY = "0x" + "0" * 63 + "1"  # pre-funded on eth-tester
+ANCHOR_SINK = "0x000000000000000000000000000000000000dEaD"
+
+
+class SlowSubmitter:
+    """Real eth-tester submitter that holds each transaction long enough for callers to overlap."""
+
+    def __init__(self, submitter, delay: float = 0.2):
+        self.submitter = submitter
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def submit(self, root: bytes) -> dict:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.submitter.submit(root)
+
+
+@pytest.fixture
+def anchoring(tmp_path, text_extractor):
+    from web3 import EthereumTesterProvider, Web3
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'anchors.db'}", connect_args={"check_same_thread": False})
+    text_extractor.Base.metadata.create_all(bind=engine)
+    hashes = text_extractor.ResumeHash.__table__
+    old = datetime.utcnow() - timedelta(hours=1)
+    with engine.begin() as conn:
+        conn.execute(hashes.insert(), [
+            {"file_hash": hashlib.sha256(str(i).encode()).hexdigest(), "filename": f"r{i}.pdf", "created_at": old}
+            for i in range(10)
+        ])
+
+    w3 = Web3(EthereumTesterProvider())
+    submitter = SlowSubmitter(ChainSubmitter(w3, DEV_CHAIN_KEY, ANCHOR_SINK))
+    service = AnchorService(engine, hashes, text_extractor.AnchorBatch.__table__,
+                            text_extractor.ResumeAnchor.__table__, lambda: submitter, interval=0)
+    return service, submitter, w3, engine
+
+
+def test_flush_and_background_loop_send_one_transaction(anchoring):
+    service, submitter, w3, engine = anchoring
+    start_block = w3.eth.block_number
+
+    async def run():
+        loop_task = asyncio.create_task(service.run_forever())
+        flushes = await asyncio.gather(*(asyncio.to_thread(service.flush) for _ in range(3)))
+        # Let the loop's own batch finish before stopping it
+        while service.pending_stats()[0] or service._lock.locked():
+            await asyncio.sleep(0.05)
+        loop_task.cancel()
+        return flushes
+
+    flushes = asyncio.run(run())
+
+    assert submitter.calls == 1
+    assert w3.eth.block_number - start_block == 1
+    assert sum(len(reports) for reports in flushes) <= 1
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(service.batches)).scalar() == 1
+        assert conn.execute(select(func.count()).select_from(service.anchors)).scalar() == 10
+
+
+def test_proofs_verify_against_anchored_root(anchoring):
+    service, _, _, _ = anchoring
+    [report] = service.flush()
+    proof = service.proof_for(hashlib.sha256(b"3").hexdigest())
+    assert proof["root"] == report["root"]
+    assert proof["verified"]
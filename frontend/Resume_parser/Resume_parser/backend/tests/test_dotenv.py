@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_env_file_configures_the_service_modules(tmp_path):
+    # Settings read at import time by the modules text_extractor imports must come from .env
+    (tmp_path / ".env").write_text(
+        "ANCHOR_FUNCTION=storeRoot(bytes32)\nANCHOR_BATCH_SIZE=7\nNEAR_DUP_THRESHOLD=0.55\n"
+        "MAX_UPLOAD_BYTES=12345\nANCHOR_ENABLED=false\n"
+    )
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("ANCHOR_FUNCTION", "ANCHOR_BATCH_SIZE", "NEAR_DUP_THRESHOLD", "MAX_UPLOAD_BYTES")}
+    env["PYTHONPATH"] = BACKEND_DIR
+    # Run with -c: load_dotenv() then looks for .env in the working directory
+    script = ("import text_extractor, anchoring, minhash_index, uploads; "
+              "print(anchoring.ANCHOR_FUNCTION, anchoring.ANCHOR_BATCH_SIZE, "
+              "minhash_index.SIMILARITY_THRESHOLD, uploads.MAX_UPLOAD_BYTES)")
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-4:] == ["storeRoot(bytes32)", "7", "0.55", "12345"]
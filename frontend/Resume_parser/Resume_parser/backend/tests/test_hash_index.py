@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+from hash_index import HashIndex, enable_sqlite_wal
+
+
+def digest(value) -> str:
+    return hashlib.sha256(str(value).encode()).hexdigest()
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """Engines on one SQLite file, like the indexes of several worker processes."""
+    path = tmp_path / "resumes.db"
+    metadata = MetaData()
+    table = Table("resume_hashes", metadata,
+                  Column("id", Integer, primary_key=True),
+                  Column("filename", String, nullable=False),
+                  Column("file_hash", String, nullable=False, unique=True))
+
+    def make():
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        enable_sqlite_wal(engine)
+        metadata.create_all(engine)
+        return engine, table
+    return make
+
+
+def test_claim_is_exact(make_engine):
+    index = HashIndex(*make_engine())
+    assert index.claim(digest(1), "a.pdf") is True
+    assert index.claim(digest(1), "a.pdf") is False
+    assert index.check_many([digest(1), digest(2)]) == {digest(1): True, digest(2): False}
+
+
+def test_hash_claimed_by_another_worker_is_not_reported_new(make_engine):
+    first, second = HashIndex(*make_engine()), HashIndex(*make_engine())
+    first.warm()
+    second.warm()
+
+    assert second.claim(digest("resume"), "resume.pdf") is True
+    # first's Bloom filter was warmed before the claim; its miss must be confirmed
+    assert first.contains(digest("resume")) is True
+    assert first.check_many([digest("resume"), digest("other")]) == {digest("resume"): True, digest("other"): False}
+    assert first.claim(digest("resume"), "resume.pdf") is False
+
+
+def test_warm_loads_existing_rows(make_engine):
+    engine, table = make_engine()
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"file_hash": digest(i), "filename": f"{i}.pdf"} for i in range(50)])
+    index = HashIndex(engine, table)
+    index.warm()
+    assert all(digest(i) in index.bloom for i in range(50))
+    assert index.check_many([digest(i) for i in range(50)]) == {digest(i): True for i in range(50)}
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+import llm_client
+from llm_client import AsyncLLMClient, CircuitBreaker, LLMUnavailableError, TokenBucket, repair_json
+
+
+def api_error(cls, status: int, headers: dict = None):
+    request = httpx.Request("POST", "https://api.groq.test/openai/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+def completion(content: str = "{}"):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+class ScriptedCompletions:
+    """chat.completions stand-in: each call pops the next outcome (an exception or a content string)."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return completion(outcome)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(llm_client, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+    def make(outcomes, max_retries: int = 3):
+        client = AsyncLLMClient(api_key="test", rpm=6000, tpm=1e9, max_retries=max_retries)
+        client.completions = ScriptedCompletions(outcomes)
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=client.completions))
+        return client
+    return make
+
+
+def call(client):
+    return asyncio.run(client._create(0, model="m", messages=[]))
+
+
+# ---------------------------------------------------------------- circuit breaker
+
+def expire_cooldown(breaker: CircuitBreaker):
+    breaker.opened_at = time.monotonic() - breaker.cooldown
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_cooldown():
+    breaker = CircuitBreaker(threshold=2, cooldown=30)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(LLMUnavailableError):
+        breaker.before_call()
+
+    expire_cooldown(breaker)
+    assert breaker.state == "half-open"
+    breaker.before_call()  # the trial
+    with pytest.raises(LLMUnavailableError):
+        breaker.before_call()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    expire_cooldown(breaker)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_non_retryable_error_during_trial_closes_the_breaker(client):
+    client = client([api_error(groq.BadRequestError, 400), "{}"])
+    client.breaker = CircuitBreaker(threshold=1, cooldown=30)
+    client.breaker.record_failure()
+    assert client.breaker.state == "open"
+    expire_cooldown(client.breaker)
+    assert client.breaker.state == "half-open"
+
+    with pytest.raises(groq.BadRequestError):
+        call(client)
+    # Groq answered: the probe succeeded and the breaker is closed again
+    assert client.breaker.state == "closed"
+    assert not client.breaker._trial_in_flight
+    assert call(client).choices[0].message.content == "{}"
+
+
+def test_cancelled_trial_is_released(client):
+    client = client([asyncio.CancelledError(), "{}"])
+    client.breaker = CircuitBreaker(threshold=1, cooldown=30)
+    client.breaker.record_failure()
+    expire_cooldown(client.breaker)
+
+    with pytest.raises(asyncio.CancelledError):
+        call(client)
+    assert client.breaker.state == "half-open"
+    assert not client.breaker._trial_in_flight
+    call(client)  # the next trial goes through and closes the breaker
+    assert client.breaker.state == "closed"
+
+
+# ---------------------------------------------------------------- retry classification
+
+def test_rate_limits_are_retried_without_tripping_the_breaker(client):
+    client = client([api_error(groq.RateLimitError, 429)] * 3 + ["{}"])
+    client.breaker = CircuitBreaker(threshold=1, cooldown=30)
+    call(client)
+    assert client.completions.calls == 4
+    assert client.retries == 3
+    assert client.breaker.state == "closed"
+
+
+def test_server_errors_are_retried_and_counted_as_failures(client):
+    client = client([api_error(groq.InternalServerError, 503), "{}"])
+    call(client)
+    assert client.completions.calls == 2
+    assert client.breaker.failures == 0  # reset by the success
+
+
+def test_exhausted_retries_raise_unavailable(client):
+    client = client([api_error(groq.InternalServerError, 500)] * 2, max_retries=1)
+    with pytest.raises(LLMUnavailableError):
+        call(client)
+    assert client.completions.calls == 2
+
+
+def test_bad_request_is_not_retried(client):
+    client = client([api_error(groq.BadRequestError, 400), "{}"])
+    with pytest.raises(groq.BadRequestError):
+        call(client)
+    assert client.completions.calls == 1
+
+
+# ---------------------------------------------------------------- token bucket
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.tokens = 0
+    bucket.updated_at = time.monotonic() - 0.05
+    bucket._refill()
+    assert 4.5 <= bucket.tokens <= 10
+    bucket.updated_at = time.monotonic() - 10
+    bucket._refill()
+    assert bucket.tokens == 10
+
+
+def test_bucket_waits_for_tokens():
+    bucket = TokenBucket(rate=50, capacity=5)
+
+    async def run():
+        await bucket.acquire(5)
+        started = time.monotonic()
+        await bucket.acquire(5)  # empty: needs 5 / 50 = 0.1s of refill
+        return time.monotonic() - started
+
+    assert 0.08 <= asyncio.run(run()) < 0.5
+
+
+def test_small_request_is_not_queued_behind_a_large_one():
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.tokens = 0
+    bucket.updated_at = time.monotonic()
+    done = []
+
+    async def take(amount):
+        await bucket.acquire(amount)
+        done.append(amount)
+
+    async def run():
+        large = asyncio.create_task(take(10))  # needs ~1s
+        await asyncio.sleep(0)
+        await asyncio.wait_for(take(1), timeout=0.5)  # needs ~0.1s
+        large.cancel()
+
+    asyncio.run(run())
+    assert done == [1]
+
+
+# ---------------------------------------------------------------- JSON repair
+
+def test_repair_json_strips_fences_and_prose():
+    assert repair_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert repair_json('Here you go: {"a": [1, 2]} hope it helps') == {"a": [1, 2]}
+
+
+def test_repair_json_removes_trailing_commas():
+    assert repair_json('{"a": [1, 2,], "b": {"c": 3,},}') == {"a": [1, 2], "b": {"c": 3}}
+
+
+def test_repair_json_gives_up_on_truncated_output():
+    with pytest.raises(json.JSONDecodeError):
+        repair_json('{"skills": {"technical": ["Python", "Go"')
@@ -0,0 +1,50 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from metrics import REQUEST_SECONDS, install_metrics
+
+
+def make_app():
+    app = FastAPI()
+    install_metrics(app)
+
+    @app.get("/slow-stream")
+    async def slow_stream():
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.1)
+                yield b"chunk\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    @app.get("/plain")
+    async def plain():
+        return {"ok": True}
+
+    return app
+
+
+def observed_seconds(route: str) -> float:
+    return REQUEST_SECONDS._values[("GET", route, "200")][1]
+
+
+def test_streaming_route_is_timed_until_the_body_is_sent():
+    client = TestClient(make_app())
+    response = client.get("/slow-stream")
+
+    assert response.text == "chunk\n" * 3
+    assert REQUEST_SECONDS.count(method="GET", route="/slow-stream", status=200) == 1
+    assert observed_seconds("/slow-stream") >= 0.3
+    # The header is sent before the body: it only covers the time to the first byte
+    total_ms = float(response.headers["Server-Timing"].split("total;dur=")[1])
+    assert total_ms < 300
+
+
+def test_plain_route_is_recorded_once():
+    client = TestClient(make_app())
+    client.get("/plain")
+    client.get("/plain")
+
+    assert REQUEST_SECONDS.count(method="GET", route="/plain", status=200) == 2
@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import BigInteger, Column, Integer, LargeBinary, MetaData, String, Table, create_engine
+
+from minhash_index import MinHashLSHIndex, NUM_PERM, estimate_jaccard, minhash_signature, shingles
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def resume(seed: int, length: int = 300) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(WORDS) for _ in range(length)]
+
+
+def edited(words: list, changes: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = list(words)
+    for position in rng.sample(range(len(words)), changes):
+        words[position] = "edited"
+    return words
+
+
+def true_jaccard(a: str, b: str) -> float:
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+@pytest.fixture
+def index(tmp_path):
+    metadata = MetaData()
+    signatures = Table("resume_minhashes", metadata,
+                       Column("file_hash", String, primary_key=True),
+                       Column("signature", LargeBinary, nullable=False))
+    buckets = Table("resume_lsh_buckets", metadata,
+                    Column("band", Integer, primary_key=True),
+                    Column("bucket", BigInteger, primary_key=True),
+                    Column("file_hash", String, primary_key=True))
+    engine = create_engine(f"sqlite:///{tmp_path / 'resumes.db'}")
+    metadata.create_all(engine)
+    return MinHashLSHIndex(engine, signatures, buckets, threshold=0.7)
+
+
+def test_signature_is_deterministic_and_case_insensitive():
+    text = " ".join(resume(1))
+    signature = minhash_signature(text)
+    assert signature.shape == (NUM_PERM,) and signature.dtype == np.uint32
+    assert np.array_equal(signature, minhash_signature(text.upper()))
+
+
+def test_estimate_tracks_the_true_jaccard():
+    original = " ".join(resume(1))
+    for changes in (3, 15, 40):
+        copy = " ".join(edited(resume(1), changes))
+        estimate = estimate_jaccard(minhash_signature(original), minhash_signature(copy))
+        assert abs(estimate - true_jaccard(original, copy)) < 0.15
+
+
+def test_lightly_edited_copy_is_reported(index):
+    original = " ".join(resume(1))
+    index.add("original", minhash_signature(original))
+    index.add("unrelated", minhash_signature(" ".join(resume(2))))
+
+    matches = index.query(minhash_signature(" ".join(edited(resume(1), 4))))
+    assert [file_hash for file_hash, _ in matches] == ["original"]
+    assert matches[0][1] >= 0.7
+
+
+def test_heavily_edited_copy_is_below_the_threshold(index):
+    index.add("original", minhash_signature(" ".join(resume(1))))
+    copy = " ".join(edited(resume(1), 60))
+    assert index.query(minhash_signature(copy)) == []
+
+
+def test_query_excludes_the_resume_itself(index):
+    signature = minhash_signature(" ".join(resume(1)))
+    index.add("original", signature)
+    index.add("original", signature)  # re-adding is a no-op
+    assert index.query(signature) == [("original", 1.0)]
+    assert index.query(signature, exclude="original") == []
+
+
+def test_short_and_empty_texts():
+    assert len(shingles("two words")) == 1
+    assert shingles("") == set()
+    assert minhash_signature("").shape == (NUM_PERM,)
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+import parse_cache
+from parse_cache import ParseCache
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def make(**kwargs):
+        return ParseCache(path=str(tmp_path / "parse_cache.db"), **kwargs)
+    return make
+
+
+def test_round_trip_returns_a_fresh_copy(make_cache):
+    cache = make_cache()
+    key = ParseCache.make_key("abc", "v1")
+    cache.set(key, {"skills": {"technical": ["Python"]}})
+
+    first = cache.get(key)
+    first["skills"]["technical"].append("mutated")
+    assert cache.get(key) == {"skills": {"technical": ["Python"]}}
+
+
+def test_parse_version_is_part_of_the_key(make_cache):
+    cache = make_cache()
+    cache.set(ParseCache.make_key("abc", "v1"), {"a": 1})
+    assert cache.get(ParseCache.make_key("abc", "v2")) is None
+
+
+def test_entries_survive_a_restart(make_cache):
+    make_cache().set("k", {"a": 1})
+    assert make_cache().get("k") == {"a": 1}
+
+
+def test_expired_entries_are_not_served(make_cache):
+    cache = make_cache(ttl=0.05)
+    cache.set("k", {"a": 1})
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    # Expired rows are dropped from the persistent tier as well
+    assert make_cache(ttl=3600).get("k") is None
+
+
+def test_eviction_keeps_the_most_recently_used(make_cache, monkeypatch):
+    monkeypatch.setattr(parse_cache, "EVICT_EVERY", 1000)
+    cache = make_cache(max_entries=3, memory_entries=1)
+    for i in range(5):
+        cache.set(f"k{i}", {"i": i})
+        time.sleep(0.01)
+    cache.get("k0")  # persistent hit: refreshes last_access
+    cache.evict()
+
+    reopened = make_cache()
+    assert [key for key in (f"k{i}" for i in range(5)) if reopened.get(key) is not None] == ["k0", "k3", "k4"]
+
+
+def test_eviction_runs_every_n_writes(make_cache, monkeypatch):
+    monkeypatch.setattr(parse_cache, "EVICT_EVERY", 4)
+    cache = make_cache(max_entries=2)
+    for i in range(4):
+        cache.set(f"k{i}", {"i": i})
+        time.sleep(0.01)
+    rows = cache._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+    assert rows == 2
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import parser
+from benchmarks.synthetic import generate_docx, generate_pdf
+from parser import PAGE_BREAK, extract_text, extract_text_from_pdf, join_page_texts, pdf_page_count, pdf_page_ranges
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("pdf") / "resume.pdf"
+    path.write_bytes(generate_pdf(30, seed=1))
+    return str(path)
+
+
+def test_pages_are_joined_with_page_breaks(pdf_path):
+    text = extract_text(pdf_path, "resume.pdf")
+    assert text.count(PAGE_BREAK) == 29
+
+
+def test_bytes_and_paths_give_the_same_text(pdf_path):
+    with open(pdf_path, "rb") as f:
+        content = f.read()
+    assert extract_text_from_pdf(content) == extract_text_from_pdf(pdf_path)
+
+
+def test_parallel_page_ranges_match_sequential_extraction(pdf_path):
+    with ThreadPoolExecutor(4) as executor:
+        assert extract_text_from_pdf(pdf_path, executor=executor) == extract_text_from_pdf(pdf_path)
+
+
+def test_page_ranges_cover_every_page(monkeypatch):
+    monkeypatch.setattr(parser, "PARALLEL_PAGE_THRESHOLD", 24)
+    monkeypatch.setattr(parser, "PAGES_PER_CHUNK", 8)
+    assert pdf_page_ranges(10) == [(0, 10)]
+    assert pdf_page_ranges(30) == [(0, 8), (8, 16), (16, 24), (24, 30)]
+
+
+def test_page_cap(pdf_path, monkeypatch):
+    monkeypatch.setattr(parser, "MAX_PDF_PAGES", 5)
+    assert pdf_page_count(pdf_path) == 5
+    assert pdf_page_ranges(30) == [(0, 5)]
+    assert extract_text(pdf_path, "resume.pdf").count(PAGE_BREAK) == 4
+
+
+def test_text_cap(pdf_path, monkeypatch):
+    monkeypatch.setattr(parser, "MAX_TEXT_CHARS", 1000)
+    assert len(extract_text(pdf_path, "resume.pdf")) <= 1000
+
+
+def test_join_stops_consuming_at_the_cap():
+    consumed = []
+
+    def pages():
+        for i in range(100):
+            consumed.append(i)
+            yield "x" * 100
+
+    assert len(join_page_texts(pages(), max_chars=250)) == 250
+    assert len(consumed) == 3
+
+
+def test_docx(tmp_path):
+    path = tmp_path / "resume.docx"
+    path.write_bytes(generate_docx(2, seed=1))
+    assert extract_text(str(path), "resume.docx")
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        extract_text(b"", "resume.txt")
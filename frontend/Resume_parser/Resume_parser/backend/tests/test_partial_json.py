@@ -0,0 +1,48 @@
+import json
+
+from partial_json import IncrementalObjectParser
+
+DOCUMENT = {
+    "personal_info": {"full_name": "Jane \"JD\" Doe", "email": "jane@example.com"},
+    "skills": {"technical": ["C++", "Go"], "soft": []},
+    "projects": [{"title": "a, b: {c}", "tech_stack": ["[x]"]}],
+    "professional_summary": "Line one\nline two",
+    "certifications": [],
+}
+
+
+def feed_in_chunks(text: str, size: int) -> list:
+    parser = IncrementalObjectParser()
+    members = []
+    for start in range(0, len(text), size):
+        members.extend(parser.feed(text[start:start + size]))
+    return members
+
+
+def test_every_member_is_reported_once_whatever_the_chunking():
+    text = json.dumps(DOCUMENT, indent=2)
+    for size in (1, 3, 7, 64, len(text)):
+        assert feed_in_chunks(text, size) == list(DOCUMENT.items())
+
+
+def test_member_is_reported_as_soon_as_it_is_complete():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"personal_info": {"full_name": "Jane"}') == []
+    assert parser.feed(', "skills"') == [("personal_info", {"full_name": "Jane"})]
+    assert parser.feed(': {"technical": ["Go"]}}') == [("skills", {"technical": ["Go"]})]
+
+
+def test_structural_characters_inside_strings_are_ignored():
+    members = feed_in_chunks('{"a": "}, \\"b\\": [", "c": 1}', 2)
+    assert members == [("a", '}, "b": ['), ("c", 1)]
+
+
+def test_malformed_member_is_skipped():
+    members = feed_in_chunks('{"a": [1, 2,], "b": true}', 4)
+    assert members == [("b", True)]
+
+
+def test_text_after_the_object_is_ignored():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"a": 1} {"b": 2}') == [("a", 1)]
+    assert parser.feed('{"c": 3}') == []
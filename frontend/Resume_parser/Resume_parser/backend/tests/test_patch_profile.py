@@ -0,0 +1,61 @@
+import pytest
+
+import firebase_service
+from benchmarks.fakes import FakeFirestore
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    monkeypatch.setattr(firebase_service, "get_db", lambda: db)
+    firebase_service._profile_cache.clear()
+    return db
+
+
+def stored(db, section, doc_id):
+    return db.collection("users").document("u1").collection(section).document(doc_id).get().to_dict()
+
+
+def test_whole_item_replace_drops_fields_left_out(db):
+    project = db.collection("users").document("u1").collection("projects").document("app")
+    project.set({"title": "App", "summary": "old", "tech_stack": ["Flask"], "source": "resume", "stars": 3})
+
+    firebase_service.patch_user_profile("u1", [
+        {"op": "replace", "path": "/projects/app", "value": {"title": "App", "summary": "new"}},
+    ])
+
+    doc = stored(db, "projects", "app")
+    assert doc["summary"] == "new" and doc["source"] == "user"
+    assert doc["tech_stack"] is None and "stars" not in doc
+
+
+def test_field_patch_after_replace_is_folded_into_the_replacement(db):
+    project = db.collection("users").document("u1").collection("projects").document("app")
+    project.set({"title": "App", "summary": "old", "stars": 3})
+
+    result = firebase_service.patch_user_profile("u1", [
+        {"op": "replace", "path": "/projects/app", "value": {"title": "App"}},
+        {"op": "replace", "path": "/projects/app/summary", "value": "folded"},
+    ])
+
+    assert result == {"written": 1, "deleted": 0}
+    doc = stored(db, "projects", "app")
+    assert doc["summary"] == "folded" and "stars" not in doc
+
+
+def test_field_patch_merges(db):
+    project = db.collection("users").document("u1").collection("projects").document("app")
+    project.set({"title": "App", "summary": "old", "stars": 3})
+
+    firebase_service.patch_user_profile("u1", [
+        {"op": "replace", "path": "/projects/app/summary", "value": "new"},
+    ])
+
+    assert stored(db, "projects", "app") == {"title": "App", "summary": "new", "stars": 3, "source": "user"}
+
+
+@pytest.mark.parametrize("value", [{"category": "technical"}, {"name": "  "}, 42])
+def test_skill_without_name_is_rejected(db, value):
+    with pytest.raises(ValueError):
+        firebase_service.patch_user_profile("u1", [{"op": "add", "path": "/skills/-", "value": value}])
+    assert list(db.collection("users").document("u1").collection("skills").stream()) == []
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import pipeline
+from parse_cache import ParseCache
+from uploads import SpooledUpload
+from test_rule_parser import RESUME
+
+LLM_PARSE = {"personal_info": {"full_name": "Jane Doe"}, "skills": {"technical": ["Python"]}}
+
+
+@pytest.fixture
+def stream(tmp_path, monkeypatch):
+    """Runs stream_resume_events with local stand-ins; returns (events, llm_calls)."""
+    llm_calls = []
+
+    async def inline(fn, *args):
+        return fn(*args)
+
+    async def extract(source, filename):
+        return RESUME
+
+    async def fake_stream(text):
+        llm_calls.append(text)
+        for key, value in LLM_PARSE.items():
+            yield ("field", key, value)
+        yield ("result", dict(LLM_PARSE))
+
+    async def upload(upload):
+        return "https://storage.test/resume.pdf"
+
+    cache = ParseCache(path=str(tmp_path / "parse_cache.db"))
+    monkeypatch.setattr(pipeline, "run_cpu_bound", inline)
+    monkeypatch.setattr(pipeline, "run_blocking", inline)
+    monkeypatch.setattr(pipeline, "extract_text_async", extract)
+    monkeypatch.setattr(pipeline, "stream_resume_with_groq", fake_stream)
+    monkeypatch.setattr(pipeline, "upload_to_storage", upload)
+    monkeypatch.setattr(pipeline, "save_user_profile", lambda user_id, data: None)
+    monkeypatch.setattr(pipeline, "get_parse_cache", lambda: cache)
+
+    def run(mode: str):
+        monkeypatch.setattr(pipeline, "PARSE_MODE", mode)
+        upload = SpooledUpload(str(tmp_path / "resume.pdf"), "resume.pdf", "application/pdf", 10, mode * 8)
+
+        async def collect():
+            return [event async for event in pipeline.stream_resume_events(upload, "u1")]
+        return asyncio.run(collect()), llm_calls
+    return run
+
+
+def parse_source(events) -> str:
+    return next(data["source"] for name, data in events if name == "stage" and data["stage"] == "parsing")
+
+
+def test_llm_mode_streams_the_llm_parse(stream):
+    events, llm_calls = stream("llm")
+    assert parse_source(events) == "llm"
+    assert len(llm_calls) == 1
+    assert events[-1][1]["personal_info"] == {"full_name": "Jane Doe"}
+
+
+def test_auto_mode_uses_a_confident_local_parse(stream):
+    events, llm_calls = stream("auto")
+    assert parse_source(events) == "local"
+    assert llm_calls == []
+    assert events[-1][1]["personal_info"]["email"] == "jane@example.com"
+
+
+def test_compare_mode_keeps_the_llm_result(stream, capsys):
+    events, llm_calls = stream("compare")
+    assert parse_source(events) == "llm"
+    assert len(llm_calls) == 1
+    assert "Local vs Groq agreement" in capsys.readouterr().out
@@ -0,0 +1,62 @@
+from parser import PAGE_BREAK
+from prompt_preprocessor import merge_extracted_fields, prepare_resume_text, remove_boilerplate
+
+RESUME = PAGE_BREAK.join([
+    "Jane Doe\njane@example.com | +91 98765 43210 | github.com/jane\n\nExperience\n"
+    "Scaled the API across 12345678901 requests a day\nEmployee ID 9876543210\nJane Doe - Resume",
+    "Projects\nPayments service\nContact the reviewer at bob@example.com\nJane Doe - Resume",
+])
+
+
+def test_contact_fields_are_extracted_and_removed():
+    prepared = prepare_resume_text(RESUME)
+    assert prepared.email == "jane@example.com"
+    assert prepared.phone == "+91 98765 43210"
+    assert "jane@example.com" not in prepared.text
+    assert "98765 43210" not in prepared.text
+    # Only the separators' leftovers are cleaned up; the rest of the line stays
+    assert "github.com/jane" in prepared.text.splitlines()
+
+
+def test_numbers_outside_the_contact_header_are_kept():
+    text = prepare_resume_text(RESUME).text
+    assert "Scaled the API across 12345678901 requests a day" in text
+    assert "Employee ID 9876543210" in text
+    # Only the email that is filled back in is removed
+    assert "bob@example.com" in text
+
+
+def test_labelled_contact_line_after_the_header():
+    body = "\n".join(f"Line {i}" for i in range(20))
+    prepared = prepare_resume_text(f"Jane Doe\n{body}\nPhone: +44 (0)20 7946 0958")
+    assert prepared.phone == "+44 (0)20 7946 0958"
+    assert "7946" not in prepared.text
+
+
+def test_running_footer_is_kept_once():
+    lines = prepare_resume_text(RESUME).text.splitlines()
+    assert lines.count("Jane Doe - Resume") == 1
+
+
+def test_repeated_body_line_is_not_boilerplate():
+    stack = "Tech stack: Python, FastAPI, Redis"
+    pages = [["Header", "Project A", stack, "More", "Text", "End"],
+             ["Header", "Project B", stack, "More", "Text", "End"]]
+    assert remove_boilerplate(pages).count(stack) == 2
+
+
+def test_merge_fills_only_missing_fields():
+    prepared = prepare_resume_text(RESUME)
+    merged = merge_extracted_fields({"personal_info": {"full_name": "Jane Doe", "phone": ""}}, prepared)
+    assert merged["personal_info"]["phone"] == "+91 98765 43210"
+    assert merged["personal_info"]["email"] == "jane@example.com"
+
+    unmatched = prepare_resume_text("Jane Doe\nCall me: 0044-20-7946-0958 ext. 12\nWork")
+    merged = merge_extracted_fields({"personal_info": {"phone": "+44 20 7946 0958"}}, unmatched)
+    # A value the LLM found itself is kept
+    assert merged["personal_info"]["phone"] == "+44 20 7946 0958"
+
+
+def test_skills_are_canonicalized():
+    merged = merge_extracted_fields({"skills": {"technical": ["NodeJS", "reactjs"]}}, prepare_resume_text(""))
+    assert merged["skills"]["technical"] == ["Node.js", "React"]
@@ -0,0 +1,77 @@
+import copy
+
+from rule_parser import LOCAL_PARSE_CONFIDENCE, compare_parses, parse_resume_locally
+
+RESUME = """Jane Doe
+jane@example.com | +91 98765 43210
+Summary
+Backend engineer who likes distributed systems.
+Skills
+Languages: Python, JavaScript, Go
+Frameworks: NodeJS, reactjs, FastAPI
+Education
+B.Tech in Computer Science, Indian Institute of Technology Bombay, 2019 - 2023
+Experience
+Software Engineer at Acme Corp | Jan 2023 - Present
+- Built the payments API
+Projects
+Resume Parser
+- Tech stack: Python, FastAPI
+"""
+
+
+def test_well_formed_resume_is_parsed_confidently():
+    parse = parse_resume_locally(RESUME)
+    assert parse.confidence >= LOCAL_PARSE_CONFIDENCE
+    assert all(parse.checks.values())
+
+    data = parse.data
+    assert data["personal_info"]["full_name"] == "Jane Doe"
+    assert data["personal_info"]["email"] == "jane@example.com"
+    assert data["personal_info"]["phone"] == "+91 98765 43210"
+    assert data["education"][0]["institution"] == "Indian Institute of Technology Bombay"
+    assert data["experience"][0]["company"] == "Acme Corp"
+    assert data["experience"][0]["responsibilities"] == ["Built the payments API"]
+    assert data["projects"][0]["tech_stack"] == ["Python", "FastAPI"]
+
+
+def test_skills_are_canonicalized():
+    skills = parse_resume_locally(RESUME).data["skills"]
+    all_skills = {name for names in skills.values() for name in names}
+    assert {"Node.js", "React", "Python"} <= all_skills
+
+
+def test_unfamiliar_layout_falls_below_the_threshold():
+    parse = parse_resume_locally("Jane Doe\nI did many things\nat several places\nover the years")
+    assert parse.confidence < LOCAL_PARSE_CONFIDENCE
+    assert not parse.checks["sections"]
+
+
+def test_identical_parses_agree_fully():
+    data = parse_resume_locally(RESUME).data
+    agreement = compare_parses(data, copy.deepcopy(data))
+    assert agreement["overall"] == 1.0
+
+
+def test_agreement_is_per_field():
+    local = parse_resume_locally(RESUME).data
+    llm = copy.deepcopy(local)
+    llm["personal_info"]["email"] = "other@example.com"
+    llm["skills"] = {"technical": ["Python", "Go"], "tools_frameworks": []}
+    llm["projects"] = []
+
+    agreement = compare_parses(local, llm)
+    assert agreement["personal_info.full_name"] == 1.0
+    assert agreement["personal_info.email"] == 0.0
+    assert agreement["skills"] == 2 / 6
+    assert agreement["projects"] == 0.0
+    assert agreement["experience"] == 1.0
+    assert 0 < agreement["overall"] < 1
+
+
+def test_comparison_ignores_case_and_whitespace():
+    local = {"personal_info": {"full_name": "Jane  Doe"}, "skills": {"technical": ["python"]}}
+    llm = {"personal_info": {"full_name": "jane doe"}, "skills": {"technical": ["Python "]}}
+    agreement = compare_parses(local, llm)
+    assert agreement["personal_info.full_name"] == 1.0
+    assert agreement["skills"] == 1.0
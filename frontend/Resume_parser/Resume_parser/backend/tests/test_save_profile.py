@@ -0,0 +1,91 @@
+import copy
+
+import pytest
+
+import firebase_service
+from benchmarks.fakes import FakeFirestore
+
+PARSE = {
+    "personal_info": {"full_name": "Asha Rao", "email": "asha@example.com", "phone": None, "location": "Pune"},
+    "professional_summary": "Backend engineer.",
+    "skills": {"technical": ["Python", "NodeJS"], "soft": [], "tools_frameworks": []},
+    "projects": [
+        {"title": "Ledger", "summary": "Double-entry bookkeeping API", "tech_stack": ["Python"]},
+        {"title": "Chat", "summary": "WebSocket chat", "tech_stack": ["Node.js"]},
+    ],
+    "experience": [{"role": "Engineer", "company": "Initech", "duration": "2022 - Present", "responsibilities": []}],
+    "education": [{"degree": "B.Tech", "field_of_study": "CS", "institution": "COEP", "year": "2022"}],
+}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    monkeypatch.setattr(firebase_service, "get_db", lambda: db)
+    firebase_service._profile_cache.clear()
+    return db
+
+
+def section(db, name):
+    collection = db.collection("users").document("u1").collection(name)
+    return {snapshot.id: snapshot.to_dict() for snapshot in collection.stream()}
+
+
+def test_first_save_writes_every_document(db):
+    result = firebase_service.save_user_profile("u1", PARSE)
+
+    assert result == {"written": 7, "deleted": 0, "skipped_sections": []}
+    assert set(section(db, "skills")) == {"python", "node-js"}
+    assert set(section(db, "projects")) == {"ledger", "chat"}
+    assert db.collection("users").document("u1").collection("meta").document("parse_hashes").get().exists
+
+
+def test_identical_save_writes_nothing(db):
+    firebase_service.save_user_profile("u1", PARSE)
+    db.stats["writes"] = 0
+
+    result = firebase_service.save_user_profile("u1", copy.deepcopy(PARSE))
+
+    assert result["written"] == 0 and result["deleted"] == 0
+    assert set(result["skipped_sections"]) == {"skills", "projects", "experience", "education", "personal_info"}
+    assert db.stats["writes"] == 0
+
+
+def test_changed_project_rewrites_only_that_document(db):
+    firebase_service.save_user_profile("u1", PARSE)
+    parse = copy.deepcopy(PARSE)
+    parse["projects"][1]["summary"] = "WebSocket chat with presence"
+
+    result = firebase_service.save_user_profile("u1", parse)
+
+    assert result["written"] == 1 and result["deleted"] == 0
+    assert "projects" not in result["skipped_sections"]
+    assert section(db, "projects")["chat"]["summary"] == "WebSocket chat with presence"
+
+
+def test_removed_entries_are_deleted_unless_user_owned(db):
+    firebase_service.save_user_profile("u1", PARSE)
+    projects = db.collection("users").document("u1").collection("projects")
+    projects.document("chat").set({"source": "user"}, merge=True)
+    parse = copy.deepcopy(PARSE)
+    parse["projects"] = []
+    parse["skills"]["technical"] = ["Python"]
+
+    result = firebase_service.save_user_profile("u1", parse)
+
+    assert result["deleted"] == 2  # the "ledger" project and the Node.js skill
+    assert set(section(db, "projects")) == {"chat"}
+    assert set(section(db, "skills")) == {"python"}
+
+
+def test_user_owned_document_is_not_overwritten(db):
+    firebase_service.save_user_profile("u1", PARSE)
+    projects = db.collection("users").document("u1").collection("projects")
+    projects.document("ledger").set({"summary": "Edited by hand", "source": "user"}, merge=True)
+    parse = copy.deepcopy(PARSE)
+    parse["projects"][0]["summary"] = "Re-parsed summary"
+
+    result = firebase_service.save_user_profile("u1", parse)
+
+    assert result["written"] == 0
+    assert section(db, "projects")["ledger"]["summary"] == "Edited by hand"
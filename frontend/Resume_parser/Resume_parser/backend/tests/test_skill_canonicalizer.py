@@ -0,0 +1,98 @@
+import pytest
+
+import firebase_service
+from benchmarks.fakes import FakeFirestore
+from migrate_skill_ids import migrate_user
+from skill_canonicalizer import canonicalize_skill, canonicalize_skills, find_skills, skill_id
+
+
+@pytest.mark.parametrize("name, canonical", [
+    ("NodeJS", ["Node.js"]),
+    ("reactjs", ["React"]),
+    ("  Python. ", ["Python"]),
+    ("HTML/CSS", ["HTML", "CSS"]),
+    ("Java Swing", ["Java Swing"]),  # not every token is a known skill: kept whole
+    ("Quantum Basketweaving", ["Quantum Basketweaving"]),
+    ("", []),
+])
+def test_canonicalize_skill(name, canonical):
+    assert canonicalize_skill(name) == canonical
+
+
+def test_skills_are_deduplicated_across_categories():
+    skills = {
+        "technical": ["reactjs", "Python", "python"],
+        "tools_frameworks": ["React", "Docker"],
+        "soft": ["Teamwork"],
+    }
+    assert canonicalize_skills(skills) == {
+        "technical": ["React", "Python"],
+        "tools_frameworks": ["Docker"],
+        "soft": ["Teamwork"],
+    }
+
+
+def test_find_skills_in_free_text():
+    assert find_skills("Built APIs with node js and Postgres on AWS") == ["Node.js", "PostgreSQL", "AWS"]
+
+
+def test_skill_id_is_computed_on_the_canonical_name():
+    assert skill_id("NodeJS") == skill_id("node.js") == "node-js"
+    assert skill_id("Quantum Basketweaving") == "quantum_basketweaving"
+
+
+# ---------------------------------------------------------------- migration
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    monkeypatch.setattr(firebase_service, "get_db", lambda: db)
+    return db
+
+
+def skills(db):
+    collection = db.collection("users").document("u1").collection("skills")
+    return {snapshot.id: snapshot.to_dict() for snapshot in collection.stream()}
+
+
+def add_skill(db, doc_id, **data):
+    db.collection("users").document("u1").collection("skills").document(doc_id).set(data)
+
+
+def test_migration_rekeys_and_merges(db):
+    add_skill(db, "nodejs", name="NodeJS", category="technical", source="resume")
+    add_skill(db, "node-js", name="Node.js", category="technical", source="resume")
+    add_skill(db, "reactjs", name="reactjs", category="technical", source="resume")
+    add_skill(db, "python", name="Python", category="technical", source="resume")
+    db.collection("users").document("u1").collection("meta").document("parse_hashes").set({"skills": "x"})
+
+    stats = migrate_user(db, "u1")
+
+    assert stats == {"moved": 1, "merged": 1, "deleted": 2}
+    assert skills(db) == {
+        "node-js": {"name": "Node.js", "category": "technical", "source": "resume"},
+        "react": {"name": "React", "category": "technical", "source": "resume"},
+        "python": {"name": "Python", "category": "technical", "source": "resume"},
+    }
+    assert not db.collection("users").document("u1").collection("meta").document("parse_hashes").get().exists
+
+
+def test_user_owned_document_wins_the_merge(db):
+    add_skill(db, "node-js", name="Node.js", category="technical", source="resume")
+    add_skill(db, "nodejs", name="NodeJS", category="tools_frameworks", source="user")
+
+    migrate_user(db, "u1")
+
+    # User-typed names are kept as written
+    assert skills(db) == {"node-js": {"name": "NodeJS", "category": "tools_frameworks", "source": "user"}}
+
+
+def test_dry_run_writes_nothing_and_rerun_is_a_no_op(db):
+    add_skill(db, "nodejs", name="NodeJS", category="technical", source="resume")
+    before = skills(db)
+
+    assert migrate_user(db, "u1", dry_run=True) == {"moved": 1, "merged": 0, "deleted": 1}
+    assert skills(db) == before
+
+    migrate_user(db, "u1")
+    assert migrate_user(db, "u1") == {"moved": 0, "merged": 0, "deleted": 0}
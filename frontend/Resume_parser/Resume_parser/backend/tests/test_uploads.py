@@ -0,0 +1,60 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+
+from uploads import UPLOAD_CHUNK_BYTES, UploadTooLargeError, spool_stream, spool_upload
+
+
+class FakeUploadFile:
+    """The parts of FastAPI's UploadFile that spool_upload uses."""
+
+    def __init__(self, data: bytes, filename: str = "resume.pdf", size=None):
+        self.stream = io.BytesIO(data)
+        self.filename = filename
+        self.content_type = "application/pdf"
+        self.size = size
+
+    async def read(self, n: int) -> bytes:
+        return self.stream.read(n)
+
+
+def test_spool_hashes_and_keeps_the_extension():
+    data = os.urandom(UPLOAD_CHUNK_BYTES * 2 + 123)
+    spooled = asyncio.run(spool_upload(FakeUploadFile(data), max_bytes=len(data)))
+    try:
+        assert spooled.size == len(data)
+        assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+        assert spooled.path.endswith(".pdf")
+        assert spooled.read_bytes() == data
+    finally:
+        spooled.cleanup()
+    assert not os.path.exists(spooled.path)
+    spooled.cleanup()  # idempotent
+
+
+def test_oversized_stream_is_rejected_and_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(FakeUploadFile(b"x" * (UPLOAD_CHUNK_BYTES + 1)), max_bytes=UPLOAD_CHUNK_BYTES))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_declared_size_is_rejected_before_reading():
+    upload = FakeUploadFile(b"small", size=10 ** 9)
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(upload, max_bytes=1000))
+    assert upload.stream.tell() == 0
+
+
+def test_spool_stream():
+    spooled = spool_stream(io.BytesIO(b"docx bytes"), "cv.docx", "application/octet-stream", max_bytes=100)
+    try:
+        assert spooled.sha256 == hashlib.sha256(b"docx bytes").hexdigest()
+        assert spooled.path.endswith(".docx")
+    finally:
+        spooled.cleanup()
+    with pytest.raises(UploadTooLargeError):
+        spool_stream(io.BytesIO(b"x" * 101), "cv.docx", "application/octet-stream", max_bytes=100)
@@ -96,43 +96,71 @@
 #     )
 
 import os
-import io
+import asyncio
 import hashlib
 from datetime import datetime
 
+from typing import List
+
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 import uvicorn
 
 import fitz  # PyMuPDF
 import docx
 
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, UniqueConstraint
+from sqlalchemy import create_engine, Column, String, Integer, BigInteger, Float, Text, ForeignKey, DateTime, LargeBinary, UniqueConstraint, Index, select
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from dotenv import load_dotenv
-from web3 import Web3
 
 # -------------------------------------------------
 # LOAD ENV (THIS IS WHERE YOUR CREDS COME FROM)
+# Before the service modules below: they read their settings
+# (MAX_UPLOAD_BYTES, NEAR_DUP_THRESHOLD, ANCHOR_*...) at import time.
 # -------------------------------------------------
 load_dotenv()
 
+from uploads import spool_upload, UploadTooLargeError
+from hash_index import HashIndex, enable_sqlite_wal
+from minhash_index import MinHashLSHIndex, minhash_signature
+from anchoring import AnchorService, ChainSubmitter
+from metrics import install_metrics, timed, FILE_SIZE_BYTES, PAGE_COUNT
+
 RPC_URL = os.getenv("RPC_URL")
 PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS")
 WALLET_ADDRESS = os.getenv("WALLET_ADDRESS")
 
-if not RPC_URL or not PRIVATE_KEY or not CONTRACT_ADDRESS:
-    raise RuntimeError("Missing blockchain env variables")
+
+def chain_configured() -> bool:
+    return bool(RPC_URL and PRIVATE_KEY and CONTRACT_ADDRESS)
 
 # -------------------------------------------------
-# BLOCKCHAIN SETUP (READINESS CHECK)
+# BLOCKCHAIN SETUP (LAZY; REACHABILITY IS REPORTED BY /ready)
 # -------------------------------------------------
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+_w3 = None
+_anchor_submitter = None
+
 
-if not w3.is_connected():
-    raise RuntimeError("Blockchain RPC not reachable")
+def get_w3():
+    """Web3 client, created on first use so the service starts even if the RPC is down."""
+    global _w3
+    if _w3 is None:
+        if not chain_configured():
+            raise RuntimeError("Missing blockchain env variables")
+        from web3 import Web3
+        _w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    return _w3
+
+
+def get_anchor_submitter() -> ChainSubmitter:
+    global _anchor_submitter
+    if _anchor_submitter is None:
+        _anchor_submitter = ChainSubmitter(get_w3(), PRIVATE_KEY, CONTRACT_ADDRESS)
+    return _anchor_submitter
 
 # -------------------------------------------------
 # DATABASE (SQLITE)
@@ -141,8 +169,12 @@ DATABASE_URL = "sqlite:///./resumes.db"
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=int(os.getenv("DB_POOL_SIZE", "8")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "8")),
+    pool_pre_ping=False,
 )
+enable_sqlite_wal(engine)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
@@ -160,8 +192,63 @@ class ResumeHash(Base):
     )
 
 
+class ResumeMinHash(Base):
+    __tablename__ = "resume_minhashes"
+
+    file_hash = Column(String, primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+
+class ResumeLSHBucket(Base):
+    __tablename__ = "resume_lsh_buckets"
+
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    file_hash = Column(String, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_lsh_band_bucket", "band", "bucket"),
+    )
+
+
+class AnchorBatch(Base):
+    __tablename__ = "anchor_batches"
+
+    id = Column(Integer, primary_key=True)
+    root = Column(String, nullable=False, unique=True)
+    leaf_count = Column(Integer, nullable=False)
+    tx_hash = Column(String, nullable=False)
+    block_number = Column(BigInteger)
+    gas_used = Column(BigInteger)
+    build_ms = Column(Float)
+    submit_ms = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ResumeAnchor(Base):
+    __tablename__ = "resume_anchors"
+
+    file_hash = Column(String, primary_key=True)
+    batch_id = Column(Integer, ForeignKey("anchor_batches.id"), nullable=False, index=True)
+    leaf_index = Column(Integer, nullable=False)
+    proof = Column(Text, nullable=False)  # JSON list of sibling hashes
+
+
 Base.metadata.create_all(bind=engine)
 
+hash_index = HashIndex(engine, ResumeHash.__table__)
+near_dup_index = MinHashLSHIndex(engine, ResumeMinHash.__table__, ResumeLSHBucket.__table__)
+
+# Resume hashes are anchored on chain as Merkle roots, one transaction per batch
+ANCHOR_ENABLED = os.getenv("ANCHOR_ENABLED", "true").lower() == "true"
+anchor_service = AnchorService(
+    engine,
+    ResumeHash.__table__,
+    AnchorBatch.__table__,
+    ResumeAnchor.__table__,
+    get_anchor_submitter,
+)
+
 # -------------------------------------------------
 # APP
 # -------------------------------------------------
@@ -174,6 +261,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# GET /metrics (Prometheus) and a Server-Timing header with per-stage timings on every response
+install_metrics(app)
 
 # -------------------------------------------------
 # HELPERS
@@ -182,66 +271,207 @@ def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def find_near_duplicates(file_hash: str, text: str) -> list:
+    """
+    Indexes the resume's MinHash signature and returns previously stored resumes
+    whose estimated Jaccard similarity is above the threshold.
+    """
+    if not text:
+        return []
+    signature = minhash_signature(text)
+    matches = near_dup_index.query(signature, exclude=file_hash)
+    near_dup_index.add(file_hash, signature)
+    if not matches:
+        return []
+
+    with engine.connect() as conn:
+        filenames = dict(conn.execute(
+            select(ResumeHash.file_hash, ResumeHash.filename)
+            .where(ResumeHash.file_hash.in_([h for h, _ in matches]))
+        ).all())
+    return [{"hash": h, "filename": filenames.get(h), "jaccard": score} for h, score in matches]
+
+
+class HashCheckRequest(BaseModel):
+    hashes: List[str]
+
+
+@app.on_event("startup")
+async def warm_hash_index():
+    # Load stored hashes into the Bloom filter before traffic arrives
+    await asyncio.to_thread(hash_index.warm)
+
+
+@app.on_event("startup")
+async def start_anchoring():
+    if ANCHOR_ENABLED and chain_configured():
+        app.state.anchor_task = asyncio.create_task(anchor_service.run_forever())
+
+
+@app.on_event("shutdown")
+async def stop_anchoring():
+    task = getattr(app.state, "anchor_task", None)
+    if task:
+        task.cancel()
+
+
 # -------------------------------------------------
 # ROUTES
 # -------------------------------------------------
 @app.get("/health")
 async def health():
+    # Liveness only: never touches the chain (see /ready)
     return {
         "status": "ok",
-        "chain": w3.eth.chain_id,
         "wallet": WALLET_ADDRESS,
     }
 
 
-@app.post("/extract-text")
-async def extract_text(file: UploadFile = File(...)):
-    content = await file.read()
-    filename = file.filename or "unknown"
+def _readiness_checks() -> dict:
+    checks = {"hash_index": hash_index.warmed}
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        checks["database"] = True
+    except Exception as e:
+        print(f"Database not ready: {e}")
+        checks["database"] = False
+    try:
+        w3 = get_w3()
+        checks["chain"] = w3.is_connected()
+        if checks["chain"]:
+            checks["chain_id"] = w3.eth.chain_id
+    except Exception as e:
+        print(f"Blockchain RPC not ready: {e}")
+        checks["chain"] = False
+    return checks
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: database reachable, hash index warmed, blockchain RPC connected.
+    Returns 503 until all of them are.
+    """
+    checks = await asyncio.to_thread(_readiness_checks)
+    is_ready = all(v for k, v in checks.items() if k != "chain_id")
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not_ready", "checks": checks},
+    )
 
-    file_hash = sha256_hex(content)
 
-    db = SessionLocal()
+@app.post("/hashes/check")
+async def check_hashes(request: HashCheckRequest):
+    """
+    Bulk duplicate check: reports which of the given SHA-256 hashes are already stored.
+    """
+    hashes = [h.lower() for h in request.hashes]
+    invalid = [h for h in hashes if len(h) != 64 or any(c not in "0123456789abcdef" for c in h)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Not SHA-256 hex digests: {invalid[:5]}")
+    results = await asyncio.to_thread(hash_index.check_many, hashes)
+    return {
+        "results": results,
+        "duplicates": [h for h, exists in results.items() if exists],
+    }
+
+
+@app.post("/anchor/flush")
+async def flush_anchors():
+    """
+    Anchors every pending resume hash now instead of waiting for the batch window.
+    """
+    try:
+        batches = await asyncio.to_thread(anchor_service.flush)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Anchoring failed: {e}")
+    return {"batches": batches}
+
+
+@app.get("/anchor/batches")
+async def list_anchor_batches(limit: int = 20):
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(AnchorBatch.__table__).order_by(AnchorBatch.id.desc()).limit(limit)
+        ).mappings().all()
+    return {"batches": [dict(row) for row in rows]}
+
 
-    # 🚫 DUPLICATE CHECK
-    if db.query(ResumeHash).filter_by(file_hash=file_hash).first():
+@app.get("/anchor/proof/{file_hash}")
+async def anchor_proof(file_hash: str):
+    """
+    Merkle inclusion proof for a resume hash. Anyone can verify it offline by
+    hashing up the proof and comparing with the root stored in the anchor transaction.
+    """
+    proof = await asyncio.to_thread(anchor_service.proof_for, file_hash.lower())
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Hash not anchored yet.")
+    return proof
+
+
+@app.post("/extract-text")
+async def extract_text(file: UploadFile = File(...)):
+    # Spool to disk in chunks; the hash is computed incrementally on the way
+    try:
+        upload = await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        return await asyncio.to_thread(_extract_spooled, upload)
+    finally:
+        upload.cleanup()
+
+
+def _extract_spooled(upload):
+    filename = upload.filename
+    file_hash = upload.sha256
+    FILE_SIZE_BYTES.observe(upload.size)
+
+    # 🚫 DUPLICATE CHECK + ✅ STORE HASH (one atomic insert-or-conflict)
+    with timed("hash_claim"):
+        claimed = hash_index.claim(file_hash, filename)
+    if not claimed:
         raise HTTPException(
             status_code=409,
             detail="Duplicate resume detected. Same file already uploaded."
         )
 
-    # ✅ STORE HASH
-    db.add(ResumeHash(
-        filename=filename,
-        file_hash=file_hash
-    ))
-    db.commit()
-
     # -------- TEXT EXTRACTION --------
     if filename.lower().endswith(".pdf"):
-        doc = fitz.open(stream=content, filetype="pdf")
-        text = "\n".join(p.get_text() for p in doc)
-        pages = len(doc)
-        doc.close()
-
+        with timed("extract"):
+            doc = fitz.open(upload.path, filetype="pdf")
+            text = "\n".join(p.get_text() for p in doc).strip()
+            pages = len(doc)
+            doc.close()
+        PAGE_COUNT.observe(pages)
+
+        with timed("near_duplicates"):
+            similar = find_near_duplicates(file_hash, text)
         return {
             "success": True,
             "filename": filename,
             "hash": file_hash,
             "pages": pages,
-            "text": text.strip(),
+            "text": text,
+            "similar": similar,
         }
 
     if filename.lower().endswith((".docx", ".doc")):
-        doc = docx.Document(io.BytesIO(content))
-        text = "\n".join(p.text for p in doc.paragraphs)
+        with timed("extract"):
+            doc = docx.Document(upload.path)
+            text = "\n".join(p.text for p in doc.paragraphs).strip()
 
+        with timed("near_duplicates"):
+            similar = find_near_duplicates(file_hash, text)
         return {
             "success": True,
             "filename": filename,
             "hash": file_hash,
             "paragraphs": len(doc.paragraphs),
-            "text": text.strip(),
+            "text": text,
+            "similar": similar,
         }
 
     raise HTTPException(400, "Only PDF and DOCX supported")
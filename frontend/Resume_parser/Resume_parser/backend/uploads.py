@@ -0,0 +1,96 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+# Uploads are copied to a temp file in fixed-size chunks so a request never holds
+# the whole file in memory. The SHA-256 is computed on the way through.
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))  # 10MB
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised as soon as an upload exceeds MAX_UPLOAD_BYTES."""
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _SpoolWriter:
+    """Writes chunks to a temp file while hashing them and enforcing the size limit."""
+
+    def __init__(self, filename: str, max_bytes: int):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.digest = hashlib.sha256()
+        # Keep the extension: parsers dispatch on it
+        suffix = os.path.splitext(filename)[1].lower()
+        self.file = tempfile.NamedTemporaryFile(prefix="resume-", suffix=suffix, delete=False)
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(
+                f"{self.filename} exceeds the {self.max_bytes // (1024 * 1024)}MB upload limit."
+            )
+        self.digest.update(chunk)
+        self.file.write(chunk)
+
+    def finish(self, content_type: str) -> SpooledUpload:
+        self.file.close()
+        return SpooledUpload(self.file.name, self.filename, content_type, self.size, self.digest.hexdigest())
+
+    def abort(self):
+        self.file.close()
+        os.remove(self.file.name)
+
+
+async def spool_upload(upload, max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """
+    Streams a FastAPI UploadFile to a temp file in chunks, hashing incrementally.
+    Rejects the upload as soon as it crosses max_bytes.
+    """
+    filename = upload.filename or "unknown"
+    # Reject early when the client told us the size up front
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(f"{filename} exceeds the {max_bytes // (1024 * 1024)}MB upload limit.")
+
+    writer = _SpoolWriter(filename, max_bytes)
+    try:
+        while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish(upload.content_type)
+
+
+def spool_stream(stream, filename: str, content_type: str, max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """
+    Synchronous variant of spool_upload for file-like objects (e.g. ZIP archive members).
+    """
+    writer = _SpoolWriter(filename, max_bytes)
+    try:
+        while chunk := stream.read(UPLOAD_CHUNK_BYTES):
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish(content_type)